@@ -3,229 +3,1072 @@
 Script para gerar gráficos de análise de desempenho GPU/CPU
 """
 
+import argparse
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
 import pandas as pd
-import matplotlib.pyplot as plt
+from pandas.api.types import union_categoricals
+import matplotlib
 import numpy as np
 from pathlib import Path
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Tipos compactos das colunas de performance_results.csv: Sim/Nao como
+# bool, o tipo de luz como categoria e os números em 32 bits
+CSV_DTYPES = {
+    'Triangulos': 'int32',
+    'FPS': 'float32',
+    'Iluminacao': 'bool',
+    'Textura': 'bool',
+    'TipoLuz': 'category',
+}
+
+# Extensões do cache tipado (requer pyarrow); o Arrow IPC (Feather) é lido
+# mapeado em memória
+ARROW_SUFFIXES = ('.feather', '.arrow')
+PARQUET_SUFFIXES = ('.parquet',)
+
+def yes_no(flag):
+    """Valor bool das colunas Iluminacao/Textura de volta ao texto do CSV"""
+    return 'Sim' if flag else 'Nao'
+
+def read_csv_typed(csv_path, chunksize=None, columns=None):
+    """
+    Lê o CSV direto nos tipos de CSV_DTYPES
+    
+    Com chunksize o arquivo é lido em blocos de linhas (só o texto de um
+    bloco fica em memória por vez) e as categorias de TipoLuz de cada bloco
+    são unificadas no final. columns lê um trecho sem cabeçalho
+    """
+    options = dict(dtype=CSV_DTYPES, true_values=['Sim'], false_values=['Nao'])
+    if columns is not None:
+        options.update(header=None, names=columns)
+    if not chunksize:
+        return pd.read_csv(csv_path, **options)
+    chunks = list(pd.read_csv(csv_path, chunksize=chunksize, **options))
+    if not chunks:
+        return pd.read_csv(csv_path, **options)
+    light_types = union_categoricals([chunk['TipoLuz'] for chunk in chunks])
+    df = pd.concat([chunk.drop(columns='TipoLuz') for chunk in chunks], ignore_index=True)
+    df.insert(chunks[0].columns.get_loc('TipoLuz'), 'TipoLuz', light_types)
+    return df
+
+def read_cache(cache_path):
+    """Lê o cache tipado (.feather/.arrow mapeado em memória, ou .parquet)"""
+    if Path(cache_path).suffix in ARROW_SUFFIXES:
+        from pyarrow import feather
+        return feather.read_table(cache_path, memory_map=True).to_pandas()
+    return pd.read_parquet(cache_path, memory_map=True)
 
-def load_data(csv_path):
-    """Carrega dados do CSV"""
-    df = pd.read_csv(csv_path)
+def write_cache(df, cache_path):
+    """Grava o cache tipado; Feather sem compressão, para o mapeamento em memória"""
+    if Path(cache_path).suffix in ARROW_SUFFIXES:
+        df.to_feather(cache_path, compression='uncompressed')
+    else:
+        df.to_parquet(cache_path, index=False)
+
+def load_data(csv_path, chunksize=None, cache_path=None):
+    """
+    Carrega o CSV de desempenho com tipos compactos (CSV_DTYPES)
+    
+    chunksize lê logs grandes em blocos de linhas. cache_path (.feather,
+    .arrow ou .parquet; requer pyarrow) guarda a tabela já tipada: enquanto
+    for mais novo que o CSV, as execuções seguintes leem o cache em vez de
+    interpretar o texto
+    """
+    if cache_path is not None:
+        suffix = Path(cache_path).suffix
+        if suffix not in ARROW_SUFFIXES + PARQUET_SUFFIXES:
+            raise ValueError(f"Cache deve ser {', '.join(ARROW_SUFFIXES + PARQUET_SUFFIXES)}: {cache_path}")
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("O cache tipado requer pyarrow (pip install pyarrow)") from None
+        if Path(cache_path).exists() and Path(cache_path).stat().st_mtime >= Path(csv_path).stat().st_mtime:
+            return read_cache(cache_path)
+    df = read_csv_typed(csv_path, chunksize)
+    if cache_path is not None:
+        write_cache(df, cache_path)
     return df
 
-def plot_fps_vs_triangles(df, output_dir):
+def new_figure(figsize):
+    """Cria figura com canvas Agg próprio (sem estado global do pyplot)"""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+def save_figure(fig, output_dir, name, dpi=300, fmt='png'):
+    """Salva a figura como output_dir/name.fmt"""
+    fig.tight_layout()
+    fig.savefig(f'{output_dir}/{name}.{fmt}', dpi=dpi, format=fmt, bbox_inches='tight')
+
+def plot_fps_line(ax, df, style, **kwargs):
+    """
+    Linha FPS x triângulos; com o intervalo de confiança (colunas FPS_inf e
+    FPS_sup) desenha as barras de erro
+    """
+    if 'FPS_inf' not in df:
+        ax.plot(df['Triangulos'], df['FPS'], style, **kwargs)
+        return
+    yerr = [(df['FPS'] - df['FPS_inf']).fillna(0), (df['FPS_sup'] - df['FPS']).fillna(0)]
+    ax.errorbar(df['Triangulos'], df['FPS'], yerr=yerr, fmt=style, capsize=3, **kwargs)
+
+def plot_fps_vs_triangles(df, output_dir, dpi=300, fmt='png'):
     """Gráfico: FPS vs Número de Triângulos (sem iluminação/textura)"""
-    df_base = df[(df['Iluminacao'] == 'Nao') & (df['Textura'] == 'Nao')]
-    
-    plt.figure(figsize=(12, 6))
-    plt.plot(df_base['Triangulos'], df_base['FPS'], 'o-', linewidth=2, markersize=8)
-    plt.xlabel('Número de Triângulos', fontsize=12)
-    plt.ylabel('FPS (Frames por Segundo)', fontsize=12)
-    plt.title('Desempenho: FPS vs Número de Triângulos\n(Sem Iluminação e Textura)', fontsize=14, fontweight='bold')
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/grafico_01_fps_vs_triangulos_base.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    df_base = df[~df['Iluminacao'] & ~df['Textura']]
+    
+    fig, ax = new_figure((12, 6))
+    plot_fps_line(ax, df_base, 'o-', linewidth=2, markersize=8)
+    ax.set_xlabel('Número de Triângulos', fontsize=12)
+    ax.set_ylabel('FPS (Frames por Segundo)', fontsize=12)
+    ax.set_title('Desempenho: FPS vs Número de Triângulos\n(Sem Iluminação e Textura)', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    save_figure(fig, output_dir, 'grafico_01_fps_vs_triangulos_base', dpi, fmt)
     print("✓ Gráfico 1 gerado: FPS vs Triângulos (Base)")
 
-def plot_lighting_impact(df, output_dir):
+def plot_lighting_impact(df, output_dir, dpi=300, fmt='png'):
     """Gráfico: Impacto da Iluminação no FPS"""
-    df_no_tex = df[df['Textura'] == 'Nao']
+    df_no_tex = df[~df['Textura']]
     
-    plt.figure(figsize=(14, 7))
+    fig, ax = new_figure((14, 7))
     
     for light_type in df_no_tex['TipoLuz'].unique():
         df_light = df_no_tex[df_no_tex['TipoLuz'] == light_type]
-        plt.plot(df_light['Triangulos'], df_light['FPS'], 'o-', label=light_type, linewidth=2, markersize=8)
-    
-    plt.xlabel('Número de Triângulos', fontsize=12)
-    plt.ylabel('FPS (Frames por Segundo)', fontsize=12)
-    plt.title('Impacto dos Tipos de Iluminação no Desempenho\n(Sem Textura)', fontsize=14, fontweight='bold')
-    plt.legend(fontsize=11)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/grafico_02_impacto_iluminacao.png', dpi=300, bbox_inches='tight')
-    plt.close()
+        plot_fps_line(ax, df_light, 'o-', label=light_type, linewidth=2, markersize=8)
+    
+    ax.set_xlabel('Número de Triângulos', fontsize=12)
+    ax.set_ylabel('FPS (Frames por Segundo)', fontsize=12)
+    ax.set_title('Impacto dos Tipos de Iluminação no Desempenho\n(Sem Textura)', fontsize=14, fontweight='bold')
+    ax.legend(fontsize=11)
+    ax.grid(True, alpha=0.3)
+    save_figure(fig, output_dir, 'grafico_02_impacto_iluminacao', dpi, fmt)
     print("✓ Gráfico 2 gerado: Impacto da Iluminação")
 
-def plot_texture_impact(df, output_dir):
+def plot_texture_impact(df, output_dir, dpi=300, fmt='png'):
     """Gráfico: Impacto da Textura no FPS"""
-    plt.figure(figsize=(14, 7))
+    fig, ax = new_figure((14, 7))
     
     # Sem textura, sem luz
-    df_no_tex = df[(df['Textura'] == 'Nao') & (df['Iluminacao'] == 'Nao')]
-    plt.plot(df_no_tex['Triangulos'], df_no_tex['FPS'], 'o-', label='Sem Textura/Luz', linewidth=2, markersize=8)
+    df_no_tex = df[~df['Textura'] & ~df['Iluminacao']]
+    plot_fps_line(ax, df_no_tex, 'o-', label='Sem Textura/Luz', linewidth=2, markersize=8)
     
     # Com textura, sem luz
-    df_tex = df[(df['Textura'] == 'Sim') & (df['Iluminacao'] == 'Nao')]
+    df_tex = df[df['Textura'] & ~df['Iluminacao']]
     if not df_tex.empty:
-        plt.plot(df_tex['Triangulos'], df_tex['FPS'], 's-', label='Com Textura, Sem Luz', linewidth=2, markersize=8)
-    
-    plt.xlabel('Número de Triângulos', fontsize=12)
-    plt.ylabel('FPS (Frames por Segundo)', fontsize=12)
-    plt.title('Impacto da Textura no Desempenho', fontsize=14, fontweight='bold')
-    plt.legend(fontsize=11)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/grafico_03_impacto_textura.png', dpi=300, bbox_inches='tight')
-    plt.close()
+        plot_fps_line(ax, df_tex, 's-', label='Com Textura, Sem Luz', linewidth=2, markersize=8)
+    
+    ax.set_xlabel('Número de Triângulos', fontsize=12)
+    ax.set_ylabel('FPS (Frames por Segundo)', fontsize=12)
+    ax.set_title('Impacto da Textura no Desempenho', fontsize=14, fontweight='bold')
+    ax.legend(fontsize=11)
+    ax.grid(True, alpha=0.3)
+    save_figure(fig, output_dir, 'grafico_03_impacto_textura', dpi, fmt)
     print("✓ Gráfico 3 gerado: Impacto da Textura")
 
-def plot_combined_effects(df, output_dir):
+# Cenários do benchmark: (Iluminacao, Textura, TipoLuz, rótulo)
+SCENARIOS = [
+    (False, False, 'Sem luz', 'Base (Sem Luz/Textura)'),
+    (True, False, 'Omnidirecional', 'Luz Omnidirecional'),
+    (True, False, 'Spot', 'Luz Spot'),
+    (False, True, 'Sem luz', 'Com Textura'),
+    (True, True, 'Omnidirecional', 'Textura + Luz Omni'),
+    (True, True, 'Spot', 'Textura + Luz Spot')
+]
+
+def plot_combined_effects(df, output_dir, dpi=300, fmt='png'):
     """Gráfico: Comparação de Todos os Cenários"""
-    plt.figure(figsize=(16, 8))
+    fig, ax = new_figure((16, 8))
     
-    scenarios = [
-        ('Nao', 'Nao', 'Sem luz', 'Base (Sem Luz/Textura)'),
-        ('Sim', 'Nao', 'Omnidirecional', 'Luz Omnidirecional'),
-        ('Sim', 'Nao', 'Spot', 'Luz Spot'),
-        ('Nao', 'Sim', 'Sem luz', 'Com Textura'),
-        ('Sim', 'Sim', 'Omnidirecional', 'Textura + Luz Omni'),
-        ('Sim', 'Sim', 'Spot', 'Textura + Luz Spot')
-    ]
+    colors = matplotlib.colormaps['tab10'](np.linspace(0, 1, len(SCENARIOS)))
     
-    colors = plt.cm.tab10(np.linspace(0, 1, len(scenarios)))
-    
-    for i, (luz, tex, tipo_luz, label) in enumerate(scenarios):
+    for i, (luz, tex, tipo_luz, label) in enumerate(SCENARIOS):
         df_scenario = df[(df['Iluminacao'] == luz) & (df['Textura'] == tex) & (df['TipoLuz'] == tipo_luz)]
         if not df_scenario.empty:
-            plt.plot(df_scenario['Triangulos'], df_scenario['FPS'], 'o-', 
-                    label=label, linewidth=2, markersize=6, color=colors[i])
+            plot_fps_line(ax, df_scenario, 'o-', 
+                          label=label, linewidth=2, markersize=6, color=colors[i])
     
-    plt.xlabel('Número de Triângulos', fontsize=12)
-    plt.ylabel('FPS (Frames por Segundo)', fontsize=12)
-    plt.title('Comparação Completa: Impacto de Iluminação e Textura no Desempenho', 
+    ax.set_xlabel('Número de Triângulos', fontsize=12)
+    ax.set_ylabel('FPS (Frames por Segundo)', fontsize=12)
+    ax.set_title('Comparação Completa: Impacto de Iluminação e Textura no Desempenho', 
              fontsize=14, fontweight='bold')
-    plt.legend(fontsize=10, loc='best')
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/grafico_04_comparacao_completa.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    ax.legend(fontsize=10, loc='best')
+    ax.grid(True, alpha=0.3)
+    save_figure(fig, output_dir, 'grafico_04_comparacao_completa', dpi, fmt)
     print("✓ Gráfico 4 gerado: Comparação Completa")
 
-def plot_performance_degradation(df, output_dir):
+# Chave de uma configuração medida em performance_results.csv
+RUN_KEY = ['Iluminacao', 'Textura', 'TipoLuz', 'Triangulos']
+
+# Estatísticas do FPS mantidas por configuração (M2: soma dos quadrados
+# dos desvios em relação à média, como no algoritmo de Welford)
+STAT_COLUMNS = ['count', 'mean', 'm2', 'min', 'max']
+
+# Cenários comparados com a base (sem luz/textura) na análise de degradação
+DEGRADATION_SCENARIOS = [
+    ((True, False), 'Iluminação'),
+    ((False, True), 'Textura'),
+    ((True, True), 'Ilum. + Tex.'),
+]
+
+def aggregate_fps(df):
+    """
+    Soma, contagem e média do FPS por configuração (RUN_KEY), numa única
+    passada pelos dados e na ordem em que as configurações aparecem
+    
+    As análises partem desta tabela, com uma linha por configuração, em vez
+    de refiltrar os dados brutos (milhões de linhas nos logs da frota)
+    """
+    agg = df.groupby(RUN_KEY, sort=False, observed=True)['FPS'].agg(['sum', 'count']).reset_index()
+    agg['FPS'] = agg['sum'] / agg['count']
+    return agg
+
+def configuration_labels(agg):
+    """Rótulo da configuração ('TipoLuz', '+ Tex' com textura) de cada linha"""
+    return agg['TipoLuz'].astype(str) + np.where(agg['Textura'], ' + Tex', '')
+
+def fps_heatmap_table(df):
+    """FPS médio por configuração (linhas) e quantidade de triângulos (colunas)"""
+    agg = aggregate_fps(df)
+    totals = agg.groupby([configuration_labels(agg).rename('Configuracao'), 'Triangulos'])[
+        ['sum', 'count']].sum()
+    return (totals['sum'] / totals['count']).unstack('Triangulos')
+
+def degradation_table(df):
+    """
+    Degradação (%) do FPS de cada cenário de DEGRADATION_SCENARIOS em
+    relação à base, por quantidade de triângulos (na ordem da base)
+    
+    Com mais de um tipo de luz no cenário vale o primeiro que aparece nos
+    dados; repetições da mesma configuração entram pela média
+    """
+    agg = aggregate_fps(df)
+    by_scenario = agg.groupby(['Iluminacao', 'Textura', 'Triangulos'], sort=False)['FPS'].first(
+        ).unstack(['Iluminacao', 'Textura'])
+    if (False, False) not in by_scenario.columns:
+        return pd.DataFrame()
+    base_rows = ~agg['Iluminacao'] & ~agg['Textura']
+    by_scenario = by_scenario.reindex(agg.loc[base_rows, 'Triangulos'].unique())
+    base = by_scenario[(False, False)]
+    table = pd.DataFrame(index=by_scenario.index)
+    for scenario, label in DEGRADATION_SCENARIOS:
+        if scenario in by_scenario.columns:
+            table[label] = (base - by_scenario[scenario]) / base * 100
+    return table
+
+def plot_performance_degradation(df, output_dir, dpi=300, fmt='png'):
     """Gráfico: Degradação de Desempenho Relativa"""
-    df_base = df[(df['Iluminacao'] == 'Nao') & (df['Textura'] == 'Nao')]
+    table = degradation_table(df)
     
-    if df_base.empty:
+    if table.empty:
         print("! Aviso: Dados base não encontrados para análise de degradação")
         return
     
-    plt.figure(figsize=(14, 7))
+    fig, ax = new_figure((14, 7))
     
-    for triangle_count in df_base['Triangulos'].unique():
-        base_fps = df_base[df_base['Triangulos'] == triangle_count]['FPS'].values[0]
-        
-        degradations = []
-        labels = []
-        
-        for luz, tex in [('Sim', 'Nao'), ('Nao', 'Sim'), ('Sim', 'Sim')]:
-            df_scenario = df[(df['Iluminacao'] == luz) & (df['Textura'] == tex) & 
-                           (df['Triangulos'] == triangle_count)]
-            if not df_scenario.empty:
-                fps = df_scenario['FPS'].values[0]
-                degradation = ((base_fps - fps) / base_fps) * 100
-                degradations.append(degradation)
-                
-                if luz == 'Sim' and tex == 'Nao':
-                    labels.append('Iluminação')
-                elif luz == 'Nao' and tex == 'Sim':
-                    labels.append('Textura')
-                else:
-                    labels.append('Ilum. + Tex.')
-        
+    for triangle_count, row in table.iterrows():
+        row = row.dropna()
+        labels = list(row.index)
         x = np.arange(len(labels))
-        plt.bar(x + (triangle_count / 10000), degradations, width=0.15, 
+        ax.bar(x + (triangle_count / 10000), row.values, width=0.15, 
                label=f'{triangle_count} triângulos')
     
-    plt.xlabel('Tipo de Efeito', fontsize=12)
-    plt.ylabel('Degradação de Desempenho (%)', fontsize=12)
-    plt.title('Degradação de Desempenho por Tipo de Efeito', fontsize=14, fontweight='bold')
-    plt.xticks(x, labels)
-    plt.legend(fontsize=10)
-    plt.grid(True, alpha=0.3, axis='y')
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/grafico_05_degradacao_desempenho.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    ax.set_xlabel('Tipo de Efeito', fontsize=12)
+    ax.set_ylabel('Degradação de Desempenho (%)', fontsize=12)
+    ax.set_title('Degradação de Desempenho por Tipo de Efeito', fontsize=14, fontweight='bold')
+    ax.set_xticks(x, labels)
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3, axis='y')
+    save_figure(fig, output_dir, 'grafico_05_degradacao_desempenho', dpi, fmt)
     print("✓ Gráfico 5 gerado: Degradação de Desempenho")
 
-def plot_fps_heatmap(df, output_dir):
+def plot_fps_heatmap(df, output_dir, dpi=300, fmt='png'):
     """Gráfico: Mapa de Calor do FPS"""
-    # Criar matriz de FPS por quantidade de triângulos e configuração
-    configs = []
-    for _, row in df.iterrows():
-        config = f"{row['TipoLuz']}"
-        if row['Textura'] == 'Sim':
-            config += " + Tex"
-        configs.append(config)
-    
-    df['Configuracao'] = configs
+    # Matriz de FPS por configuração e quantidade de triângulos
+    pivot_table = fps_heatmap_table(df)
     
-    pivot_table = df.pivot_table(values='FPS', index='Configuracao', columns='Triangulos', aggfunc='mean')
+    fig, ax = new_figure((14, 8))
+    im = ax.imshow(pivot_table, aspect='auto', cmap='RdYlGn', interpolation='nearest')
     
-    plt.figure(figsize=(14, 8))
-    im = plt.imshow(pivot_table, aspect='auto', cmap='RdYlGn', interpolation='nearest')
-    
-    plt.colorbar(im, label='FPS')
-    plt.xlabel('Número de Triângulos', fontsize=12)
-    plt.ylabel('Configuração', fontsize=12)
-    plt.title('Mapa de Calor: FPS por Configuração e Quantidade de Triângulos', 
+    fig.colorbar(im, ax=ax, label='FPS')
+    ax.set_xlabel('Número de Triângulos', fontsize=12)
+    ax.set_ylabel('Configuração', fontsize=12)
+    ax.set_title('Mapa de Calor: FPS por Configuração e Quantidade de Triângulos', 
              fontsize=14, fontweight='bold')
     
-    plt.xticks(range(len(pivot_table.columns)), pivot_table.columns, rotation=45)
-    plt.yticks(range(len(pivot_table.index)), pivot_table.index)
+    ax.set_xticks(range(len(pivot_table.columns)), pivot_table.columns, rotation=45)
+    ax.set_yticks(range(len(pivot_table.index)), pivot_table.index)
     
     # Adicionar valores nas células
-    for i in range(len(pivot_table.index)):
-        for j in range(len(pivot_table.columns)):
-            value = pivot_table.iloc[i, j]
-            if not np.isnan(value):
-                plt.text(j, i, f'{value:.0f}', ha='center', va='center', 
-                        color='black', fontsize=9, fontweight='bold')
-    
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/grafico_06_mapa_calor_fps.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    values = pivot_table.to_numpy()
+    for i, j in zip(*np.nonzero(~np.isnan(values))):
+        ax.text(j, i, f'{values[i, j]:.0f}', ha='center', va='center', 
+                color='black', fontsize=9, fontweight='bold')
+    
+    save_figure(fig, output_dir, 'grafico_06_mapa_calor_fps', dpi, fmt)
     print("✓ Gráfico 6 gerado: Mapa de Calor FPS")
 
+PLOT_FUNCTIONS = [
+    plot_fps_vs_triangles,
+    plot_lighting_impact,
+    plot_texture_impact,
+    plot_combined_effects,
+    plot_performance_degradation,
+    plot_fps_heatmap,
+]
+
+def _run_plot(task):
+    """Executa um gráfico (ponto de entrada dos processos do pool)"""
+    plot_fn, df, output_dir, dpi, fmt = task
+    plot_fn(df, output_dir, dpi, fmt)
+
+def generate_plots(df, output_dir, workers=None, dpi=300, fmt='png', overrides=None, plots=None):
+    """
+    Gera os gráficos em paralelo, um processo por gráfico
+    
+    overrides permite DPI/formato por gráfico, ex.:
+    {'plot_fps_heatmap': {'dpi': 150, 'fmt': 'svg'}}
+    plots restringe a geração a um subconjunto de PLOT_FUNCTIONS
+    """
+    overrides = overrides or {}
+    tasks = []
+    for plot_fn in plots if plots is not None else PLOT_FUNCTIONS:
+        cfg = overrides.get(plot_fn.__name__, {})
+        tasks.append((plot_fn, df, output_dir, cfg.get('dpi', dpi), cfg.get('fmt', fmt)))
+    
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if not tasks:
+        return
+    if workers <= 1:
+        for task in tasks:
+            _run_plot(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(_run_plot, tasks))
+
 def generate_summary_stats(df, output_path):
     """Gera estatísticas resumidas"""
+    write_summary_stats(config_stats(df), output_path)
+
+def _combine(stats, keys):
+    """
+    Combina as estatísticas de várias partes (linhas de stats) por keys:
+    forma paralela do algoritmo de Welford (Chan et al.), em que cada parte
+    entra com contagem, média e M2
+    """
+    weighted = stats.assign(total=stats['count'] * stats['mean'])
+    groups = weighted.groupby(keys, sort=False)
+    mean = groups['total'].transform('sum') / groups['count'].transform('sum')
+    m2 = stats['m2'] + stats['count'] * (stats['mean'] - mean) ** 2
+    return weighted.assign(mean=mean, m2=m2).groupby(keys, sort=False).agg(
+        count=('count', 'sum'), mean=('mean', 'first'), m2=('m2', 'sum'),
+        min=('min', 'min'), max=('max', 'max')).reset_index()
+
+def config_stats(df, column='FPS'):
+    """
+    Contagem, média, M2, mínimo e máximo de column (FPS) por configuração
+    (RUN_KEY), na ordem em que as configurações aparecem; é o estado
+    persistido pela agregação incremental
+    """
+    fps = df[column].astype('float64')
+    groups = fps.groupby([df[k] for k in RUN_KEY], sort=False, observed=True)
+    stats = groups.agg(['count', 'mean', 'var', 'min', 'max']).reset_index()
+    stats['m2'] = stats.pop('var').fillna(0.0) * (stats['count'] - 1)
+    stats['TipoLuz'] = stats['TipoLuz'].astype(str)
+    return stats[RUN_KEY + STAT_COLUMNS]
+
+def merge_stats(stats, new_stats):
+    """Incorpora as estatísticas de linhas novas às acumuladas (configurações novas no fim)"""
+    if stats is None or stats.empty:
+        return new_stats
+    return _combine(pd.concat([stats, new_stats], ignore_index=True), RUN_KEY)
+
+# Amostras de aquecimento descartadas no início de cada varredura do
+# benchmark (a primeira medida sai antes do FPS estabilizar)
+WARMUP_SAMPLES = 1
+
+# Réplicas e nível de confiança do intervalo bootstrap do FPS médio
+BOOTSTRAP_SAMPLES = 2000
+CONFIDENCE = 0.95
+
+# Amostras reamostradas por lote do bootstrap (limita a memória)
+BOOTSTRAP_BATCH_ELEMENTS = 2**22
+
+# Percentis do tempo de quadro por configuração
+FRAME_TIME_PERCENTILES = [50, 95, 99]
+
+def sweep_positions(df, first_key=None, carry=None):
+    """
+    Posição de cada linha dentro da sua varredura do benchmark
+    
+    Uma varredura começa onde a configuração inicial (first_key; por padrão
+    a da primeira linha) reaparece depois de outra configuração, de modo que
+    execuções acrescentadas ao mesmo CSV são separadas. carry continua a
+    contagem de um bloco anterior: (posição da última linha, se ela era da
+    configuração inicial)
+    
+    Retorna (posições, first_key, carry do fim do bloco)
+    """
+    if df.empty:
+        return np.zeros(0, dtype=np.int64), first_key, carry
+    if first_key is None:
+        first_key = [df[k].iloc[0] for k in RUN_KEY]
+    is_first = np.logical_and.reduce([(df[k] == value).to_numpy() for k, value in zip(RUN_KEY, first_key)])
+    after_first = np.concatenate(([carry is not None and carry[1]], is_first[:-1]))
+    starts = is_first & ~after_first
+    sweep = np.cumsum(starts)
+    positions = np.arange(len(df)) - np.concatenate(([0], np.flatnonzero(starts)))[sweep]
+    if carry is not None:
+        positions[sweep == 0] += carry[0] + 1
+    return positions, first_key, (int(positions[-1]), bool(is_first[-1]))
+
+def discard_warmup(df, warmup=WARMUP_SAMPLES):
+    """Remove as warmup primeiras amostras de cada varredura do benchmark"""
+    if not warmup:
+        return df
+    positions, _, _ = sweep_positions(df)
+    return df[positions >= warmup].reset_index(drop=True)
+
+def bootstrap_mean_ci(values, groups, n_boot=BOOTSTRAP_SAMPLES, confidence=CONFIDENCE, seed=0,
+                      batch_elements=BOOTSTRAP_BATCH_ELEMENTS):
+    """
+    Intervalo de confiança bootstrap (percentil) da média de values em cada
+    grupo (groups: códigos 0..G-1)
+    
+    A reamostragem é vetorizada: cada réplica sorteia de uma vez, para todos
+    os grupos, n índices dentro de cada grupo (n: tamanho do grupo), e as
+    médias saem de np.add.reduceat; as réplicas são processadas em lotes de
+    até batch_elements amostras
+    
+    Retorna (limites inferiores, limites superiores), um por grupo
+    """
+    if len(groups) == 0:
+        return np.zeros(0), np.zeros(0)
+    order = np.argsort(groups, kind='stable')
+    values = np.asarray(values, dtype=np.float64)[order]
+    counts = np.bincount(groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    first_index = np.repeat(starts, counts)
+    group_size = np.repeat(counts, counts)
+    
+    rng = np.random.default_rng(seed)
+    batch = max(1, batch_elements // max(len(values), 1))
+    means = np.empty((n_boot, len(counts)))
+    for first in range(0, n_boot, batch):
+        size = min(batch, n_boot - first)
+        index = first_index + (rng.random((size, len(values))) * group_size).astype(np.int64)
+        means[first:first + size] = np.add.reduceat(values[index], starts, axis=1) / counts
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1 - alpha], axis=0)
+    return low, high
+
+def run_statistics(df, n_boot=BOOTSTRAP_SAMPLES, confidence=CONFIDENCE, seed=0):
+    """
+    Estatísticas das repetições de cada configuração (RUN_KEY): número de
+    amostras, FPS médio e mediano, intervalo bootstrap do FPS médio
+    (FPS_inf/FPS_sup) e percentis do tempo de quadro em ms
+    (FRAME_TIME_PERCENTILES)
+    
+    Precisa das amostras brutas (sem as de aquecimento, ver discard_warmup);
+    a agregação incremental guarda só média e variância
+    """
+    fps = df['FPS'].astype('float64')
+    keys = [df[k] for k in RUN_KEY]
+    groups = fps.groupby(keys, sort=False, observed=True)
+    table = groups.agg(n='count', FPS='mean', FPS_mediana='median').reset_index()
+    table['TipoLuz'] = table['TipoLuz'].astype(str)
+    
+    low, high = bootstrap_mean_ci(fps.to_numpy(), groups.ngroup().to_numpy(), n_boot, confidence, seed)
+    table['FPS_inf'] = low
+    table['FPS_sup'] = high
+    frame_ms = (1000.0 / fps).groupby(keys, sort=False, observed=True)
+    for percentile in FRAME_TIME_PERCENTILES:
+        table[f'tempo_quadro_p{percentile}_ms'] = frame_ms.quantile(percentile / 100).to_numpy()
+    return table
+
+def stats_frame(stats, confidence=CONFIDENCE):
+    """
+    Tabela no formato do CSV com o FPS médio de cada configuração, para os
+    gráficos, e o intervalo de confiança da média pela aproximação normal
+    (FPS_inf/FPS_sup; vazio com uma só amostra)
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    std = np.sqrt(stats['m2'] / (stats['count'] - 1).where(stats['count'] > 1))
+    margin = z * std / np.sqrt(stats['count'])
+    frame = stats[RUN_KEY].assign(FPS=stats['mean'], FPS_inf=stats['mean'] - margin,
+                                  FPS_sup=stats['mean'] + margin)
+    return frame[['Triangulos', 'FPS', 'Iluminacao', 'Textura', 'TipoLuz', 'FPS_inf', 'FPS_sup']]
+
+def write_summary_stats(stats, output_path):
+    """
+    Escreve o resumo estatístico a partir das estatísticas por configuração
+    
+    Com medidas repetidas, o desvio entre repetições é o desvio padrão
+    combinado dentro das configurações (ruído da medida), separado da
+    variação entre configurações
+    """
+    def line_stats(part):
+        total = _combine(part.assign(_all=0), ['_all']).iloc[0]
+        std = np.sqrt(total['m2'] / (total['count'] - 1)) if total['count'] > 1 else np.nan
+        return total, std
+    
+    def write_noise(f, part):
+        dof = (part['count'] - 1).sum()
+        if dof > 0:
+            f.write(f"  Desvio entre repetições: {np.sqrt(part['m2'].sum() / dof):.2f}\n")
+    
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write("=" * 80 + "\n")
         f.write("RESUMO ESTATÍSTICO - TESTE DE DESEMPENHO GPU/CPU\n")
         f.write("=" * 80 + "\n\n")
         
-        f.write(f"Total de testes realizados: {len(df)}\n")
-        f.write(f"FPS Médio Geral: {df['FPS'].mean():.2f}\n")
-        f.write(f"FPS Máximo: {df['FPS'].max():.2f}\n")
-        f.write(f"FPS Mínimo: {df['FPS'].min():.2f}\n\n")
+        if stats.empty:
+            f.write("Nenhuma medição válida (CSV vazio ou só com amostras de aquecimento)\n")
+            print(f"! Aviso: nenhuma medição válida; resumo vazio salvo em: {output_path}")
+            return
+        
+        total, _ = line_stats(stats)
+        f.write(f"Total de testes realizados: {int(total['count'])}\n")
+        f.write(f"FPS Médio Geral: {total['mean']:.2f}\n")
+        f.write(f"FPS Máximo: {total['max']:.2f}\n")
+        f.write(f"FPS Mínimo: {total['min']:.2f}\n\n")
         
         f.write("-" * 80 + "\n")
         f.write("DESEMPENHO POR CONFIGURAÇÃO:\n")
         f.write("-" * 80 + "\n\n")
         
-        for luz in df['Iluminacao'].unique():
-            for tex in df['Textura'].unique():
-                df_config = df[(df['Iluminacao'] == luz) & (df['Textura'] == tex)]
-                if not df_config.empty:
-                    f.write(f"Iluminação: {luz} | Textura: {tex}\n")
-                    f.write(f"  FPS Médio: {df_config['FPS'].mean():.2f}\n")
-                    f.write(f"  FPS Máximo: {df_config['FPS'].max():.2f}\n")
-                    f.write(f"  FPS Mínimo: {df_config['FPS'].min():.2f}\n\n")
+        for luz in stats['Iluminacao'].unique():
+            for tex in stats['Textura'].unique():
+                part = stats[(stats['Iluminacao'] == luz) & (stats['Textura'] == tex)]
+                if not part.empty:
+                    config, _ = line_stats(part)
+                    f.write(f"Iluminação: {yes_no(luz)} | Textura: {yes_no(tex)}\n")
+                    f.write(f"  FPS Médio: {config['mean']:.2f}\n")
+                    f.write(f"  FPS Máximo: {config['max']:.2f}\n")
+                    f.write(f"  FPS Mínimo: {config['min']:.2f}\n")
+                    write_noise(f, part)
+                    f.write("\n")
         
         f.write("-" * 80 + "\n")
         f.write("ANÁLISE POR QUANTIDADE DE TRIÂNGULOS:\n")
         f.write("-" * 80 + "\n\n")
         
-        for tri_count in sorted(df['Triangulos'].unique()):
-            df_tri = df[df['Triangulos'] == tri_count]
+        for tri_count in sorted(stats['Triangulos'].unique()):
+            part = stats[stats['Triangulos'] == tri_count]
+            tri, std = line_stats(part)
             f.write(f"{tri_count} Triângulos:\n")
-            f.write(f"  FPS Médio: {df_tri['FPS'].mean():.2f}\n")
-            f.write(f"  Variação: {df_tri['FPS'].std():.2f}\n\n")
+            f.write(f"  FPS Médio: {tri['mean']:.2f}\n")
+            f.write(f"  Variação: {std:.2f}\n")
+            write_noise(f, part)
+            f.write("\n")
     
     print(f"✓ Estatísticas salvas em: {output_path}")
 
+# Configurações de que cada gráfico depende (None: todas); na agregação
+# incremental o gráfico só é refeito se alguma delas mudou
+PLOT_DEPENDENCIES = {
+    'plot_fps_vs_triangles': lambda s: ~s['Iluminacao'] & ~s['Textura'],
+    'plot_lighting_impact': lambda s: ~s['Textura'],
+    'plot_texture_impact': lambda s: ~s['Iluminacao'],
+    'plot_combined_effects': None,
+    'plot_performance_degradation': None,
+    'plot_fps_heatmap': None,
+}
+
+# Estado da agregação incremental, dentro do diretório de saída
+STATE_FILE = '{output_dir}/estado_agregados.json'
+
+# Bytes do CSV lidos por bloco na agregação incremental
+INCREMENTAL_BLOCK_BYTES = 64 * 2**20
+
+# Bytes finais da parte já lida, guardados para detectar um CSV reescrito
+STATE_TAIL_BYTES = 64
+
+def read_state(state_path):
+    """Lê o estado da agregação incremental (None se não existir)"""
+    if not Path(state_path).exists():
+        return None
+    with open(state_path, encoding='utf-8') as f:
+        state = json.load(f)
+    stats = pd.DataFrame(state['estatisticas'], columns=RUN_KEY + STAT_COLUMNS)
+    state['estatisticas'] = stats.astype({'Iluminacao': 'bool', 'Textura': 'bool', 'TipoLuz': 'str',
+                                          'Triangulos': 'int32', 'count': 'int64'})
+    return state
+
+def write_state(state, state_path):
+    """Grava o estado da agregação incremental (substituição atômica)"""
+    stats = state['estatisticas']
+    columns = {column: stats[column].tolist() for column in RUN_KEY + STAT_COLUMNS}
+    tmp_path = f'{state_path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({**state, 'estatisticas': columns}, f, ensure_ascii=False)
+    os.replace(tmp_path, state_path)
+
+def _csv_fingerprint(csv_path, offset):
+    """Cabeçalho do CSV e bytes finais da parte até offset (hex)"""
+    with open(csv_path, 'rb') as f:
+        header = f.readline().decode('utf-8')
+        f.seek(max(0, offset - STATE_TAIL_BYTES))
+        tail = f.read(min(offset, STATE_TAIL_BYTES)).hex()
+    return header, tail
+
+def _state_matches(state, csv_path):
+    """O CSV ainda começa com o conteúdo já agregado (só recebeu linhas no fim)?"""
+    if Path(csv_path).stat().st_size < state['offset']:
+        return False
+    return _csv_fingerprint(csv_path, state['offset']) == (state['cabecalho'], state['final'])
+
+def iter_appended_rows(csv_path, offset, block_bytes=INCREMENTAL_BLOCK_BYTES):
+    """
+    Lê as linhas completas acrescentadas ao CSV a partir do byte offset, em
+    blocos; uma linha final incompleta (escrita em andamento) fica para a
+    próxima execução
+    
+    Gera (df, offset_final) para cada bloco
+    """
+    with open(csv_path, 'rb') as f:
+        columns = f.readline().decode('utf-8').strip().split(',')
+        offset = max(offset, f.tell())
+        f.seek(offset)
+        pending = b''
+        while True:
+            block = f.read(block_bytes)
+            if not block:
+                return
+            block = pending + block
+            end = block.rfind(b'\n') + 1
+            pending = block[end:]
+            if end == 0:
+                continue
+            offset += end
+            yield read_csv_typed(io.BytesIO(block[:end]), columns=columns), offset
+
+def update_stats(csv_path, state=None, warmup=WARMUP_SAMPLES):
+    """
+    Incorpora ao estado as linhas acrescentadas ao CSV desde a última
+    execução, sem as warmup primeiras amostras de cada varredura; refaz a
+    agregação do zero se não houver estado, se o CSV tiver sido reescrito ou
+    se warmup mudou
+    
+    Retorna (estado atualizado, estatísticas das configurações alteradas ou
+    None quando tudo foi recalculado)
+    """
+    if state is not None and state.get('aquecimento') != warmup:
+        state = None
+    if state is not None and not _state_matches(state, csv_path):
+        print("! CSV reescrito desde a última execução: recalculando tudo")
+        state = None
+    stats = state['estatisticas'] if state is not None else None
+    offset = state['offset'] if state is not None else 0
+    first_key = state['configuracao_inicial'] if state is not None else None
+    carry = state['varredura'] if state is not None else None
+    changed = []
+    rows = None
+    for rows, offset in iter_appended_rows(csv_path, offset):
+        positions, first_key, carry = sweep_positions(rows, first_key, carry)
+        measured = rows[positions >= warmup]
+        if measured.empty:
+            continue
+        new_stats = config_stats(measured)
+        changed.append(new_stats[RUN_KEY])
+        stats = merge_stats(stats, new_stats)
+    
+    if stats is None:
+        # CSV só com o cabeçalho (ou só com amostras de aquecimento)
+        stats = config_stats(rows.iloc[:0] if rows is not None else read_csv_typed(csv_path))
+    if first_key is not None:
+        first_key = [value.item() if isinstance(value, np.generic) else value for value in first_key]
+    header, tail = _csv_fingerprint(csv_path, offset)
+    updated = {'offset': offset, 'cabecalho': header, 'final': tail, 'estatisticas': stats,
+               'aquecimento': warmup, 'configuracao_inicial': first_key, 'varredura': carry,
+               'graficos': state.get('graficos') if state is not None else None}
+    if state is None:
+        return updated, None
+    if not changed:
+        return updated, stats.iloc[:0]
+    return updated, pd.concat(changed).drop_duplicates().merge(stats, on=RUN_KEY)
+
+def plots_to_update(changed):
+    """Funções de PLOT_FUNCTIONS afetadas pelas configurações alteradas (None: todas)"""
+    if changed is None:
+        return list(PLOT_FUNCTIONS)
+    plots = []
+    for plot_fn in PLOT_FUNCTIONS:
+        depends = PLOT_DEPENDENCIES[plot_fn.__name__]
+        if len(changed) and (depends is None or depends(changed).any()):
+            plots.append(plot_fn)
+    return plots
+
+# Log do tempo de cada quadro gravado por main_glut.cpp
+FRAME_LOG_FILE = 'frame_times.csv'
+FRAME_LOG_DTYPES = {
+    'Triangulos': 'int32',
+    'TempoQuadroMs': 'float32',
+    'Iluminacao': 'bool',
+    'Textura': 'bool',
+    'TipoLuz': 'category',
+}
+
+# Linhas do log lidas por bloco (milhões de quadros por execução)
+FRAME_LOG_CHUNK_ROWS = 2**20
+
+# Histograma do tempo de quadro: faixas logarítmicas de 0,01 ms a 10 s
+FRAME_HIST_MIN_MS = 0.01
+FRAME_HIST_DECADES = 6
+FRAME_HIST_BINS_PER_DECADE = 100
+
+# Percentis do tempo de quadro calculados a partir do log
+FRAME_LOG_PERCENTILES = [50, 95, 99, 99.9]
+
+def frame_percentile_column(percentile):
+    """Coluna do percentil do tempo de quadro (99.9 -> tempo_quadro_p99_9_ms)"""
+    return f'tempo_quadro_p{percentile:g}_ms'.replace('.', '_')
+
+def frame_histogram_edges():
+    """Limites (ms) das faixas logarítmicas do histograma do tempo de quadro"""
+    steps = np.arange(FRAME_HIST_DECADES * FRAME_HIST_BINS_PER_DECADE + 1)
+    return FRAME_HIST_MIN_MS * 10 ** (steps / FRAME_HIST_BINS_PER_DECADE)
+
+def frame_histogram_bins(times):
+    """Faixa do histograma de cada tempo de quadro (ms); fora do intervalo vai para as pontas"""
+    n_bins = FRAME_HIST_DECADES * FRAME_HIST_BINS_PER_DECADE
+    decades = np.log10(np.maximum(times, FRAME_HIST_MIN_MS) / FRAME_HIST_MIN_MS)
+    return np.minimum((decades * FRAME_HIST_BINS_PER_DECADE).astype(np.int64), n_bins - 1)
+
+def histogram_percentiles(hist, percentiles):
+    """
+    Percentis do tempo de quadro (ms) de cada linha de hist (contagens nas
+    faixas de frame_histogram_edges), interpolando dentro da faixa em escala
+    logarítmica; a resolução é a de uma faixa (~2,3%)
+    """
+    rows = np.arange(len(hist))
+    cumulative = np.cumsum(hist, axis=1)
+    result = np.empty((len(hist), len(percentiles)))
+    for j, percentile in enumerate(percentiles):
+        target = cumulative[:, -1] * percentile / 100
+        bins = np.minimum((cumulative < target[:, None]).sum(axis=1), hist.shape[1] - 1)
+        inside = hist[rows, bins]
+        before = cumulative[rows, bins] - inside
+        fraction = np.clip((target - before) / np.maximum(inside, 1), 0, 1)
+        result[:, j] = FRAME_HIST_MIN_MS * 10 ** ((bins + fraction) / FRAME_HIST_BINS_PER_DECADE)
+    return result
+
+def iter_frame_log(log_path, chunksize=FRAME_LOG_CHUNK_ROWS):
+    """Lê o log de tempos de quadro em blocos de chunksize linhas (tipos de FRAME_LOG_DTYPES)"""
+    return pd.read_csv(log_path, chunksize=chunksize, dtype=FRAME_LOG_DTYPES,
+                       true_values=['Sim'], false_values=['Nao'])
+
+def analyze_frame_log(log_path, chunksize=FRAME_LOG_CHUNK_ROWS):
+    """
+    Métricas do tempo de quadro por configuração (RUN_KEY) a partir do log
+    de main_glut.cpp, lido em blocos: só o bloco atual e os acumuladores de
+    cada configuração ficam em memória
+    
+    Por configuração são acumulados contagem/média/M2/mín./máx. (como em
+    config_stats), o histograma logarítmico do tempo de quadro e as
+    diferenças absolutas entre quadros consecutivos. Os lows seguem a
+    definição por percentil: FPS 1% low = 1000 / p99 do tempo de quadro
+    (0,1% low com o p99,9); jitter_ms é a média de |tempo[i] - tempo[i-1]|
+    
+    Retorna (métricas, histogramas (uma linha por linha das métricas),
+    limites das faixas em ms), ou None com o log vazio
+    """
+    edges = frame_histogram_edges()
+    n_bins = len(edges) - 1
+    ids = {}
+    stats = None
+    hist = np.zeros((0, n_bins), dtype=np.int64)
+    jitter_sum = np.zeros(0)
+    jitter_count = np.zeros(0, dtype=np.int64)
+    carry = None  # (configuração, tempo) do último quadro do bloco anterior
+    for chunk in iter_frame_log(log_path, chunksize):
+        if chunk.empty:
+            continue
+        groups = chunk.groupby(RUN_KEY, sort=False, observed=True)
+        local_ids = np.array([ids.setdefault(key, len(ids)) for key in groups.size().index])
+        codes = local_ids[groups.ngroup().to_numpy()]
+        n_groups = len(ids)
+        if n_groups > len(hist):
+            grow = n_groups - len(hist)
+            hist = np.vstack([hist, np.zeros((grow, n_bins), dtype=np.int64)])
+            jitter_sum = np.concatenate([jitter_sum, np.zeros(grow)])
+            jitter_count = np.concatenate([jitter_count, np.zeros(grow, dtype=np.int64)])
+        
+        times = chunk['TempoQuadroMs'].to_numpy(dtype=np.float64)
+        cells = codes * n_bins + frame_histogram_bins(times)
+        hist += np.bincount(cells, minlength=n_groups * n_bins).reshape(n_groups, n_bins)
+        
+        # Diferenças entre quadros consecutivos da mesma configuração
+        previous_codes = np.concatenate(([carry[0] if carry else -1], codes[:-1]))
+        previous_times = np.concatenate(([carry[1] if carry else 0.0], times[:-1]))
+        same = codes == previous_codes
+        jitter_sum += np.bincount(codes[same], weights=np.abs(times - previous_times)[same],
+                                  minlength=n_groups)
+        jitter_count += np.bincount(codes[same], minlength=n_groups)
+        carry = (codes[-1], times[-1])
+        
+        stats = merge_stats(stats, config_stats(chunk, 'TempoQuadroMs'))
+    
+    if stats is None:
+        return None
+    order = [ids[key] for key in stats[RUN_KEY].itertuples(index=False, name=None)]
+    hist = hist[order]
+    metrics = stats[RUN_KEY].assign(
+        quadros=stats['count'],
+        tempo_medio_ms=stats['mean'],
+        tempo_desvio_ms=np.sqrt(stats['m2'] / (stats['count'] - 1).where(stats['count'] > 1)),
+        tempo_max_ms=stats['max'])
+    percentiles = histogram_percentiles(hist, FRAME_LOG_PERCENTILES)
+    for j, percentile in enumerate(FRAME_LOG_PERCENTILES):
+        metrics[frame_percentile_column(percentile)] = percentiles[:, j]
+    metrics['FPS'] = 1000 / metrics['tempo_medio_ms']
+    metrics['FPS_1pct_baixo'] = 1000 / metrics[frame_percentile_column(99)]
+    metrics['FPS_0_1pct_baixo'] = 1000 / metrics[frame_percentile_column(99.9)]
+    with np.errstate(invalid='ignore'):
+        metrics['jitter_ms'] = jitter_sum[order] / jitter_count[order]
+    return metrics, hist, edges
+
+def scenario_mask(df, luz, tex, tipo_luz):
+    """Linhas de df do cenário (Iluminacao, Textura, TipoLuz)"""
+    return ((df['Iluminacao'] == luz) & (df['Textura'] == tex) & (df['TipoLuz'] == tipo_luz)).to_numpy()
+
+def plot_frame_time_histogram(metrics, hist, edges, output_dir, dpi=300, fmt='png'):
+    """Gráfico: distribuição do tempo de quadro por cenário, na maior quantidade de triângulos"""
+    triangles = metrics['Triangulos'].max()
+    fig, ax = new_figure((14, 7))
+    
+    selected = []
+    for luz, tex, tipo_luz, label in SCENARIOS:
+        rows = np.flatnonzero(scenario_mask(metrics, luz, tex, tipo_luz)
+                              & (metrics['Triangulos'] == triangles).to_numpy())
+        if len(rows):
+            counts = hist[rows[0]]
+            ax.stairs(counts / counts.sum() * 100, edges, label=label, linewidth=2)
+            selected.append(rows[0])
+    
+    # Limitar o eixo às faixas com quadros
+    used = np.flatnonzero(hist[selected].sum(axis=0))
+    if len(used):
+        ax.set_xlim(edges[used[0]], edges[used[-1] + 1])
+    ax.set_xscale('log')
+    ax.set_xlabel('Tempo de Quadro (ms)', fontsize=12)
+    ax.set_ylabel('Quadros (%)', fontsize=12)
+    ax.set_title(f'Distribuição do Tempo de Quadro\n({triangles} Triângulos)', fontsize=14, fontweight='bold')
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3)
+    save_figure(fig, output_dir, 'grafico_07_histograma_tempo_quadro', dpi, fmt)
+    print("✓ Gráfico 7 gerado: Histograma do Tempo de Quadro")
+
+def plot_fps_lows(metrics, output_dir, dpi=300, fmt='png'):
+    """Gráfico: FPS médio, 1% low e 0,1% low por quantidade de triângulos, um painel por cenário"""
+    fig = Figure(figsize=(18, 10))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(2, 3, squeeze=False)
+    
+    for ax, (luz, tex, tipo_luz, label) in zip(axes.ravel(), SCENARIOS):
+        part = metrics[scenario_mask(metrics, luz, tex, tipo_luz)].sort_values('Triangulos')
+        ax.plot(part['Triangulos'], part['FPS'], 'o-', label='FPS médio', linewidth=2, markersize=6)
+        ax.plot(part['Triangulos'], part['FPS_1pct_baixo'], 's--', label='1% low', linewidth=2, markersize=6)
+        ax.plot(part['Triangulos'], part['FPS_0_1pct_baixo'], '^:', label='0,1% low', linewidth=2, markersize=6)
+        ax.set_title(label, fontsize=12, fontweight='bold')
+        ax.legend(fontsize=9)
+        ax.grid(True, alpha=0.3)
+    for ax in axes[-1]:
+        ax.set_xlabel('Número de Triângulos', fontsize=11)
+    for ax in axes[:, 0]:
+        ax.set_ylabel('FPS', fontsize=11)
+    fig.suptitle('FPS Médio e Lows (1% / 0,1%) por Cenário', fontsize=14, fontweight='bold')
+    save_figure(fig, output_dir, 'grafico_08_fps_lows', dpi, fmt)
+    print("✓ Gráfico 8 gerado: FPS 1% / 0,1% Low")
+
+def plot_frame_jitter(metrics, output_dir, dpi=300, fmt='png'):
+    """Gráfico: jitter (variação entre quadros consecutivos) por quantidade de triângulos"""
+    fig, ax = new_figure((14, 7))
+    colors = matplotlib.colormaps['tab10'](np.linspace(0, 1, len(SCENARIOS)))
+    
+    for i, (luz, tex, tipo_luz, label) in enumerate(SCENARIOS):
+        part = metrics[scenario_mask(metrics, luz, tex, tipo_luz)].sort_values('Triangulos')
+        if not part.empty:
+            ax.plot(part['Triangulos'], part['jitter_ms'], 'o-', label=label,
+                    linewidth=2, markersize=6, color=colors[i])
+    
+    ax.set_xlabel('Número de Triângulos', fontsize=12)
+    ax.set_ylabel('Jitter (ms, média de |Δ tempo de quadro|)', fontsize=12)
+    ax.set_title('Jitter do Tempo de Quadro por Cenário', fontsize=14, fontweight='bold')
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3)
+    save_figure(fig, output_dir, 'grafico_09_jitter_tempo_quadro', dpi, fmt)
+    print("✓ Gráfico 9 gerado: Jitter do Tempo de Quadro")
+
+def run_frame_time_report(log_path, output_dir, chunksize=FRAME_LOG_CHUNK_ROWS, dpi=300, fmt='png'):
+    """
+    Analisa o log de tempos de quadro: grava as métricas por configuração e
+    gera os gráficos 7 a 9
+    
+    Retorna as métricas (None com o log vazio)
+    """
+    result = analyze_frame_log(log_path, chunksize)
+    if result is None:
+        print("! Aviso: log de tempos de quadro vazio")
+        return None
+    metrics, hist, edges = result
+    print(f"✓ {int(metrics['quadros'].sum())} quadros em {len(metrics)} configurações\n")
+    
+    metrics_path = f'{output_dir}/metricas_tempo_quadro.csv'
+    metrics.assign(Iluminacao=metrics['Iluminacao'].map(yes_no),
+                   Textura=metrics['Textura'].map(yes_no)).to_csv(metrics_path, index=False)
+    plot_frame_time_histogram(metrics, hist, edges, output_dir, dpi, fmt)
+    plot_fps_lows(metrics, output_dir, dpi, fmt)
+    plot_frame_jitter(metrics, output_dir, dpi, fmt)
+    print(f"✓ Métricas de tempo de quadro salvas em: {metrics_path}")
+    return metrics
+
+# Chave que identifica um caso do benchmark de filtros (trabalhoPDI/benchmarks/bench_filtros.py)
+BENCH_KEY = ['filtro', 'parametro', 'valor', 'resolucao', 'threads']
+
+def load_benchmark(path):
+    """Carrega resultados do benchmark de filtros (.csv ou .json)"""
+    if str(path).endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            df = pd.DataFrame(json.load(f)['resultados'])
+    else:
+        df = pd.read_csv(path, keep_default_na=False)
+    # Colunas de identificação como texto, tanto no CSV quanto no JSON
+    # ('valor' fica vazio para filtros sem parâmetro varrido)
+    for column in ['filtro', 'parametro', 'valor', 'resolucao']:
+        df[column] = df[column].astype(str)
+    return df
+
+def plot_benchmark_throughput(df, output_dir, dpi=300, fmt='png'):
+    """Gráfico: vazão (MP/s) por resolução, um painel por filtro"""
+    filters = list(dict.fromkeys(df['filtro']))
+    threads = df['threads'].max()
+    fig = Figure(figsize=(5 * len(filters), 5))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(1, len(filters), squeeze=False)[0]
+    
+    for ax, filtro in zip(axes, filters):
+        df_filter = df[(df['filtro'] == filtro) & (df['threads'] == threads)]
+        for valor, df_value in df_filter.groupby('valor', sort=False):
+            df_value = df_value.sort_values('megapixels')
+            label = f"{df_value['parametro'].iloc[0]}={valor}" if valor else filtro
+            ax.plot(df_value['megapixels'], df_value['mp_por_s'], 'o-', label=label, linewidth=2, markersize=6)
+        ax.set_xscale('log')
+        ax.set_title(filtro, fontsize=12, fontweight='bold')
+        ax.set_xlabel('Megapixels', fontsize=11)
+        ax.legend(fontsize=9)
+        ax.grid(True, alpha=0.3)
+    axes[0].set_ylabel('Vazão (MP/s)', fontsize=11)
+    fig.suptitle(f'Vazão dos Filtros por Resolução ({threads} thread(s))', fontsize=14, fontweight='bold')
+    save_figure(fig, output_dir, 'grafico_bench_01_vazao_filtros', dpi, fmt)
+    print("✓ Gráfico de benchmark gerado: Vazão dos Filtros")
+
+def compare_benchmarks(df_current, df_baseline, tolerance=0.10):
+    """
+    Compara dois resultados do benchmark caso a caso
+    
+    Retorna os casos presentes em ambos com a razão de tempo
+    (atual / referência) e a coluna 'regressao' (razão > 1 + tolerance)
+    """
+    columns = BENCH_KEY + ['tempo_ms']
+    merged = df_current[columns].merge(df_baseline[columns], on=BENCH_KEY,
+                                       suffixes=('_atual', '_referencia'))
+    merged['razao'] = merged['tempo_ms_atual'] / merged['tempo_ms_referencia']
+    merged['regressao'] = merged['razao'] > 1 + tolerance
+    return merged
+
+def plot_benchmark_regression(comparison, output_dir, tolerance=0.10, dpi=300, fmt='png'):
+    """Gráfico: razão de tempo atual/referência por caso, regressões em vermelho"""
+    labels = (comparison['filtro'] + ' ' + comparison['parametro'] + comparison['valor'].where(
+        comparison['valor'] == '', '=' + comparison['valor']) + ' @' + comparison['resolucao']
+        + ' t' + comparison['threads'].astype(str))
+    colors = np.where(comparison['regressao'], 'tab:red', 'tab:green')
+    
+    fig, ax = new_figure((12, max(4, 0.3 * len(comparison))))
+    y = np.arange(len(comparison))
+    ax.barh(y, comparison['razao'], color=colors)
+    ax.axvline(1.0, color='black', linewidth=1)
+    ax.axvline(1.0 + tolerance, color='tab:red', linestyle='--', linewidth=1,
+               label=f'Limite (+{tolerance:.0%})')
+    ax.set_yticks(y, labels, fontsize=8)
+    ax.invert_yaxis()
+    ax.set_xlabel('Tempo atual / referência', fontsize=12)
+    ax.set_title('Comparação de Desempenho dos Filtros entre Versões', fontsize=14, fontweight='bold')
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3, axis='x')
+    save_figure(fig, output_dir, 'grafico_bench_02_regressao', dpi, fmt)
+    print("✓ Gráfico de benchmark gerado: Regressões")
+
+def run_benchmark_report(benchmark_path, output_dir, baseline_path=None, tolerance=0.10,
+                         dpi=300, fmt='png'):
+    """
+    Gera os gráficos do benchmark de filtros e, com uma referência,
+    compara as versões
+    
+    Retorna o número de casos com regressão
+    """
+    Path(output_dir).mkdir(exist_ok=True)
+    df = load_benchmark(benchmark_path)
+    print(f"✓ Benchmark carregado: {len(df)} casos\n")
+    plot_benchmark_throughput(df, output_dir, dpi, fmt)
+    if baseline_path is None:
+        return 0
+    
+    comparison = compare_benchmarks(df, load_benchmark(baseline_path), tolerance)
+    if comparison.empty:
+        print("! Aviso: nenhum caso em comum com a referência")
+        return 0
+    plot_benchmark_regression(comparison, output_dir, tolerance, dpi, fmt)
+    regressions = comparison[comparison['regressao']]
+    print(f"\nCasos comparados: {len(comparison)} | Regressões (> +{tolerance:.0%}): {len(regressions)}")
+    for _, row in regressions.iterrows():
+        case = f"{row['filtro']} {row['parametro']}={row['valor']}" if row['valor'] else row['filtro']
+        print(f"  ✗ {case} @ {row['resolucao']}, "
+              f"{row['threads']} thread(s): {row['tempo_ms_referencia']:.2f} ms -> "
+              f"{row['tempo_ms_atual']:.2f} ms ({row['razao']:.2f}x)")
+    return len(regressions)
+
 def main():
+    parser = argparse.ArgumentParser(description='Gera gráficos de desempenho GPU/CPU')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processos para gerar os gráficos (padrão: núcleos)')
+    parser.add_argument('--dpi', type=int, default=300, help='Resolução dos gráficos')
+    parser.add_argument('--formato', default='png', help='Formato dos gráficos (png, svg, pdf...)')
+    parser.add_argument('--benchmark', default=None,
+                        help='Resultados de bench_filtros.py (.csv/.json): gera os gráficos do benchmark')
+    parser.add_argument('--referencia', default=None,
+                        help='Resultados de uma versão anterior para detectar regressões')
+    parser.add_argument('--tolerancia', type=float, default=0.10,
+                        help='Aumento relativo de tempo aceito antes de acusar regressão')
+    parser.add_argument('--cache', default=None,
+                        help='Cache tipado do CSV (.feather/.arrow ou .parquet, requer pyarrow), '
+                             'reaproveitado enquanto o CSV não mudar (com --completo)')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='Lê o CSV em blocos de N linhas (logs grandes; com --completo) e o log '
+                             f'de tempos de quadro em blocos de N linhas (padrão: {FRAME_LOG_CHUNK_ROWS})')
+    parser.add_argument('--tempos-quadro', default=FRAME_LOG_FILE,
+                        help='Log de tempos de quadro de main_glut.cpp (analisado se existir)')
+    parser.add_argument('--completo', action='store_true',
+                        help='Ignora a agregação incremental: relê o CSV inteiro e refaz tudo, com '
+                             'mediana, percentis do tempo de quadro e intervalo bootstrap por configuração')
+    parser.add_argument('--aquecimento', type=int, default=WARMUP_SAMPLES,
+                        help='Amostras descartadas no início de cada varredura do benchmark')
+    parser.add_argument('--bootstrap', type=int, default=BOOTSTRAP_SAMPLES,
+                        help='Réplicas do intervalo bootstrap (com --completo)')
+    parser.add_argument('--confianca', type=float, default=CONFIDENCE,
+                        help='Nível de confiança das barras de erro')
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        regressions = run_benchmark_report(args.benchmark, 'outputs', args.referencia,
+                                           args.tolerancia, args.dpi, args.formato)
+        sys.exit(1 if regressions else 0)
+    
     # Configurações
     csv_path = 'performance_results.csv'
     output_dir = 'outputs'
@@ -236,32 +1079,68 @@ def main():
         print("Execute o programa OpenGL primeiro para gerar os dados.")
         return
     
-    # Carregar dados
-    print("\nCarregando dados de desempenho...")
-    df = load_data(csv_path)
-    print(f"✓ Dados carregados: {len(df)} testes\n")
+    stats_path = f'{output_dir}/estatisticas_resumo.txt'
+    if args.completo:
+        # Carregar dados
+        print("\nCarregando dados de desempenho...")
+        df = load_data(csv_path, args.chunksize, args.cache)
+        print(f"✓ Dados carregados: {len(df)} testes\n")
+        df = discard_warmup(df, args.aquecimento)
+        stats = config_stats(df)
+        state, changed = None, None
+        runs = run_statistics(df, args.bootstrap, args.confianca)
+        runs_path = f'{output_dir}/estatisticas_execucoes.csv'
+        runs.assign(Iluminacao=runs['Iluminacao'].map(yes_no), Textura=runs['Textura'].map(yes_no)).to_csv(
+            runs_path, index=False)
+        print(f"✓ Estatísticas por configuração salvas em: {runs_path}\n")
+        frame = runs[['Triangulos', 'FPS', 'Iluminacao', 'Textura', 'TipoLuz', 'FPS_inf', 'FPS_sup']]
+    else:
+        # Incorporar só as linhas acrescentadas desde a última execução
+        print("\nAtualizando estatísticas de desempenho...")
+        state, changed = update_stats(csv_path, read_state(STATE_FILE.format(output_dir=output_dir)),
+                                      args.aquecimento)
+        stats = state['estatisticas']
+        frame = stats_frame(stats, args.confianca)
+        render = {'dpi': args.dpi, 'formato': args.formato, 'confianca': args.confianca}
+        if state['graficos'] != render:
+            changed = None
+        state['graficos'] = render
+        print(f"✓ {int(stats['count'].sum())} testes em {len(stats)} configurações"
+              + ("" if changed is None else f" ({len(changed)} alterada(s))") + "\n")
     
     # Gerar gráficos
-    print("Gerando gráficos de análise...\n")
-    
-    plot_fps_vs_triangles(df, output_dir)
-    plot_lighting_impact(df, output_dir)
-    plot_texture_impact(df, output_dir)
-    plot_combined_effects(df, output_dir)
-    plot_performance_degradation(df, output_dir)
-    plot_fps_heatmap(df, output_dir)
+    plots = plots_to_update(changed)
+    if stats.empty:
+        print("! Aviso: nenhuma medição válida, gráficos não gerados")
+        plots = []
+    if plots:
+        print("Gerando gráficos de análise...\n")
+        generate_plots(frame, output_dir, args.workers, args.dpi, args.formato,
+                       plots=plots)
     
     # Gerar estatísticas
-    print("\nGerando estatísticas resumidas...")
-    stats_path = f'{output_dir}/estatisticas_resumo.txt'
-    generate_summary_stats(df, stats_path)
+    if changed is None or len(changed) or not Path(stats_path).exists():
+        print("\nGerando estatísticas resumidas...")
+        write_summary_stats(stats, stats_path)
+    if state is not None:
+        write_state(state, STATE_FILE.format(output_dir=output_dir))
+    
+    # Analisar os tempos de quadro
+    frame_metrics = None
+    if Path(args.tempos_quadro).exists():
+        print("\nAnalisando tempos de quadro...")
+        frame_metrics = run_frame_time_report(args.tempos_quadro, output_dir,
+                                              args.chunksize or FRAME_LOG_CHUNK_ROWS,
+                                              args.dpi, args.formato)
     
     print("\n" + "=" * 80)
     print("✓ ANÁLISE CONCLUÍDA COM SUCESSO!")
     print("=" * 80)
     print(f"\nArquivos gerados em: {output_dir}/")
-    print("  - 6 gráficos PNG")
+    print(f"  - {len(plots)} gráfico(s) {args.formato.upper()} atualizado(s)")
     print("  - 1 arquivo de estatísticas TXT")
+    if frame_metrics is not None:
+        print(f"  - 3 gráficos {args.formato.upper()} de tempo de quadro e as métricas em CSV")
     print("\n")
 
 if __name__ == '__main__':
@@ -36,6 +36,10 @@ double fps = 0.0;
 double lastTime = 0.0;
 double testStartTime = 0.0;
 double testDuration = 3.0; // segundos por teste
+double lastFrameTime = 0.0;
+
+// Log do tempo de cada quadro (analisado por generate_graphs.py)
+std::ofstream frameTimeLog;
 
 GLuint textureID;
 
@@ -149,6 +153,11 @@ void setupLighting() {
     }
 }
 
+// Nome do tipo de luz atual, como gravado nos CSVs
+std::string lightTypeName() {
+    return lightType == 0 ? "Sem luz" : (lightType == 1 ? "Omnidirecional" : "Spot");
+}
+
 // Função para salvar resultados
 void saveResults() {
     std::ofstream file("performance_results.csv");
@@ -163,8 +172,10 @@ void saveResults() {
     }
     
     file.close();
+    frameTimeLog.close();
     
     std::cout << "\nResultados salvos em: performance_results.csv" << std::endl;
+    std::cout << "Tempos de quadro salvos em: frame_times.csv" << std::endl;
 }
 
 // Função de renderização
@@ -218,6 +229,14 @@ void display() {
     
     double currentTime = getTime();
     
+    // Registrar o tempo deste quadro (com a configuração em que foi desenhado)
+    frameTimeLog << currentTriangleCount << ","
+                 << (currentTime - lastFrameTime) * 1000.0 << ","
+                 << (useLighting ? "Sim" : "Nao") << ","
+                 << (useTexture ? "Sim" : "Nao") << ","
+                 << lightTypeName() << "\n";
+    lastFrameTime = currentTime;
+    
     // Calcular FPS a cada segundo
     if (currentTime - lastTime >= 1.0) {
         fps = frameCount / (currentTime - lastTime);
@@ -237,7 +256,7 @@ void display() {
         data.fps = fps;
         data.lighting = useLighting;
         data.texture = useTexture;
-        data.lightType = lightType == 0 ? "Sem luz" : (lightType == 1 ? "Omnidirecional" : "Spot");
+        data.lightType = lightTypeName();
         performanceLog.push_back(data);
         
         // Avançar para próximo teste
@@ -305,6 +324,10 @@ void init() {
     
     lastTime = getTime();
     testStartTime = getTime();
+    lastFrameTime = getTime();
+    
+    frameTimeLog.open("frame_times.csv");
+    frameTimeLog << "Triangulos,TempoQuadroMs,Iluminacao,Textura,TipoLuz\n";
     
     std::cout << "Iniciando testes de desempenho..." << std::endl;
     std::cout << "Teste atual: " << currentTriangleCount << " triangulos\n" << std::endl;
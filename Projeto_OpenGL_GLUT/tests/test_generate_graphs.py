@@ -0,0 +1,44 @@
+"""
+Testes de generate_graphs.py
+
+Uso (a partir de Projeto_OpenGL_GLUT/):
+    python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_graphs  # noqa: E402
+
+CABECALHO = 'Triangulos,FPS,Iluminacao,Textura,TipoLuz\n'
+
+
+def executar_main(pasta, monkeypatch, conteudo, *argumentos):
+    """Executa main() em pasta com performance_results.csv = conteudo; retorna o resumo"""
+    (pasta / 'performance_results.csv').write_text(conteudo, encoding='utf-8')
+    (pasta / 'outputs').mkdir(exist_ok=True)
+    monkeypatch.chdir(pasta)
+    monkeypatch.setattr(sys, 'argv', ['generate_graphs.py', '--workers', '1', '--dpi', '40', *argumentos])
+    generate_graphs.main()
+    return (pasta / 'outputs' / 'estatisticas_resumo.txt').read_text(encoding='utf-8')
+
+
+@pytest.mark.parametrize('argumentos', [(), ('--completo',)])
+@pytest.mark.parametrize('conteudo', [CABECALHO, CABECALHO + '1,2.30057,Nao,Nao,Sem luz\n'],
+                         ids=['so_cabecalho', 'so_aquecimento'])
+def test_csv_sem_medicoes(tmp_path, monkeypatch, conteudo, argumentos):
+    resumo = executar_main(tmp_path, monkeypatch, conteudo, *argumentos)
+    assert 'Nenhuma medição válida' in resumo
+    assert not list((tmp_path / 'outputs').glob('grafico_*'))
+
+
+def test_medicoes_acrescentadas_depois_de_csv_vazio(tmp_path, monkeypatch):
+    executar_main(tmp_path, monkeypatch, CABECALHO)
+    resumo = executar_main(tmp_path, monkeypatch, CABECALHO + '1,2.30057,Nao,Nao,Sem luz\n'
+                           '1,532.665,Sim,Nao,Omnidirecional\n')
+    assert 'Total de testes realizados: 1' in resumo
+    assert list((tmp_path / 'outputs').glob('grafico_*'))
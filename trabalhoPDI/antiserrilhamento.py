@@ -1,24 +1,127 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+import argparse
+import glob
+import inspect
 import os
+import queue
+import threading
+
+from bilateral_rapido import bilateral_grade_como_cv2
+from cache_resultados import CacheResultados, com_cache, com_cache_metricas
+from contagem_cores import contar_cores_unicas
+from espaco_cor import ImagemCor
+from gaussiano import desfoque_gaussiano
+from histogramas import calcular_histogramas, salvar_histogramas
+from mediana import filtro_mediana
+from metricas import calcular_metricas
+from perfil import Perfilador, medir_etapa, perfilado
+from pos_processamento_aa import fxaa, mlaa, smaa
+from processamento_lote import processar_lote_filtro
+from processamento_tiles import (FILTROS, halo_do_filtro, processar_arquivo_em_tiles,
+                                  processar_regioes_ativas)
+from renderizacao import FIGURAS, renderizar, renderizar_em_paralelo
+from supersampling import supersampling_fundido
+
+# Extensões reconhecidas ao varrer diretórios no modo em lote
+EXTENSOES_IMAGEM = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
 
 class AntiAliasingDemo:
     """
     Classe para demonstração de técnicas de antiserrilhamento em imagens
     """
     
-    def __init__(self, output_dir="resultados"):
+    def __init__(self, output_dir="resultados", gerar_figuras=True, salvar_imagens=True,
+                 dpi=300, formato='png', saidas_figuras=None, workers_figuras=None,
+                 cache=None, perfilador=None, adaptativo=False):
         """
         Inicializa a classe e cria diretório de saída
         
         Args:
             output_dir: Diretório para salvar os resultados
+            gerar_figuras: Se False (modo só cálculo), nenhuma figura do
+                           matplotlib é gerada; os dados de cada etapa são
+                           retornados e podem ser plotados depois com
+                           renderizar_figuras
+            salvar_imagens: Salvar as imagens filtradas individuais (PNG)
+            dpi: Resolução padrão das figuras
+            formato: Formato padrão das figuras (png, jpg, svg, pdf...)
+            saidas_figuras: Ajustes por figura, ex.:
+                            {'comparacao': {'dpi': 150, 'formato': 'jpg'}}
+            workers_figuras: Se > 1, as figuras de cada imagem são geradas
+                             ao final do pipeline, em paralelo nesse número
+                             de processos (pool reaproveitado entre as
+                             imagens; encerrado por fechar)
+            cache: CacheResultados opcional; filtros, mapas de bordas e
+                   métricas já calculados para a mesma imagem e os mesmos
+                   parâmetros são lidos do disco em vez de recalculados
+            perfilador: Perfilador opcional; mede tempo, CPU, pico de
+                        memória e bytes de saída de cada etapa e de cada
+                        chamada aplicar_*
+            adaptativo: Se True, comparar_tecnicas_antialiasing aplica o
+                        filtro bilateral só nas regiões de borda (ver
+                        aplicar_adaptativo)
         """
         self.output_dir = output_dir
+        self.gerar_figuras = gerar_figuras
+        self.salvar_imagens = salvar_imagens
+        self.dpi = dpi
+        self.formato = formato
+        self.saidas_figuras = saidas_figuras or {}
+        self.workers_figuras = workers_figuras
+        self.cache = cache
+        self.perfilador = perfilador
+        self.adaptativo = adaptativo
+        self._adiar_figuras = False
+        self._pool_figuras = None
         Path(output_dir).mkdir(exist_ok=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.fechar()
+    
+    def fechar(self):
+        """
+        Encerra o pool de processos das figuras, se tiver sido criado
+        """
+        if self._pool_figuras is not None:
+            self._pool_figuras[1].shutdown()
+            self._pool_figuras = None
+    
+    def _pool_de_figuras(self, workers):
+        """
+        Pool de processos das figuras, criado na primeira renderização
+        paralela e reaproveitado pelas imagens seguintes
+        """
+        if self._pool_figuras is not None and self._pool_figuras[0] != workers:
+            self.fechar()
+        if self._pool_figuras is None:
+            self._pool_figuras = (workers, ProcessPoolExecutor(max_workers=workers))
+        return self._pool_figuras[1]
         
+    def _configuracao_figura(self, etapa):
+        """
+        DPI e formato de uma figura, considerando ajustes por etapa
+        """
+        ajuste = self.saidas_figuras.get(etapa, {})
+        return ajuste.get('dpi', self.dpi), ajuste.get('formato', self.formato)
+    
+    def _plotar(self, etapa, dados, nome_imagem, descricao):
+        """
+        Gera imediatamente a figura de uma etapa, salvo se estiver desligado
+        ou adiado para a renderização paralela do fim do pipeline
+        """
+        if not self.gerar_figuras or self._adiar_figuras:
+            return
+        dpi, formato = self._configuracao_figura(etapa)
+        caminho = renderizar(etapa, dados, nome_imagem, self.output_dir, dpi, formato)
+        print(f"✓ {descricao}: {os.path.basename(caminho)}")
+    
     def carregar_imagem(self, caminho):
         """
         Carrega uma imagem e retorna em BGR (OpenCV) e RGB (visualização)
@@ -35,13 +138,15 @@ class AntiAliasingDemo:
         img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
         return img_bgr, img_rgb
     
-    def analisar_caracteristicas(self, img, nome_imagem):
+    def analisar_caracteristicas(self, img, nome_imagem, metodo_cores='bitset'):
         """
         Analisa e exibe características técnicas da imagem
         
         Args:
             img: Imagem a ser analisada
             nome_imagem: Nome descritivo da imagem
+            metodo_cores: Contagem de cores únicas - 'bitset' (exato, padrão),
+                          'hll' (aproximado) ou 'unique' (np.unique original)
             
         Returns:
             Dicionário com as características
@@ -49,8 +154,8 @@ class AntiAliasingDemo:
         altura, largura = img.shape[:2]
         canais = img.shape[2] if len(img.shape) == 3 else 1
         
-        # Análise de paleta de cores
-        cores_unicas = len(np.unique(img.reshape(-1, img.shape[2]), axis=0))
+        # Análise de paleta de cores (cores empacotadas em 24 bits + bitset)
+        cores_unicas = contar_cores_unicas(img, metodo_cores)
         
         # Análise de gamut (faixa dinâmica)
         valor_min = img.min()
@@ -97,122 +202,58 @@ class AntiAliasingDemo:
         """
         r, g, b = cv2.split(img_rgb)
         
-        # Criar visualização dos canais
-        fig, axes = plt.subplots(2, 4, figsize=(16, 8))
-        fig.suptitle(f'Decomposição RGB - {nome_imagem}', fontsize=16, fontweight='bold')
-        
-        # Imagem original
-        axes[0, 0].imshow(img_rgb)
-        axes[0, 0].set_title('Imagem Original')
-        axes[0, 0].axis('off')
-        
-        # Canal Vermelho
-        img_r = np.zeros_like(img_rgb)
-        img_r[:,:,0] = r
-        axes[0, 1].imshow(img_r)
-        axes[0, 1].set_title('Canal Vermelho (R)')
-        axes[0, 1].axis('off')
-        
-        # Canal Verde
-        img_g = np.zeros_like(img_rgb)
-        img_g[:,:,1] = g
-        axes[0, 2].imshow(img_g)
-        axes[0, 2].set_title('Canal Verde (G)')
-        axes[0, 2].axis('off')
-        
-        # Canal Azul
-        img_b = np.zeros_like(img_rgb)
-        img_b[:,:,2] = b
-        axes[0, 3].imshow(img_b)
-        axes[0, 3].set_title('Canal Azul (B)')
-        axes[0, 3].axis('off')
-        
-        # Canais em escala de cinza
-        axes[1, 1].imshow(r, cmap='Reds')
-        axes[1, 1].set_title('Canal R (Intensidade)')
-        axes[1, 1].axis('off')
-        
-        axes[1, 2].imshow(g, cmap='Greens')
-        axes[1, 2].set_title('Canal G (Intensidade)')
-        axes[1, 2].axis('off')
-        
-        axes[1, 3].imshow(b, cmap='Blues')
-        axes[1, 3].set_title('Canal B (Intensidade)')
-        axes[1, 3].axis('off')
-        
-        # Remover subplot não utilizado
-        fig.delaxes(axes[1, 0])
-        
-        plt.tight_layout()
-        plt.savefig(f"{self.output_dir}/decomposicao_rgb_{nome_imagem}.png", dpi=300, bbox_inches='tight')
-        plt.close()
+        self._plotar('decomposicao', {'original': img_rgb, 'r': r, 'g': g, 'b': b},
+                     nome_imagem, "Decomposição RGB salva")
         
         return r, g, b
     
-    def gerar_histogramas(self, img_rgb, nome_imagem):
+    def gerar_histogramas(self, img_rgb, nome_imagem, caminho_cache=None):
         """
         Gera histogramas para cada canal RGB
         
         Args:
             img_rgb: Imagem em RGB
             nome_imagem: Nome da imagem para salvar
+            caminho_cache: Arquivo .npz para salvar as contagens (opcional)
+            
+        Returns:
+            Array 3x256 com as contagens dos canais R, G e B
         """
-        r, g, b = cv2.split(img_rgb)
+        # Contagens inteiras calculadas uma única vez para os três canais
+        histogramas = calcular_histogramas(img_rgb)
+        if caminho_cache is not None:
+            salvar_histogramas(caminho_cache, histogramas)
         
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-        fig.suptitle(f'Histogramas RGB - {nome_imagem}', fontsize=16, fontweight='bold')
-        
-        # Histograma combinado
-        axes[0, 0].hist(r.ravel(), bins=256, color='red', alpha=0.5, label='Red')
-        axes[0, 0].hist(g.ravel(), bins=256, color='green', alpha=0.5, label='Green')
-        axes[0, 0].hist(b.ravel(), bins=256, color='blue', alpha=0.5, label='Blue')
-        axes[0, 0].set_title('Histograma Combinado')
-        axes[0, 0].set_xlabel('Intensidade de Pixel')
-        axes[0, 0].set_ylabel('Frequência')
-        axes[0, 0].legend()
-        axes[0, 0].grid(True, alpha=0.3)
-        
-        # Histograma Canal Vermelho
-        axes[0, 1].hist(r.ravel(), bins=256, color='red', alpha=0.7)
-        axes[0, 1].set_title('Histograma Canal Vermelho')
-        axes[0, 1].set_xlabel('Intensidade')
-        axes[0, 1].set_ylabel('Frequência')
-        axes[0, 1].grid(True, alpha=0.3)
-        
-        # Histograma Canal Verde
-        axes[1, 0].hist(g.ravel(), bins=256, color='green', alpha=0.7)
-        axes[1, 0].set_title('Histograma Canal Verde')
-        axes[1, 0].set_xlabel('Intensidade')
-        axes[1, 0].set_ylabel('Frequência')
-        axes[1, 0].grid(True, alpha=0.3)
-        
-        # Histograma Canal Azul
-        axes[1, 1].hist(b.ravel(), bins=256, color='blue', alpha=0.7)
-        axes[1, 1].set_title('Histograma Canal Azul')
-        axes[1, 1].set_xlabel('Intensidade')
-        axes[1, 1].set_ylabel('Frequência')
-        axes[1, 1].grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        plt.savefig(f"{self.output_dir}/histogramas_{nome_imagem}.png", dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"✓ Histogramas salvos: histogramas_{nome_imagem}.png")
-    
-    def aplicar_gaussian_blur(self, img, kernel_size=5):
+        self._plotar('histogramas', {'contagens': histogramas}, nome_imagem, "Histogramas salvos")
+        
+        return histogramas
+    
+    @perfilado()
+    @com_cache('gaussian')
+    def aplicar_gaussian_blur(self, img, kernel_size=5, sigma=None, metodo='auto'):
         """
         Aplica filtro Gaussiano para suavização (técnica básica de anti-aliasing)
         
         Args:
-            img: Imagem de entrada
-            kernel_size: Tamanho do kernel (deve ser ímpar)
+            img: Imagem de entrada (uint8, uint16 ou float32)
+            kernel_size: Tamanho do kernel (deve ser ímpar); usado quando
+                         sigma não é informado
+            sigma: Desvio padrão em pixels; se informado, o kernel é
+                   derivado de sigma e o algoritmo é escolhido por metodo
+            metodo: 'auto' (FIR separável para sigma pequeno, IIR recursivo
+                    de custo constante para sigma grande), 'fir' ou 'iir'
             
         Returns:
             Imagem suavizada
         """
+        if sigma is not None:
+            return desfoque_gaussiano(img, sigma, metodo)
         return cv2.GaussianBlur(img, (kernel_size, kernel_size), 0)
     
-    def aplicar_bilateral_filter(self, img, d=9, sigma_color=75, sigma_space=75):
+    @perfilado()
+    @com_cache('bilateral')
+    def aplicar_bilateral_filter(self, img, d=9, sigma_color=75, sigma_space=75,
+                                 modo='exato', precisao=1.0):
         """
         Aplica filtro bilateral para suavização preservando bordas
         
@@ -221,37 +262,60 @@ class AntiAliasingDemo:
             d: Diâmetro do pixel vizinho
             sigma_color: Filtro sigma no espaço de cor
             sigma_space: Filtro sigma no espaço de coordenadas
+            modo: 'exato' (cv2.bilateralFilter) ou 'grade' (aproximação
+                  por grade bilateral, custo quase constante em d; compensa
+                  a partir de d ~ 15, ver benchmarks/bench_bilateral.py)
+            precisao: No modo 'grade', resolução relativa da grade
+                      (maior = mais fiel e mais lento)
             
         Returns:
             Imagem com filtro bilateral
         """
+        if modo == 'grade':
+            return bilateral_grade_como_cv2(img, d, sigma_color, sigma_space, precisao)
+        if modo != 'exato':
+            raise ValueError(f"Modo desconhecido: {modo}")
         return cv2.bilateralFilter(img, d, sigma_color, sigma_space)
     
+    @perfilado()
+    @com_cache('median')
     def aplicar_median_blur(self, img, kernel_size=5):
         """
         Aplica filtro de mediana para redução de ruído
         
+        Kernels grandes (15-31) têm custo independente do tamanho, também em
+        imagens de 16 bits (ver mediana.py); o resultado é o do cv2.medianBlur.
+        
         Args:
-            img: Imagem de entrada
+            img: Imagem de entrada (uint8, uint16 ou int16)
             kernel_size: Tamanho do kernel
             
         Returns:
             Imagem com filtro de mediana
         """
-        return cv2.medianBlur(img, kernel_size)
+        return filtro_mediana(img, kernel_size)
     
-    def aplicar_supersampling(self, img, scale_factor=2):
+    @perfilado()
+    @com_cache('ssaa')
+    def aplicar_supersampling(self, img, scale_factor=2, metodo='fundido'):
         """
         Aplica supersampling (SSAA) - técnica clássica de anti-aliasing
         Redimensiona para cima e depois volta ao tamanho original
         
         Args:
             img: Imagem de entrada
-            scale_factor: Fator de escala para supersampling
+            scale_factor: Fator de escala (inteiro) para supersampling
+            metodo: 'fundido' (convolução equivalente, sem a imagem ampliada;
+                    ver supersampling.py) ou 'classico' (amplia e reduz)
             
         Returns:
             Imagem com supersampling aplicado
         """
+        if metodo == 'fundido':
+            return supersampling_fundido(img, scale_factor)
+        if metodo != 'classico':
+            raise ValueError(f"Método desconhecido: {metodo}")
+        
         altura, largura = img.shape[:2]
         
         # Aumenta a resolução
@@ -264,106 +328,231 @@ class AntiAliasingDemo:
         
         return img_downscaled
     
-    def aplicar_morphological_antialiasing(self, img):
+    @perfilado()
+    @com_cache('fxaa')
+    def aplicar_fxaa(self, img, ordem='RGB', limiar_contraste=0.125, limiar_minimo=0.0312,
+                     subpixel=0.75):
+        """
+        Aplica FXAA - anti-aliasing por pós-processamento guiado pelas bordas
+        Mistura cada pixel de borda com o vizinho do outro lado da borda
+        
+        Args:
+            img: Imagem de entrada
+            ordem: Ordem dos canais ('RGB' ou 'BGR'), usada na luminância
+            limiar_contraste: Contraste mínimo, relativo ao máximo local
+            limiar_minimo: Contraste mínimo absoluto
+            subpixel: Intensidade da suavização de sub-pixel (0 a 1)
+            
+        Returns:
+            Imagem com FXAA aplicado
+        """
+        return fxaa(img, ordem, limiar_contraste, limiar_minimo, subpixel)
+    
+    @perfilado()
+    @com_cache('smaa')
+    def aplicar_smaa(self, img, ordem='RGB', limiar=0.1, distancia_maxima=16):
+        """
+        Aplica SMAA simplificado - anti-aliasing morfológico por subpixel
+        Reconstrói a borda pelos padrões L/Z/U e mistura pela área coberta
+        
+        Args:
+            img: Imagem de entrada
+            ordem: Ordem dos canais ('RGB' ou 'BGR'), usada na luminância
+            limiar: Diferença mínima de luminância (0 a 1) para haver borda
+            distancia_maxima: Alcance da busca das extremidades, em pixels
+            
+        Returns:
+            Imagem com SMAA aplicado
+        """
+        return smaa(img, ordem, limiar, distancia_maxima=distancia_maxima)
+    
+    @perfilado()
+    @com_cache('mlaa')
+    def aplicar_morphological_antialiasing(self, img, limiar=0.1, distancia_maxima=32):
         """
-        Aplica operações morfológicas para suavizar bordas (anti-aliasing morfológico)
+        Aplica anti-aliasing morfológico (MLAA) preservando as cores
+        Classifica as bordas em padrões L/Z/U e mistura só os pixels de borda
         
         Args:
             img: Imagem de entrada
+            limiar: Diferença mínima (0 a 1) em algum canal para haver borda
+            distancia_maxima: Alcance da busca das extremidades, em pixels
             
         Returns:
             Imagem com anti-aliasing morfológico
         """
-        # Converter para escala de cinza temporariamente para operações morfológicas
-        gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+        return mlaa(img, limiar, distancia_maxima)
+    
+    @perfilado()
+    @com_cache('canny')
+    def detectar_bordas(self, img_gray, limiar_inferior=50, limiar_superior=150):
+        """
+        Detecta bordas com o operador de Canny
+        
+        Args:
+            img_gray: Imagem em escala de cinza
+            limiar_inferior: Limiar inferior da histerese
+            limiar_superior: Limiar superior da histerese
+            
+        Returns:
+            Mapa binário de bordas
+        """
+        return cv2.Canny(img_gray, limiar_inferior, limiar_superior)
+    
+    def aplicar_em_tiles(self, filtro, caminho_entrada, caminho_saida, tamanho_tile=1024,
+                         shape=None, dtype=np.uint8, **params):
+        """
+        Aplica um filtro aplicar_* em tiles com halo, lendo e gravando arquivos
+        mapeados em memória (.npy ou brutos). O resultado é idêntico ao
+        processamento em memória e o pico de memória depende só do tile.
+        
+        Args:
+            filtro: 'gaussian', 'bilateral', 'median' ou 'ssaa'
+            caminho_entrada: Arquivo .npy ou bruto de entrada
+            caminho_saida: Arquivo .npy ou bruto de saída
+            tamanho_tile: Lado do tile de saída, em pixels
+            shape: Forma (H, W, C) - obrigatória para arquivos brutos
+            dtype: Tipo dos pixels para arquivos brutos
+            **params: Parâmetros do filtro (ex.: kernel_size=7)
+            
+        Returns:
+            np.memmap com o resultado
+        """
+        return processar_arquivo_em_tiles(self, filtro, caminho_entrada, caminho_saida,
+                                          tamanho_tile, shape, dtype, **params)
+    
+    def mascara_atividade(self, img_gray, raio=4, limiar_inferior=50, limiar_superior=150):
+        """
+        Máscara das regiões de borda: bordas de Canny dilatadas por `raio`
+        
+        Args:
+            img_gray: Imagem em escala de cinza
+            raio: Dilatação das bordas, em pixels
+            limiar_inferior, limiar_superior: Limiares do Canny
+            
+        Returns:
+            Array bool HxW (True nas regiões a filtrar)
+        """
+        bordas = self.detectar_bordas(img_gray, limiar_inferior, limiar_superior)
+        elemento = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2 * raio + 1, 2 * raio + 1))
+        return cv2.dilate(bordas, elemento) > 0
+    
+    @perfilado()
+    def aplicar_adaptativo(self, img, filtro, mascara, tamanho_tile=64, **params):
+        """
+        Aplica um filtro aplicar_* só nas regiões ativas da máscara, agrupadas
+        em faixas de tiles com halo, e compõe com a imagem original. Nos
+        pixels ativos o resultado é o mesmo do filtro na imagem inteira; o
+        custo acompanha a fração de tiles ativos.
         
-        # Aplicar closing seguido de opening para suavizar
-        kernel = np.ones((3,3), np.uint8)
-        closed = cv2.morphologyEx(gray, cv2.MORPH_CLOSE, kernel)
-        opened = cv2.morphologyEx(closed, cv2.MORPH_OPEN, kernel)
+        Args:
+            img: Imagem de entrada
+            filtro: 'gaussian', 'bilateral', 'median' ou 'ssaa'
+            mascara: Array bool HxW (ex.: mascara_atividade)
+            tamanho_tile: Lado do tile usado para agrupar a máscara
+            **params: Parâmetros do filtro
+            
+        Returns:
+            Imagem com o filtro aplicado nas regiões ativas
+        """
+        return processar_regioes_ativas(img, self.filtro_sem_cache(filtro, **params), mascara,
+                                        halo_do_filtro(filtro, **params), tamanho_tile)
+    
+    @perfilado()
+    def aplicar_em_lote(self, imagens, filtro, workers=None, **params):
+        """
+        Aplica um filtro aplicar_* a um lote de imagens do mesmo tamanho com
+        uma chamada por bloco, em vez de uma por imagem (ver
+        processamento_lote.py); o resultado de cada imagem é o mesmo da
+        chamada individual
         
-        # Converter de volta para RGB
-        result = cv2.cvtColor(opened, cv2.COLOR_GRAY2RGB)
+        Args:
+            imagens: Array NxHxW[xC] ou lista de imagens do mesmo tamanho
+            filtro: 'gaussian', 'bilateral', 'median' ou 'ssaa'
+            workers: Threads (padrão: número de CPUs)
+            **params: Parâmetros do filtro
+            
+        Returns:
+            Array contíguo NxHxW[xC] com os resultados
+        """
+        return processar_lote_filtro(self, filtro, imagens, workers, **params)
+    
+    def filtro_sem_cache(self, filtro, **params):
+        """
+        Função imagem -> imagem com o método aplicar_* original, sem cache
+        nem perfil (usada por tile, região ou imagem de um lote)
         
-        return result
+        Args:
+            filtro: 'gaussian', 'bilateral', 'median' ou 'ssaa'
+            **params: Parâmetros do filtro
+            
+        Returns:
+            Função que recebe um array e devolve o array filtrado
+        """
+        if filtro not in FILTROS:
+            raise ValueError(f"Filtro desconhecido: {filtro}. Opções: {', '.join(FILTROS)}")
+        metodo = inspect.unwrap(getattr(type(self), FILTROS[filtro]))
+        return lambda img: metodo(self, img, **params)
     
     def comparar_tecnicas_antialiasing(self, img_rgb, nome_imagem):
         """
         Compara diferentes técnicas de anti-aliasing
         
         Args:
-            img_rgb: Imagem RGB de entrada
+            img_rgb: Imagem RGB de entrada (array ou ImagemCor)
             nome_imagem: Nome da imagem para salvar resultados
+            
+        Returns:
+            Dicionário técnica -> imagem RGB processada
         """
-        # Converter para BGR para OpenCV
-        img_bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
-        
-        # Aplicar diferentes técnicas
-        img_gaussian = self.aplicar_gaussian_blur(img_bgr)
-        img_bilateral = self.aplicar_bilateral_filter(img_bgr)
-        img_median = self.aplicar_median_blur(img_bgr)
-        img_ssaa = self.aplicar_supersampling(img_bgr, scale_factor=2)
-        
-        # Converter de volta para RGB para visualização
-        img_gaussian_rgb = cv2.cvtColor(img_gaussian, cv2.COLOR_BGR2RGB)
-        img_bilateral_rgb = cv2.cvtColor(img_bilateral, cv2.COLOR_BGR2RGB)
-        img_median_rgb = cv2.cvtColor(img_median, cv2.COLOR_BGR2RGB)
-        img_ssaa_rgb = cv2.cvtColor(img_ssaa, cv2.COLOR_BGR2RGB)
-        
-        # Criar visualização comparativa
-        fig, axes = plt.subplots(2, 3, figsize=(18, 12))
-        fig.suptitle(f'Comparação de Técnicas de Antiserrilhamento - {nome_imagem}', 
-                     fontsize=16, fontweight='bold')
-        
-        # Imagem original
-        axes[0, 0].imshow(img_rgb)
-        axes[0, 0].set_title('Original')
-        axes[0, 0].axis('off')
-        
-        # Gaussian Blur
-        axes[0, 1].imshow(img_gaussian_rgb)
-        axes[0, 1].set_title('Filtro Gaussiano\n(Suavização básica)')
-        axes[0, 1].axis('off')
-        
-        # Bilateral Filter
-        axes[0, 2].imshow(img_bilateral_rgb)
-        axes[0, 2].set_title('Filtro Bilateral\n(Preserva bordas)')
-        axes[0, 2].axis('off')
-        
-        # Median Blur
-        axes[1, 0].imshow(img_median_rgb)
-        axes[1, 0].set_title('Filtro de Mediana\n(Reduz ruído)')
-        axes[1, 0].axis('off')
-        
-        # Supersampling
-        axes[1, 1].imshow(img_ssaa_rgb)
-        axes[1, 1].set_title('Supersampling (SSAA)\n(Anti-aliasing clássico)')
-        axes[1, 1].axis('off')
-        
-        # Diferença entre original e SSAA
-        diff = cv2.absdiff(img_rgb, img_ssaa_rgb)
-        axes[1, 2].imshow(diff)
-        axes[1, 2].set_title('Diferença (Original vs SSAA)\n(Ampliada para visualização)')
-        axes[1, 2].axis('off')
-        
-        plt.tight_layout()
-        plt.savefig(f"{self.output_dir}/comparacao_antialiasing_{nome_imagem}.png", 
-                   dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"✓ Comparação salva: comparacao_antialiasing_{nome_imagem}.png")
-        
-        # Salvar imagens individuais processadas
-        cv2.imwrite(f"{self.output_dir}/{nome_imagem}_gaussian.png", img_gaussian)
-        cv2.imwrite(f"{self.output_dir}/{nome_imagem}_bilateral.png", img_bilateral)
-        cv2.imwrite(f"{self.output_dir}/{nome_imagem}_median.png", img_median)
-        cv2.imwrite(f"{self.output_dir}/{nome_imagem}_ssaa.png", img_ssaa)
+        img = ImagemCor.de(img_rgb, 'RGB')
+        img_rgb = img.rgb
+        
+        # Aplicar diferentes técnicas na ordem nativa dos canais (os filtros
+        # tratam os canais de forma simétrica, dispensando ida e volta BGR/RGB)
+        img_gaussian = img.mapear(self.aplicar_gaussian_blur)
+        img_median = img.mapear(self.aplicar_median_blur)
+        if self.adaptativo:
+            # Bilateral só nas regiões de borda
+            mascara = self.mascara_atividade(img.gray)
+            print(f"  Modo adaptativo: {100 * mascara.mean():.1f}% dos pixels em regiões de borda")
+            img_bilateral = img.mapear(self.aplicar_adaptativo, 'bilateral', mascara)
+        else:
+            img_bilateral = img.mapear(self.aplicar_bilateral_filter)
+        # O SSAA fundido é mais barato que a própria máscara: sempre na imagem inteira
+        img_ssaa = img.mapear(self.aplicar_supersampling, scale_factor=2)
+        # Pós-processamento (FXAA/SMAA): a luminância depende da ordem dos canais
+        img_fxaa = img.mapear(self.aplicar_fxaa, ordem=img.ordem)
+        img_smaa = img.mapear(self.aplicar_smaa, ordem=img.ordem)
+        
+        if self.gerar_figuras and not self._adiar_figuras:
+            # Visualização em RGB (conversão só ocorre se a ordem nativa for BGR)
+            self._plotar('comparacao', {
+                'original': img_rgb,
+                'gaussian': img_gaussian.rgb,
+                'bilateral': img_bilateral.rgb,
+                'median': img_median.rgb,
+                'ssaa': img_ssaa.rgb,
+                'fxaa': img_fxaa.rgb,
+                'smaa': img_smaa.rgb,
+                'diferenca_ssaa': cv2.absdiff(img_rgb, img_ssaa.rgb)
+            }, nome_imagem, "Comparação salva")
+        
+        if self.salvar_imagens:
+            # Salvar imagens individuais processadas (BGR só é gerado para gravar)
+            for sufixo, resultado in (('gaussian', img_gaussian), ('bilateral', img_bilateral),
+                                      ('median', img_median), ('ssaa', img_ssaa),
+                                      ('fxaa', img_fxaa), ('smaa', img_smaa)):
+                resultado.salvar(f"{self.output_dir}/{nome_imagem}_{sufixo}.png")
+                resultado.liberar('BGR')
         
         return {
-            'gaussian': img_gaussian_rgb,
-            'bilateral': img_bilateral_rgb,
-            'median': img_median_rgb,
-            'ssaa': img_ssaa_rgb
+            'gaussian': img_gaussian.rgb,
+            'bilateral': img_bilateral.rgb,
+            'median': img_median.rgb,
+            'ssaa': img_ssaa.rgb,
+            'fxaa': img_fxaa.rgb,
+            'smaa': img_smaa.rgb
         }
     
     def analisar_bordas(self, img_rgb, nome_imagem):
@@ -371,101 +560,77 @@ class AntiAliasingDemo:
         Analisa detecção de bordas para demonstrar efeito do anti-aliasing
         
         Args:
-            img_rgb: Imagem RGB
+            img_rgb: Imagem RGB (array ou ImagemCor)
             nome_imagem: Nome da imagem
+            
+        Returns:
+            Dicionário com 'original', 'bordas_original', 'suavizada' e
+            'bordas_suavizadas'
         """
-        img_gray = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2GRAY)
+        img = ImagemCor.de(img_rgb, 'RGB')
         
         # Aplicar Canny para detectar bordas
-        bordas_original = cv2.Canny(img_gray, 50, 150)
+        bordas_original = self.detectar_bordas(img.gray)
         
         # Aplicar anti-aliasing e depois detectar bordas
-        img_bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
-        img_suavizada = self.aplicar_gaussian_blur(img_bgr)
-        img_suavizada_gray = cv2.cvtColor(img_suavizada, cv2.COLOR_BGR2GRAY)
-        bordas_suavizadas = cv2.Canny(img_suavizada_gray, 50, 150)
-        
-        # Visualização
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-        fig.suptitle(f'Análise de Bordas - {nome_imagem}', fontsize=16, fontweight='bold')
-        
-        axes[0, 0].imshow(img_rgb)
-        axes[0, 0].set_title('Imagem Original')
-        axes[0, 0].axis('off')
-        
-        axes[0, 1].imshow(bordas_original, cmap='gray')
-        axes[0, 1].set_title('Bordas (Original)')
-        axes[0, 1].axis('off')
-        
-        axes[1, 0].imshow(cv2.cvtColor(img_suavizada, cv2.COLOR_BGR2RGB))
-        axes[1, 0].set_title('Imagem com Anti-aliasing')
-        axes[1, 0].axis('off')
-        
-        axes[1, 1].imshow(bordas_suavizadas, cmap='gray')
-        axes[1, 1].set_title('Bordas (Anti-aliasing)\n(Bordas mais suaves)')
-        axes[1, 1].axis('off')
+        img_suavizada = img.mapear(self.aplicar_gaussian_blur)
+        bordas_suavizadas = self.detectar_bordas(img_suavizada.gray)
+        
+        dados = {
+            'original': img.rgb,
+            'bordas_original': bordas_original,
+            'suavizada': img_suavizada.rgb,
+            'bordas_suavizadas': bordas_suavizadas
+        }
         
-        plt.tight_layout()
-        plt.savefig(f"{self.output_dir}/analise_bordas_{nome_imagem}.png", dpi=300, bbox_inches='tight')
-        plt.close()
+        self._plotar('bordas', dados, nome_imagem, "Análise de bordas salva")
         
-        print(f"✓ Análise de bordas salva: analise_bordas_{nome_imagem}.png")
+        return dados
     
     def demonstrar_efeito_escala(self, img_rgb, nome_imagem):
         """
         Demonstra o efeito do anti-aliasing em diferentes escalas
         
         Args:
-            img_rgb: Imagem RGB
+            img_rgb: Imagem RGB (array ou ImagemCor)
             nome_imagem: Nome da imagem
+            
+        Returns:
+            Dicionário com 'original', 'sem_aa' e 'com_aa' (RGB)
         """
-        img_bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
+        img = ImagemCor.de(img_rgb, 'RGB')
+        img_rgb = img.rgb
         
         # Redimensionar sem e com anti-aliasing
         nova_largura = img_rgb.shape[1] // 2
         nova_altura = img_rgb.shape[0] // 2
+        tamanho_original = (img_rgb.shape[1], img_rgb.shape[0])
         
         # Sem anti-aliasing (INTER_NEAREST - preserva pixels originais)
-        img_sem_aa = cv2.resize(img_bgr, (nova_largura, nova_altura), 
+        # e voltar ao tamanho original para comparação
+        img_sem_aa = img.mapear(cv2.resize, (nova_largura, nova_altura),
                                 interpolation=cv2.INTER_NEAREST)
+        img_sem_aa_rgb = img_sem_aa.mapear(cv2.resize, tamanho_original,
+                                           interpolation=cv2.INTER_NEAREST).rgb
         
         # Com anti-aliasing (INTER_AREA - melhor para redução)
-        img_com_aa = cv2.resize(img_bgr, (nova_largura, nova_altura), 
+        img_com_aa = img.mapear(cv2.resize, (nova_largura, nova_altura),
                                 interpolation=cv2.INTER_AREA)
+        img_com_aa_rgb = img_com_aa.mapear(cv2.resize, tamanho_original,
+                                           interpolation=cv2.INTER_CUBIC).rgb
         
-        # Voltar ao tamanho original para comparação
-        img_sem_aa_up = cv2.resize(img_sem_aa, (img_rgb.shape[1], img_rgb.shape[0]), 
-                                   interpolation=cv2.INTER_NEAREST)
-        img_com_aa_up = cv2.resize(img_com_aa, (img_rgb.shape[1], img_rgb.shape[0]), 
-                                   interpolation=cv2.INTER_CUBIC)
-        
-        # Converter para RGB
-        img_sem_aa_rgb = cv2.cvtColor(img_sem_aa_up, cv2.COLOR_BGR2RGB)
-        img_com_aa_rgb = cv2.cvtColor(img_com_aa_up, cv2.COLOR_BGR2RGB)
-        
-        # Visualização
-        fig, axes = plt.subplots(1, 3, figsize=(18, 6))
-        fig.suptitle(f'Efeito de Anti-aliasing em Redimensionamento - {nome_imagem}', 
-                     fontsize=16, fontweight='bold')
-        
-        axes[0].imshow(img_rgb)
-        axes[0].set_title('Original')
-        axes[0].axis('off')
-        
-        axes[1].imshow(img_sem_aa_rgb)
-        axes[1].set_title('Sem Anti-aliasing\n(Serrilhamento visível)')
-        axes[1].axis('off')
-        
-        axes[2].imshow(img_com_aa_rgb)
-        axes[2].set_title('Com Anti-aliasing\n(Bordas suavizadas)')
-        axes[2].axis('off')
+        dados = {
+            'original': img_rgb,
+            'sem_aa': img_sem_aa_rgb,
+            'com_aa': img_com_aa_rgb
+        }
         
-        plt.tight_layout()
-        plt.savefig(f"{self.output_dir}/efeito_escala_{nome_imagem}.png", dpi=300, bbox_inches='tight')
-        plt.close()
+        self._plotar('escala', dados, nome_imagem, "Demonstração de escala salva")
         
-        print(f"✓ Demonstração de escala salva: efeito_escala_{nome_imagem}.png")
+        return dados
     
+    @perfilado()
+    @com_cache_metricas('metricas_ssim')
     def calcular_metricas_qualidade(self, img_original, img_processada):
         """
         Calcula métricas de qualidade entre imagem original e processada
@@ -475,91 +640,496 @@ class AntiAliasingDemo:
             img_processada: Imagem após anti-aliasing
             
         Returns:
-            Dicionário com métricas
+            Dicionário com MSE, PSNR, MAE e SSIM (calculados em uma única
+            passada por blocos, ver metricas.calcular_metricas)
         """
-        # MSE (Mean Squared Error)
-        mse = np.mean((img_original.astype(float) - img_processada.astype(float)) ** 2)
-        
-        # PSNR (Peak Signal-to-Noise Ratio)
-        if mse == 0:
-            psnr = float('inf')
-        else:
-            max_pixel = 255.0
-            psnr = 20 * np.log10(max_pixel / np.sqrt(mse))
-        
-        # Diferença absoluta média
-        mae = np.mean(np.abs(img_original.astype(float) - img_processada.astype(float)))
+        return calcular_metricas(img_original, img_processada)
+    
+    def renderizar_figuras(self, etapas, nome_imagem, workers=None):
+        """
+        Gera sob demanda as figuras de um resultado calculado sem figuras,
+        em paralelo (uma figura por processo)
         
-        return {
-            'MSE': mse,
-            'PSNR': psnr,
-            'MAE': mae
-        }
+        Args:
+            etapas: Dicionário 'etapas' retornado por executar_pipeline
+            nome_imagem: Nome da imagem para salvar
+            workers: Número de processos (padrão: workers_figuras ou núcleos)
+            
+        Returns:
+            Lista com os caminhos das figuras geradas
+        """
+        tarefas = [(etapa, etapas[etapa], nome_imagem, self.output_dir,
+                    *self._configuracao_figura(etapa))
+                   for etapa in FIGURAS if etapa in etapas]
+        workers = workers or self.workers_figuras or os.cpu_count() or 1
+        executor = self._pool_de_figuras(workers) if workers > 1 and len(tarefas) > 1 else None
+        caminhos = renderizar_em_paralelo(tarefas, workers, executor)
+        for caminho in caminhos:
+            print(f"✓ Figura salva: {os.path.basename(caminho)}")
+        return caminhos
     
-    def processar_imagem_completo(self, caminho_imagem, nome_imagem):
+    def executar_pipeline(self, caminho_imagem, nome_imagem, img_bgr=None):
         """
-        Executa o pipeline completo de análise e processamento
+        Executa o pipeline completo e retorna os resultados estruturados
         
         Args:
             caminho_imagem: Caminho da imagem
             nome_imagem: Nome descritivo da imagem
+            img_bgr: Imagem BGR já decodificada (opcional, modo streaming).
+                     O buffer é reaproveitado para a versão RGB.
+            
+        Returns:
+            Dicionário com 'caracteristicas', 'metricas' e 'etapas' (arrays
+            de cada etapa, aceitos por renderizar_figuras)
+        """
+        # Com workers_figuras, as figuras são adiadas e geradas juntas no fim
+        adiar = self.gerar_figuras and (self.workers_figuras or 1) > 1
+        self._adiar_figuras = adiar
+        with medir_etapa(self.perfilador, nome_imagem, imagem=caminho_imagem):
+            try:
+                resultado = self._calcular_pipeline(caminho_imagem, nome_imagem, img_bgr)
+            finally:
+                self._adiar_figuras = False
+            
+            if adiar:
+                print(f"→ Gerando figuras em paralelo ({self.workers_figuras} processos)...")
+                with medir_etapa(self.perfilador, '9. figuras'):
+                    self.renderizar_figuras(resultado['etapas'], nome_imagem)
+        
+        if self.perfilador is not None and self.perfilador.diretorio:
+            self.perfilador.imprimir_resumo(profundidade=1)
+            base = self.perfilador.exportar(f"perfil_{nome_imagem}")
+            print(f"✓ Perfil salvo: {base}.json, .trace.json, .folded")
+            self.perfilador.limpar()
+        return resultado
+    
+    def _calcular_pipeline(self, caminho_imagem, nome_imagem, img_bgr=None):
+        """
+        Etapas 1 a 8 do pipeline (ver executar_pipeline)
         """
         print(f"\n{'#'*60}")
         print(f"PROCESSANDO: {nome_imagem.upper()}")
         print(f"{'#'*60}")
         
-        # 1. Carregar imagem
-        img_bgr, img_rgb = self.carregar_imagem(caminho_imagem)
+        # 1. Carregar imagem (conversão para RGB no próprio buffer, para não
+        # manter duas cópias da imagem inteira durante todo o pipeline)
+        with medir_etapa(self.perfilador, '1. carregar') as etapa:
+            if img_bgr is None:
+                img = ImagemCor.ler(caminho_imagem)
+            else:
+                img = ImagemCor(img_bgr, 'BGR')
+            del img_bgr
+            img.converter_para('RGB')
+            img_rgb = etapa.saida(img.rgb)
         print(f"✓ Imagem carregada com sucesso")
         
         # 2. Analisar características
-        caracteristicas = self.analisar_caracteristicas(img_rgb, nome_imagem)
+        with medir_etapa(self.perfilador, '2. caracteristicas'):
+            caracteristicas = self.analisar_caracteristicas(img_rgb, nome_imagem)
         
         # 3. Decompor canais RGB
         print(f"\n→ Decompondo canais RGB...")
-        r, g, b = self.decompor_canais_rgb(img_rgb, nome_imagem)
-        print(f"✓ Decomposição RGB salva: decomposicao_rgb_{nome_imagem}.png")
+        with medir_etapa(self.perfilador, '3. decomposicao') as etapa:
+            r, g, b = etapa.saida(self.decompor_canais_rgb(img_rgb, nome_imagem))
         
         # 4. Gerar histogramas
         print(f"\n→ Gerando histogramas...")
-        self.gerar_histogramas(img_rgb, nome_imagem)
+        with medir_etapa(self.perfilador, '4. histogramas') as etapa:
+            histogramas = etapa.saida(self.gerar_histogramas(img_rgb, nome_imagem))
         
         # 5. Comparar técnicas de anti-aliasing
         print(f"\n→ Aplicando técnicas de antiserrilhamento...")
-        resultados = self.comparar_tecnicas_antialiasing(img_rgb, nome_imagem)
+        with medir_etapa(self.perfilador, '5. comparacao') as etapa:
+            resultados = etapa.saida(self.comparar_tecnicas_antialiasing(img, nome_imagem))
         
         # 6. Analisar bordas
         print(f"\n→ Analisando detecção de bordas...")
-        self.analisar_bordas(img_rgb, nome_imagem)
+        with medir_etapa(self.perfilador, '6. bordas') as etapa:
+            bordas = etapa.saida(self.analisar_bordas(img, nome_imagem))
         
         # 7. Demonstrar efeito em escala
         print(f"\n→ Demonstrando efeito em diferentes escalas...")
-        self.demonstrar_efeito_escala(img_rgb, nome_imagem)
+        with medir_etapa(self.perfilador, '7. escala') as etapa:
+            escala = etapa.saida(self.demonstrar_efeito_escala(img, nome_imagem))
         
         # 8. Calcular métricas de qualidade
         print(f"\n→ Calculando métricas de qualidade...")
-        img_bgr_ssaa = cv2.cvtColor(resultados['ssaa'], cv2.COLOR_RGB2BGR)
-        metricas = self.calcular_metricas_qualidade(img_bgr, img_bgr_ssaa)
+        # As métricas independem da ordem dos canais: comparar direto em RGB
+        with medir_etapa(self.perfilador, '8. metricas'):
+            metricas = self.calcular_metricas_qualidade(img_rgb, resultados['ssaa'])
         
         print(f"\nMÉTRICAS DE QUALIDADE (Original vs SSAA):")
         print(f"  MSE (Mean Squared Error): {metricas['MSE']:.2f}")
         print(f"  PSNR (Peak Signal-to-Noise Ratio): {metricas['PSNR']:.2f} dB")
         print(f"  MAE (Mean Absolute Error): {metricas['MAE']:.2f}")
+        print(f"  SSIM (Structural Similarity): {metricas['SSIM']:.4f}")
         
         print(f"\n{'='*60}")
         print(f"✓ Processamento de '{nome_imagem}' concluído com sucesso!")
         print(f"{'='*60}\n")
         
-        return caracteristicas, metricas
+        comparacao = dict(resultados, original=img_rgb,
+                          diferenca_ssaa=cv2.absdiff(img_rgb, resultados['ssaa']))
+        return {
+            'caracteristicas': caracteristicas,
+            'metricas': metricas,
+            'etapas': {
+                'decomposicao': {'original': img_rgb, 'r': r, 'g': g, 'b': b},
+                'histogramas': {'contagens': histogramas},
+                'comparacao': comparacao,
+                'bordas': bordas,
+                'escala': escala,
+            }
+        }
+    
+    def processar_imagem_completo(self, caminho_imagem, nome_imagem, img_bgr=None):
+        """
+        Executa o pipeline completo de análise e processamento
+        
+        Args:
+            caminho_imagem: Caminho da imagem
+            nome_imagem: Nome descritivo da imagem
+            img_bgr: Imagem BGR já decodificada (opcional, modo streaming).
+                     O buffer é reaproveitado para a versão RGB.
+            
+        Returns:
+            Tupla (caracteristicas, metricas)
+        """
+        resultado = self.executar_pipeline(caminho_imagem, nome_imagem, img_bgr)
+        return resultado['caracteristicas'], resultado['metricas']
+
+
+def _varrer_diretorio(raiz):
+    """
+    Percorre uma árvore de diretórios de forma preguiçosa (os.scandir),
+    mantendo em memória apenas as entradas do diretório corrente
+    
+    Args:
+        raiz: Diretório raiz
+        
+    Yields:
+        Caminhos (str) de arquivos de imagem, em ordem alfabética por diretório
+    """
+    pendentes = [raiz]
+    while pendentes:
+        diretorio = pendentes.pop()
+        try:
+            with os.scandir(diretorio) as it:
+                entradas = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            print(f"⚠ AVISO: Não foi possível ler o diretório {diretorio}: {e}")
+            continue
+        subdiretorios = []
+        for entrada in entradas:
+            if entrada.is_dir(follow_symlinks=False):
+                subdiretorios.append(entrada.path)
+            elif os.path.splitext(entrada.name)[1].lower() in EXTENSOES_IMAGEM:
+                yield entrada.path
+        # Pilha LIFO: inverter para visitar subdiretórios em ordem alfabética
+        pendentes.extend(reversed(subdiretorios))
+
+
+def iterar_imagens(entrada):
+    """
+    Resolve um diretório ou padrão glob nas imagens a processar, sob demanda
+    
+    Args:
+        entrada: Diretório (varrido recursivamente) ou padrão glob
+        
+    Yields:
+        Tuplas (caminho, nome) com nomes únicos
+    """
+    if os.path.isdir(entrada):
+        caminhos = _varrer_diretorio(entrada)
+        def nomear(caminho):
+            relativo = os.path.splitext(os.path.relpath(caminho, entrada))[0]
+            return relativo.replace(os.sep, '_')
+    else:
+        caminhos = (p for p in glob.iglob(entrada, recursive=True)
+                    if os.path.splitext(p)[1].lower() in EXTENSOES_IMAGEM)
+        def nomear(caminho):
+            return Path(caminho).stem
+    
+    # Garantir nomes únicos (arquivos de saída são nomeados por imagem)
+    # vistos: nome já usado -> último sufixo tentado a partir dele
+    vistos = {}
+    for caminho in caminhos:
+        base = nomear(caminho).lower()
+        nome = base
+        while nome in vistos:
+            vistos[base] += 1
+            nome = f"{base}_{vistos[base]}"
+        vistos[nome] = 0
+        yield caminho, nome
+
+
+def carregar_imagens_streaming(imagens, prefetch=2):
+    """
+    Decodifica imagens em uma thread auxiliar com fila de pré-carga limitada
+    
+    No máximo `prefetch` imagens decodificadas ficam aguardando na fila, de
+    modo que a memória de pico não depende do número de arquivos.
+    
+    Args:
+        imagens: Iterável de tuplas (caminho, nome)
+        prefetch: Tamanho máximo da fila de imagens já decodificadas
+        
+    Yields:
+        Tuplas (caminho, nome, img_bgr) - img_bgr é None se a leitura falhou
+    """
+    fila = queue.Queue(maxsize=max(1, prefetch))
+    fim = object()
+    parar = threading.Event()
+    
+    def produtor():
+        try:
+            for caminho, nome in imagens:
+                if parar.is_set():
+                    return
+                fila.put((caminho, nome, cv2.imread(caminho)))
+        finally:
+            fila.put(fim)
+    
+    thread = threading.Thread(target=produtor, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = fila.get()
+            if item is fim:
+                break
+            yield item
+            # Liberar a referência antes de admitir a próxima imagem
+            del item
+    finally:
+        parar.set()
+        # Esvaziar a fila para desbloquear o produtor caso tenha parado cedo
+        while thread.is_alive():
+            try:
+                fila.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+def processar_streaming(entrada, output_dir="resultados_antialiasing", prefetch=2,
+                        gerar_figuras=True, **opcoes_demo):
+    """
+    Processa sequencialmente uma árvore de imagens arbitrariamente grande com
+    memória limitada: varredura preguiçosa, pré-carga limitada e liberação dos
+    buffers de cada imagem antes da próxima
+    
+    Args:
+        entrada: Diretório ou padrão glob
+        output_dir: Diretório para salvar os resultados
+        prefetch: Número de imagens decodificadas antecipadamente
+        gerar_figuras: Se False, executa no modo só cálculo (sem matplotlib)
+        **opcoes_demo: Demais opções de AntiAliasingDemo (dpi, formato...)
+        
+    Returns:
+        Tupla (resultados_gerais, erros) - erros mapeia nome -> mensagem
+    """
+    resultados_gerais = {}
+    erros = {}
+    
+    with AntiAliasingDemo(output_dir=output_dir, gerar_figuras=gerar_figuras, **opcoes_demo) as demo:
+        for caminho, nome, img_bgr in carregar_imagens_streaming(iterar_imagens(entrada), prefetch):
+            try:
+                if img_bgr is None:
+                    raise ValueError(f"Não foi possível carregar a imagem: {caminho}")
+                caracteristicas, metricas = demo.processar_imagem_completo(caminho, nome, img_bgr=img_bgr)
+                resultados_gerais[nome] = {
+                    'caracteristicas': caracteristicas,
+                    'metricas': metricas
+                }
+            except Exception as e:
+                erros[nome] = f"{type(e).__name__}: {e}"
+                print(f"\n❌ ERRO ao processar {nome}: {erros[nome]}\n")
+            finally:
+                img_bgr = None
+    
+    return resultados_gerais, erros
+
+
+# Instância do demo mantida por processo do pool (criada no inicializador)
+_demo_worker = None
+
+
+def _inicializar_worker(output_dir, gerar_figuras=True, opcoes_demo=None):
+    """
+    Inicializa um processo do pool: backend sem janela e OpenCV com uma thread,
+    para que o paralelismo venha dos processos e não haja disputa de núcleos
+    """
+    global _demo_worker
+    # Variável de ambiente em vez de importar o matplotlib aqui (import tardio)
+    os.environ['MPLBACKEND'] = 'Agg'
+    cv2.setNumThreads(1)
+    _demo_worker = AntiAliasingDemo(output_dir=output_dir, gerar_figuras=gerar_figuras,
+                                    **(opcoes_demo or {}))
+
+
+def _processar_no_worker(caminho, nome):
+    """
+    Processa uma imagem dentro do worker, isolando qualquer erro
+    
+    Returns:
+        Tupla (nome, dados, erro) - dados é None quando houve erro
+    """
+    try:
+        caracteristicas, metricas = _demo_worker.processar_imagem_completo(caminho, nome)
+        return nome, {'caracteristicas': caracteristicas, 'metricas': metricas}, None
+    except Exception as e:
+        return nome, None, f"{type(e).__name__}: {e}"
+
+
+def processar_lote(entrada, output_dir="resultados_antialiasing", workers=None,
+                   gerar_figuras=True, **opcoes_demo):
+    """
+    Processa em paralelo todas as imagens de um diretório ou padrão glob,
+    distribuindo processar_imagem_completo em um pool de processos
+    
+    Args:
+        entrada: Diretório ou padrão glob (ex.: "scans/**/*.jpg")
+        output_dir: Diretório para salvar os resultados
+        workers: Número de processos (padrão: número de núcleos)
+        gerar_figuras: Se False, executa no modo só cálculo (sem matplotlib)
+        **opcoes_demo: Demais opções de AntiAliasingDemo (dpi, formato...)
+        
+    Returns:
+        Tupla (resultados_gerais, erros) - erros mapeia nome -> mensagem
+    """
+    Path(output_dir).mkdir(exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    
+    resultados_gerais = {}
+    erros = {}
+    
+    def coletar(concluidos):
+        for futuro in concluidos:
+            try:
+                nome, dados, erro = futuro.result()
+            except Exception as e:
+                # Falha do próprio processo (ex.: worker encerrado abruptamente)
+                nome, dados, erro = pendentes[futuro], None, f"{type(e).__name__}: {e}"
+            del pendentes[futuro]
+            if erro is None:
+                resultados_gerais[nome] = dados
+            else:
+                erros[nome] = erro
+                print(f"\n❌ ERRO ao processar {nome}: {erro}\n")
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker,
+                             initargs=(output_dir, gerar_figuras, opcoes_demo)) as executor:
+        # Submissão limitada: a varredura do diretório é consumida sob demanda
+        pendentes = {}
+        for caminho, nome in iterar_imagens(entrada):
+            if len(pendentes) >= 2 * workers:
+                concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+                coletar(concluidos)
+            pendentes[executor.submit(_processar_no_worker, caminho, nome)] = nome
+        coletar(list(as_completed(pendentes)))
+    
+    # Ordem estável no resumo, independente da ordem de conclusão
+    resultados_gerais = dict(sorted(resultados_gerais.items()))
+    return resultados_gerais, erros
+
+
+def imprimir_resumo(resultados_gerais, output_dir):
+    """
+    Imprime o resumo final agregado de todas as imagens processadas
+    
+    Args:
+        resultados_gerais: Dicionário nome -> {'caracteristicas', 'metricas'}
+        output_dir: Diretório onde os resultados foram salvos
+    """
+    if resultados_gerais:
+        print("\n" + "="*60)
+        print("RESUMO FINAL - TODAS AS IMAGENS")
+        print("="*60)
+        
+        for nome, dados in resultados_gerais.items():
+            print(f"\n{nome.upper()}:")
+            print(f"  Dimensões: {dados['caracteristicas']['tamanho']}")
+            print(f"  Total de pixels: {dados['caracteristicas']['pixels_totais']:,}")
+            print(f"  PSNR (Original vs SSAA): {dados['metricas']['PSNR']:.2f} dB")
+            print(f"  SSIM (Original vs SSAA): {dados['metricas']['SSIM']:.4f}")
+        
+        print(f"\n{'='*60}")
+        print(f"✓ Todos os resultados foram salvos em: {output_dir}/")
+        print(f"{'='*60}\n")
+        
+        print("ARQUIVOS GERADOS PARA CADA IMAGEM:")
+        print("  - decomposicao_rgb_[nome].png (Canais R, G, B separados)")
+        print("  - histogramas_[nome].png (Histogramas de cada canal)")
+        print("  - comparacao_antialiasing_[nome].png (Comparação de técnicas)")
+        print("  - analise_bordas_[nome].png (Detecção de bordas)")
+        print("  - efeito_escala_[nome].png (Efeito em redimensionamento)")
+        print("  - [nome]_gaussian.png, _bilateral.png, _median.png, _ssaa.png, _fxaa.png, _smaa.png")
+        print("\n✓ Demonstração concluída com sucesso!")
+    else:
+        print("\n❌ Nenhuma imagem foi processada com sucesso.")
+        print("   Verifique os caminhos das imagens e tente novamente.\n")
 
 
 def main():
     """
     Função principal para executar a demonstração
+    
+    Sem argumentos processa as três imagens de exemplo; com um diretório ou
+    padrão glob processa o lote em paralelo (ex.: python antiserrilhamento.py
+    "scans/**/*.jpg" --workers 8)
     """
+    parser = argparse.ArgumentParser(description="Demonstração de antiserrilhamento")
+    parser.add_argument("entrada", nargs="?",
+                        help="Diretório ou padrão glob de imagens (modo em lote)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Número de processos no modo em lote (padrão: núcleos)")
+    parser.add_argument("--saida", default="resultados_antialiasing",
+                        help="Diretório de saída")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Processa sequencialmente com memória limitada")
+    parser.add_argument("--prefetch", type=int, default=2,
+                        help="Imagens pré-carregadas no modo streaming")
+    parser.add_argument("--sem-figuras", action="store_true",
+                        help="Modo só cálculo: não gera figuras do matplotlib")
+    parser.add_argument("--dpi", type=int, default=300, help="Resolução das figuras")
+    parser.add_argument("--formato", default="png", help="Formato das figuras (png, jpg, svg...)")
+    parser.add_argument("--workers-figuras", type=int, default=None,
+                        help="Gera as figuras de cada imagem em paralelo neste número de processos")
+    parser.add_argument("--cache", default=None,
+                        help="Diretório do cache de resultados (reexecuções só recalculam o que mudou)")
+    parser.add_argument("--cache-mb", type=float, default=1024,
+                        help="Tamanho máximo do cache em MB (remoção LRU)")
+    parser.add_argument("--perfil", default=None,
+                        help="Diretório para o perfil de cada imagem (tempo, CPU e memória por etapa)")
+    parser.add_argument("--perfil-sem-memoria", action="store_true",
+                        help="Não medir memória no perfil (tracemalloc deixa as figuras mais lentas)")
+    parser.add_argument("--adaptativo", action="store_true",
+                        help="Aplica o bilateral só nas regiões de borda (Canny dilatado)")
+    args = parser.parse_args()
+    gerar_figuras = not args.sem_figuras
+    opcoes_demo = {'dpi': args.dpi, 'formato': args.formato}
+    if args.cache:
+        opcoes_demo['cache'] = CacheResultados(args.cache, args.cache_mb)
+    if args.perfil:
+        opcoes_demo['perfilador'] = Perfilador(args.perfil, memoria=not args.perfil_sem_memoria)
+    if args.adaptativo:
+        opcoes_demo['adaptativo'] = True
+    
+    if args.entrada:
+        if args.streaming:
+            resultados_gerais, erros = processar_streaming(args.entrada, args.saida, args.prefetch,
+                                                           gerar_figuras, workers_figuras=args.workers_figuras,
+                                                           **opcoes_demo)
+        else:
+            resultados_gerais, erros = processar_lote(args.entrada, args.saida, args.workers,
+                                                      gerar_figuras, **opcoes_demo)
+        if erros:
+            print(f"\n⚠ {len(erros)} imagem(ns) com erro: {', '.join(sorted(erros))}")
+        imprimir_resumo(resultados_gerais, args.saida)
+        return
     
     # Inicializar demonstração
-    demo = AntiAliasingDemo(output_dir="resultados_antialiasing")
+    demo = AntiAliasingDemo(output_dir=args.saida, gerar_figuras=gerar_figuras,
+                            workers_figuras=args.workers_figuras, **opcoes_demo)
     
     # Lista de imagens para processar
     # IMPORTANTE: Substitua pelos caminhos corretos das suas imagens
@@ -592,47 +1162,23 @@ def main():
         print("\nOu atualize os caminhos das imagens no código (linha 464-468)\n")
         return
     
-    # Processar cada imagem encontrada
+    # Processar cada imagem encontrada (o pool das figuras é compartilhado)
     resultados_gerais = {}
-    for caminho, nome in imagens_encontradas:
-        try:
-            caracteristicas, metricas = demo.processar_imagem_completo(caminho, nome)
-            resultados_gerais[nome] = {
-                'caracteristicas': caracteristicas,
-                'metricas': metricas
-            }
-        except Exception as e:
-            print(f"\n❌ ERRO ao processar {nome}: {str(e)}\n")
-            continue
+    with demo:
+        for caminho, nome in imagens_encontradas:
+            try:
+                caracteristicas, metricas = demo.processar_imagem_completo(caminho, nome)
+                resultados_gerais[nome] = {
+                    'caracteristicas': caracteristicas,
+                    'metricas': metricas
+                }
+            except Exception as e:
+                print(f"\n❌ ERRO ao processar {nome}: {str(e)}\n")
+                continue
     
     # Resumo final
-    if resultados_gerais:
-        print("\n" + "="*60)
-        print("RESUMO FINAL - TODAS AS IMAGENS")
-        print("="*60)
-        
-        for nome, dados in resultados_gerais.items():
-            print(f"\n{nome.upper()}:")
-            print(f"  Dimensões: {dados['caracteristicas']['tamanho']}")
-            print(f"  Total de pixels: {dados['caracteristicas']['pixels_totais']:,}")
-            print(f"  PSNR (Original vs SSAA): {dados['metricas']['PSNR']:.2f} dB")
-        
-        print(f"\n{'='*60}")
-        print(f"✓ Todos os resultados foram salvos em: resultados_antialiasing/")
-        print(f"{'='*60}\n")
-        
-        print("ARQUIVOS GERADOS PARA CADA IMAGEM:")
-        print("  - decomposicao_rgb_[nome].png (Canais R, G, B separados)")
-        print("  - histogramas_[nome].png (Histogramas de cada canal)")
-        print("  - comparacao_antialiasing_[nome].png (Comparação de técnicas)")
-        print("  - analise_bordas_[nome].png (Detecção de bordas)")
-        print("  - efeito_escala_[nome].png (Efeito em redimensionamento)")
-        print("  - [nome]_gaussian.png, _bilateral.png, _median.png, _ssaa.png")
-        print("\n✓ Demonstração concluída com sucesso!")
-    else:
-        print("\n❌ Nenhuma imagem foi processada com sucesso.")
-        print("   Verifique os caminhos das imagens e tente novamente.\n")
+    imprimir_resumo(resultados_gerais, args.saida)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: anti-aliasing adaptativo (só nas regiões de borda) x imagem inteira
+
+Gera digitalizações sintéticas de documento (texto preto sobre fundo
+branco) com densidade de texto crescente e, para cada uma, compara o
+bilateral e o SSAA na imagem inteira com aplicar_adaptativo, que filtra
+apenas os tiles com bordas de Canny dilatadas. Mostra a fração de pixels
+ativos, os tempos (a máscara incluída) e a diferença para o resultado na
+imagem inteira; fora da máscara o adaptativo mantém o original, e dentro
+dela os valores são idênticos. O custo acompanha a área dos tiles ativos,
+não a dos pixels ativos: num documento com texto em toda a página quase
+todos os tiles têm borda e não há ganho. O SSAA fundido custa menos que a
+própria máscara e aparece só para comparação.
+
+Uso (a partir de trabalhoPDI/):
+    python benchmarks/bench_adaptativo.py [--imagem img/DOCUMENTO.jpg]
+        [--linhas 0 4 16 48] [--tamanho-tile 64]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antiserrilhamento import AntiAliasingDemo  # noqa: E402
+from metricas import calcular_metricas  # noqa: E402
+from processamento_tiles import regioes_ativas  # noqa: E402
+
+
+def documento_sintetico(largura, altura, linhas, rng):
+    """Página branca com `linhas` linhas de texto, espalhadas pela página"""
+    pagina = np.full((altura, largura, 3), 250, dtype=np.uint8)
+    if linhas == 0:
+        return pagina
+    alfabeto = np.array(list("abcdefghijklmnopqrstuvwxyz     "))
+    posicoes = np.sort(rng.choice(np.arange(40, altura - 10, 24), size=linhas, replace=False))
+    for y in posicoes:
+        texto = "".join(rng.choice(alfabeto, 70))
+        cv2.putText(pagina, texto, (40, int(y)), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
+                    (20, 20, 20), 1, cv2.LINE_8)
+    return pagina
+
+
+def cronometrar(funcao, repeticoes):
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--imagem", default="img/DOCUMENTO.jpg")
+    parser.add_argument("--largura", type=int, default=1240)
+    parser.add_argument("--altura", type=int, default=1754)
+    parser.add_argument("--linhas", type=int, nargs="+", default=[0, 4, 16, 48])
+    parser.add_argument("--tamanho-tile", type=int, default=64)
+    parser.add_argument("--repeticoes", type=int, default=2)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    entradas = {f"{n} linhas": documento_sintetico(args.largura, args.altura, n, rng)
+                for n in args.linhas}
+    img = cv2.imread(args.imagem)
+    if img is not None:
+        entradas[Path(args.imagem).name] = img
+
+    demo = AntiAliasingDemo(output_dir=tempfile.gettempdir(), gerar_figuras=False,
+                            salvar_imagens=False)
+    filtros = {
+        'bilateral': (demo.aplicar_bilateral_filter, {}),
+        'ssaa': (demo.aplicar_supersampling, {'scale_factor': 2}),
+    }
+
+    print(f"{'entrada':<16} {'filtro':<10} {'Ativos (%)':>10} {'Tiles (%)':>9} {'inteira (ms)':>13} "
+          f"{'adaptativo (ms)':>16} {'Ganho':>7} {'Dif. máx':>9} {'PSNR (dB)':>10}")
+    for nome, entrada in entradas.items():
+        cinza = cv2.cvtColor(entrada, cv2.COLOR_BGR2GRAY)
+        for filtro, (metodo, params) in filtros.items():
+            t_inteira, inteira = cronometrar(lambda: metodo(entrada, **params), args.repeticoes)
+
+            def adaptativo():
+                mascara = demo.mascara_atividade(cinza)
+                return mascara, demo.aplicar_adaptativo(entrada, filtro, mascara,
+                                                        args.tamanho_tile, **params)
+
+            t_adaptativo, (mascara, resultado) = cronometrar(adaptativo, args.repeticoes)
+            dentro = mascara[:, :, None].repeat(entrada.shape[2], axis=2)
+            diferenca = int(cv2.absdiff(inteira, resultado)[dentro].max(initial=0))
+            psnr = calcular_metricas(inteira, resultado, ssim=False)['PSNR']
+            area_tiles = sum((y1 - y0) * (x1 - x0) for y0, y1, x0, x1
+                             in regioes_ativas(mascara, args.tamanho_tile))
+            print(f"{nome:<16} {filtro:<10} {100 * mascara.mean():>10.1f} "
+                  f"{100 * area_tiles / mascara.size:>9.1f} "
+                  f"{t_inteira * 1000:>13.1f} {t_adaptativo * 1000:>16.1f} "
+                  f"{t_inteira / t_adaptativo:>6.1f}x {diferenca:>9} {psnr:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
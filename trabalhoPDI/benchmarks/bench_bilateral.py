@@ -0,0 +1,72 @@
+"""
+Benchmark: cv2.bilateralFilter x aproximação por grade bilateral
+
+Para cada diâmetro d (com sigma_space proporcional) e cada valor de
+precisão da grade, mede o tempo dos dois modos de aplicar_bilateral_filter
+e a fidelidade da grade em relação ao OpenCV (PSNR e SSIM).
+
+Uso (a partir de trabalhoPDI/):
+    python benchmarks/bench_bilateral.py [--imagem img/OBJETO.jpg]
+        [--diametros 5 9 15 25 51] [--precisoes 0.5 1 2]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antiserrilhamento import AntiAliasingDemo  # noqa: E402
+from metricas import calcular_metricas  # noqa: E402
+
+
+def cronometrar(funcao, repeticoes):
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--imagem", default="img/OBJETO.jpg")
+    parser.add_argument("--diametros", type=int, nargs="+", default=[5, 9, 15, 25, 51])
+    parser.add_argument("--precisoes", type=float, nargs="+", default=[0.5, 1.0, 2.0])
+    parser.add_argument("--sigma-color", type=float, default=75)
+    parser.add_argument("--repeticoes", type=int, default=2)
+    args = parser.parse_args()
+
+    img = cv2.imread(args.imagem)
+    if img is None:
+        sys.exit(f"Não foi possível carregar a imagem: {args.imagem}")
+    demo = AntiAliasingDemo(output_dir=tempfile.gettempdir(), gerar_figuras=False,
+                            salvar_imagens=False)
+    print(f"Imagem {args.imagem} ({img.shape[1]}x{img.shape[0]}), sigma_color={args.sigma_color:g}\n")
+    print(f"{'d':>4} {'sigma_s':>8} {'precisao':>9} {'cv2 (ms)':>9} {'grade (ms)':>11} "
+          f"{'Ganho':>7} {'PSNR (dB)':>10} {'SSIM':>7}")
+    for d in args.diametros:
+        # sigma_space ~ d/2, como costuma ser usado com o OpenCV
+        sigma_space = d / 2
+        t_cv2, referencia = cronometrar(
+            lambda: demo.aplicar_bilateral_filter(img, d, args.sigma_color, sigma_space),
+            args.repeticoes)
+        for precisao in args.precisoes:
+            t_grade, resultado = cronometrar(
+                lambda: demo.aplicar_bilateral_filter(img, d, args.sigma_color, sigma_space,
+                                                      modo='grade', precisao=precisao),
+                args.repeticoes)
+            metricas = calcular_metricas(referencia, resultado)
+            print(f"{d:>4} {sigma_space:>8g} {precisao:>9g} {t_cv2 * 1000:>9.1f} "
+                  f"{t_grade * 1000:>11.1f} {t_cv2 / t_grade:>6.1f}x "
+                  f"{metricas['PSNR']:>10.2f} {metricas['SSIM']:>7.4f}")
+
+
+if __name__ == "__main__":
+    main()
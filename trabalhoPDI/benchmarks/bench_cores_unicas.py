@@ -0,0 +1,62 @@
+"""
+Benchmark: contagem de cores únicas em analisar_caracteristicas
+
+Compara np.unique(img.reshape(-1, 3), axis=0) (implementação original)
+com o bitset de 24 bits, o np.bincount e a estimativa HyperLogLog, em
+imagens sintéticas de tamanhos crescentes.
+
+Uso (a partir de trabalhoPDI/):
+    python benchmarks/bench_cores_unicas.py [--megapixels 1 6 24] [--sem-unique]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from contagem_cores import contar_cores_unicas  # noqa: E402
+
+
+def imagem_sintetica(megapixels, rng):
+    """Foto sintética: gradiente suave + ruído (paleta realista, muitas cores)"""
+    altura = int(np.sqrt(megapixels * 1e6 * 3 / 4))
+    largura = int(altura * 4 / 3)
+    y, x = np.mgrid[0:altura, 0:largura]
+    base = np.stack([x * 255 // largura, y * 255 // altura, (x + y) * 127 // (altura + largura)], axis=-1)
+    ruido = rng.integers(-12, 13, base.shape)
+    return np.clip(base + ruido, 0, 255).astype(np.uint8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--megapixels", type=float, nargs="+", default=[1, 6, 24])
+    parser.add_argument("--sem-unique", action="store_true",
+                        help="Não executar np.unique (lento em imagens grandes)")
+    args = parser.parse_args()
+
+    metodos = ['bitset', 'bincount', 'hll']
+    if not args.sem_unique:
+        metodos.insert(0, 'unique')
+
+    rng = np.random.default_rng(0)
+    print(f"{'MP':>5} {'Método':<9} {'Tempo (ms)':>11} {'Cores':>10} {'Erro':>8} {'Ganho':>7}")
+    for mp in args.megapixels:
+        img = imagem_sintetica(mp, rng)
+        referencia = contar_cores_unicas(img, 'bitset')
+        tempos = {}
+        for metodo in metodos:
+            inicio = time.perf_counter()
+            cores = contar_cores_unicas(img, metodo)
+            tempos[metodo] = time.perf_counter() - inicio
+            erro = (cores - referencia) / referencia * 100
+            ganho = tempos.get('unique', tempos[metodo]) / tempos[metodo]
+            print(f"{mp:>5g} {metodo:<9} {tempos[metodo] * 1000:>11.1f} {cores:>10,} "
+                  f"{erro:>7.2f}% {ganho:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark: idas e voltas BGR <-> RGB no pipeline do AntiAliasingDemo
+
+Compara a sequência de conversões do pipeline original (reproduzida aqui
+sem a parte de matplotlib) com o fluxo usando ImagemCor, medindo tempo,
+pico de memória alocada (tracemalloc) e número de cópias de quadro inteiro
+geradas por conversões de cor.
+
+Uso (a partir de trabalhoPDI/):
+    python benchmarks/bench_espaco_cor.py [--imagem img/OBJETO.jpg] [--repeticoes 5]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antiserrilhamento import AntiAliasingDemo  # noqa: E402
+from espaco_cor import ImagemCor  # noqa: E402
+
+
+def pipeline_legado(demo, img_bgr):
+    """Conversões e filtros do pipeline original (etapas 1 e 5 a 8)"""
+    conversoes = 0
+    img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB); conversoes += 1
+
+    # comparar_tecnicas_antialiasing
+    bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR); conversoes += 1
+    saidas = [demo.aplicar_gaussian_blur(bgr), demo.aplicar_bilateral_filter(bgr),
+              demo.aplicar_median_blur(bgr), demo.aplicar_supersampling(bgr, 2)]
+    saidas_rgb = [cv2.cvtColor(s, cv2.COLOR_BGR2RGB) for s in saidas]; conversoes += 4
+
+    # analisar_bordas
+    cv2.Canny(cv2.cvtColor(img_rgb, cv2.COLOR_RGB2GRAY), 50, 150); conversoes += 1
+    bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR); conversoes += 1
+    suavizada = demo.aplicar_gaussian_blur(bgr)
+    cv2.Canny(cv2.cvtColor(suavizada, cv2.COLOR_BGR2GRAY), 50, 150); conversoes += 1
+    cv2.cvtColor(suavizada, cv2.COLOR_BGR2RGB); conversoes += 1
+
+    # demonstrar_efeito_escala
+    bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR); conversoes += 1
+    h, w = img_rgb.shape[:2]
+    for interp_baixo, interp_cima in ((cv2.INTER_NEAREST, cv2.INTER_NEAREST),
+                                      (cv2.INTER_AREA, cv2.INTER_CUBIC)):
+        reduzida = cv2.resize(bgr, (w // 2, h // 2), interpolation=interp_baixo)
+        cv2.cvtColor(cv2.resize(reduzida, (w, h), interpolation=interp_cima),
+                     cv2.COLOR_BGR2RGB); conversoes += 1
+
+    # Etapa 8
+    cv2.cvtColor(saidas_rgb[3], cv2.COLOR_RGB2BGR); conversoes += 1
+    return conversoes
+
+
+def pipeline_container(demo, img_bgr):
+    """Mesmo trabalho com ImagemCor (inclui o BGR necessário para gravar PNGs)"""
+    img = ImagemCor(img_bgr.copy(), 'BGR').converter_para('RGB')
+    derivadas = []
+
+    # comparar_tecnicas_antialiasing
+    for filtro, params in ((demo.aplicar_gaussian_blur, {}), (demo.aplicar_bilateral_filter, {}),
+                           (demo.aplicar_median_blur, {}), (demo.aplicar_supersampling, {'scale_factor': 2})):
+        saida = img.mapear(filtro, **params)
+        saida.rgb
+        saida.bgr  # cv2.imwrite
+        saida.liberar('BGR')
+        derivadas.append(saida)
+
+    # analisar_bordas
+    cv2.Canny(img.gray, 50, 150)
+    suavizada = img.mapear(demo.aplicar_gaussian_blur)
+    cv2.Canny(suavizada.gray, 50, 150)
+    suavizada.rgb
+    derivadas.append(suavizada)
+
+    # demonstrar_efeito_escala
+    h, w = img.shape[:2]
+    for interp_baixo, interp_cima in ((cv2.INTER_NEAREST, cv2.INTER_NEAREST),
+                                      (cv2.INTER_AREA, cv2.INTER_CUBIC)):
+        reduzida = img.mapear(cv2.resize, (w // 2, h // 2), interpolation=interp_baixo)
+        final = reduzida.mapear(cv2.resize, (w, h), interpolation=interp_cima)
+        final.rgb
+        derivadas.append(final)
+
+    return img.conversoes + sum(d.conversoes for d in derivadas)
+
+
+def medir(funcao, demo, img_bgr, repeticoes):
+    """Retorna (melhor tempo em s, pico de memória em bytes, conversões)"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(demo, img_bgr)
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    conversoes = funcao(demo, img_bgr)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(tempos), pico, conversoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--imagem", default=None, help="Imagem de entrada (padrão: sintética 4000x3000)")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.imagem:
+        img_bgr = cv2.imread(args.imagem)
+        if img_bgr is None:
+            raise SystemExit(f"Não foi possível carregar a imagem: {args.imagem}")
+    else:
+        img_bgr = np.random.default_rng(0).integers(0, 256, (3000, 4000, 3), dtype=np.uint8)
+
+    demo = AntiAliasingDemo(output_dir=tempfile.gettempdir())
+    quadro_mb = img_bgr.nbytes / (1024 * 1024)
+
+    print(f"Imagem: {img_bgr.shape[1]}x{img_bgr.shape[0]} ({quadro_mb:.1f} MB por quadro)\n")
+    print(f"{'Pipeline':<12} {'Tempo (ms)':>11} {'Pico (MB)':>10} {'Conversões':>11} {'Copiado (MB)':>13}")
+    linhas = {}
+    for nome, funcao in (("legado", pipeline_legado), ("ImagemCor", pipeline_container)):
+        tempo, pico, conversoes = medir(funcao, demo, img_bgr, args.repeticoes)
+        linhas[nome] = (tempo, pico, conversoes)
+        print(f"{nome:<12} {tempo * 1000:>11.1f} {pico / 2**20:>10.1f} {conversoes:>11d} "
+              f"{conversoes * quadro_mb:>13.1f}")
+
+    (t0, p0, c0), (t1, p1, c1) = linhas["legado"], linhas["ImagemCor"]
+    print(f"\nEconomia: {(t0 - t1) * 1000:.1f} ms, {(p0 - p1) / 2**20:.1f} MB de pico, "
+          f"{c0 - c1} conversões de quadro inteiro")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Benchmark: custo dos filtros aplicar_* do AntiAliasingDemo
+
+Varre resolução (256² a 8K), parâmetro principal de cada filtro (tamanho
+do kernel, diâmetro ou fator de escala) e número de threads do OpenCV,
+sobre imagens sintéticas geradas com semente fixa. Para cada caso registra
+o tempo de parede (mediana e mínimo das repetições), a vazão em megapixels
+por segundo e o pico de memória alocada (tracemalloc: arrays NumPy,
+incluindo as saídas do OpenCV). Os resultados vão para CSV e JSON (este
+com metadados do ambiente) e podem ser plotados/comparados com
+Projeto_OpenGL_GLUT/generate_graphs.py --benchmark.
+
+Uso (a partir de trabalhoPDI/):
+    python benchmarks/bench_filtros.py [--resolucoes 256 1080p 8k] [--kernels 3 5 9]
+        [--threads 1 4] [--filtros gaussian median] [--saida bench_filtros]
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antiserrilhamento import AntiAliasingDemo  # noqa: E402
+
+
+# Nome -> (largura, altura)
+RESOLUCOES = {
+    '256': (256, 256),
+    '512': (512, 512),
+    '1024': (1024, 1024),
+    '1080p': (1920, 1080),
+    '4k': (3840, 2160),
+    '8k': (7680, 4320),
+}
+
+# Filtro -> (método, parâmetro varrido, valores padrão do parâmetro)
+FILTROS = {
+    'gaussian': ('aplicar_gaussian_blur', 'kernel_size', 'kernels'),
+    'bilateral': ('aplicar_bilateral_filter', 'd', 'kernels'),
+    'median': ('aplicar_median_blur', 'kernel_size', 'kernels'),
+    'ssaa': ('aplicar_supersampling', 'scale_factor', 'escalas'),
+    'morfologico': ('aplicar_morphological_antialiasing', None, None),
+    'fxaa': ('aplicar_fxaa', None, None),
+    'smaa': ('aplicar_smaa', None, None),
+}
+
+CAMPOS = ['filtro', 'parametro', 'valor', 'resolucao', 'largura', 'altura', 'megapixels',
+          'threads', 'repeticoes', 'tempo_ms', 'tempo_min_ms', 'mp_por_s', 'pico_memoria_mb']
+
+
+def imagem_sintetica(largura, altura, semente=0):
+    """
+    Imagem de teste reprodutível: gradientes, bordas duras (xadrez) e ruído,
+    para exercitar tanto regiões suaves quanto serrilhado
+    """
+    rng = np.random.default_rng(semente)
+    y, x = np.mgrid[0:altura, 0:largura]
+    xadrez = (((x // 32) + (y // 32)) % 2) * 96
+    base = np.stack([x * 255 // max(1, largura - 1),
+                     y * 255 // max(1, altura - 1),
+                     xadrez + 64], axis=-1)
+    ruido = rng.integers(-10, 11, base.shape)
+    return np.clip(base + ruido, 0, 255).astype(np.uint8)
+
+
+def medir(funcao, repeticoes):
+    """
+    Executa `funcao` uma vez para aquecimento e depois `repeticoes` vezes
+
+    Returns:
+        Tupla (tempos em segundos, pico de memória em bytes)
+    """
+    funcao()
+    tempos = []
+    tracemalloc.start()
+    try:
+        for _ in range(repeticoes):
+            tracemalloc.reset_peak()
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return tempos, pico
+
+
+def casos(args):
+    """Gera (filtro, método, parâmetro, valor) para a varredura pedida"""
+    for filtro in args.filtros:
+        metodo, parametro, opcao = FILTROS[filtro]
+        valores = getattr(args, opcao) if opcao else [None]
+        for valor in valores:
+            yield filtro, metodo, parametro, valor
+
+
+def executar(args):
+    demo = AntiAliasingDemo(output_dir=tempfile.gettempdir(), gerar_figuras=False,
+                            salvar_imagens=False)
+    resultados = []
+    for nome_resolucao in args.resolucoes:
+        largura, altura = RESOLUCOES[nome_resolucao]
+        img = imagem_sintetica(largura, altura, args.semente)
+        megapixels = largura * altura / 1e6
+        for filtro, metodo, parametro, valor in casos(args):
+            params = {parametro: valor} if parametro else {}
+            funcao = getattr(demo, metodo)
+            for threads in args.threads:
+                cv2.setNumThreads(threads)
+                tempos, pico = medir(lambda img=img: funcao(img, **params), args.repeticoes)
+                mediana = statistics.median(tempos)
+                registro = {
+                    'filtro': filtro,
+                    'parametro': parametro or '',
+                    'valor': valor if valor is not None else '',
+                    'resolucao': nome_resolucao,
+                    'largura': largura,
+                    'altura': altura,
+                    'megapixels': round(megapixels, 4),
+                    'threads': threads,
+                    'repeticoes': args.repeticoes,
+                    'tempo_ms': round(mediana * 1000, 3),
+                    'tempo_min_ms': round(min(tempos) * 1000, 3),
+                    'mp_por_s': round(megapixels / mediana, 3),
+                    'pico_memoria_mb': round(pico / 2**20, 3),
+                }
+                resultados.append(registro)
+                etiqueta = f"{parametro}={valor}" if parametro else "-"
+                print(f"{nome_resolucao:>6} {filtro:<12} {etiqueta:<16} "
+                      f"threads={threads:<2} {registro['tempo_ms']:>10.2f} ms "
+                      f"{registro['mp_por_s']:>9.2f} MP/s {registro['pico_memoria_mb']:>8.1f} MB")
+        del img
+    return resultados
+
+
+def metadados(args):
+    """Ambiente da execução, para comparar resultados entre versões"""
+    return {
+        'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'nucleos': os.cpu_count(),
+        'semente': args.semente,
+        'repeticoes': args.repeticoes,
+    }
+
+
+def salvar(resultados, args):
+    base = Path(args.saida)
+    base.parent.mkdir(parents=True, exist_ok=True)
+    with open(base.with_suffix('.csv'), 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.DictWriter(f, fieldnames=CAMPOS)
+        escritor.writeheader()
+        escritor.writerows(resultados)
+    with open(base.with_suffix('.json'), 'w', encoding='utf-8') as f:
+        json.dump({'metadados': metadados(args), 'resultados': resultados}, f,
+                  indent=2, ensure_ascii=False)
+    print(f"\n✓ Resultados salvos em {base.with_suffix('.csv')} e {base.with_suffix('.json')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resolucoes", nargs="+", default=list(RESOLUCOES),
+                        choices=list(RESOLUCOES))
+    parser.add_argument("--filtros", nargs="+", default=list(FILTROS), choices=list(FILTROS))
+    parser.add_argument("--kernels", type=int, nargs="+", default=[3, 5, 9, 15],
+                        help="kernel_size (gaussian, median) e d (bilateral)")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[2, 4],
+                        help="scale_factor do supersampling")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                        help="Valores de cv2.setNumThreads")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", default="bench_filtros",
+                        help="Caminho base dos arquivos .csv e .json")
+    args = parser.parse_args()
+    args.threads = sorted(set(args.threads))
+
+    resultados = executar(args)
+    salvar(resultados, args)
+
+
+if __name__ == "__main__":
+    main()
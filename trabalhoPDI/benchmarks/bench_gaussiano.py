@@ -0,0 +1,66 @@
+"""
+Benchmark: suavização gaussiana FIR (OpenCV) x IIR recursivo (Young-van Vliet)
+
+Para cada sigma e tipo (uint8 e float32) mede o tempo dos dois algoritmos
+e mostra o escolhido pelo modo 'auto'. A exatidão do IIR em relação ao
+cv2.GaussianBlur é verificada em tests/test_gaussiano.py.
+
+Uso (a partir de trabalhoPDI/):
+    python benchmarks/bench_gaussiano.py [--sigmas 1 2 5 10 20 40 80]
+        [--largura 1920 --altura 1080]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gaussiano import LIMIAR_SIGMA_IIR, desfoque_gaussiano  # noqa: E402
+
+
+def imagem_sintetica(largura, altura, rng):
+    """Ruído suavizado + degraus: conteúdo com bordas e regiões lisas"""
+    ruido = cv2.GaussianBlur((rng.random((altura, largura, 3)) * 255).astype(np.uint8), (0, 0), 2)
+    degraus = (np.arange(largura)[None, :, None] // 64 % 2 * 80).astype(np.uint8)
+    return cv2.add(ruido, np.broadcast_to(degraus, ruido.shape).copy())
+
+
+def cronometrar(funcao, repeticoes):
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sigmas", type=float, nargs="+", default=[1, 2, 5, 10, 20, 40, 80])
+    parser.add_argument("--largura", type=int, default=1920)
+    parser.add_argument("--altura", type=int, default=1080)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    img8 = imagem_sintetica(args.largura, args.altura, np.random.default_rng(0))
+    entradas = {'uint8': img8, 'float32': img8.astype(np.float32)}
+
+    print(f"Imagem {args.largura}x{args.altura}, limiar do modo auto: sigma >= {LIMIAR_SIGMA_IIR:g}\n")
+    print(f"{'sigma':>6} {'tipo':<8} {'FIR (ms)':>9} {'IIR (ms)':>9} {'IIR/FIR':>8} {'auto':>5}")
+    for sigma in args.sigmas:
+        for tipo, img in entradas.items():
+            t_fir, _ = cronometrar(lambda: desfoque_gaussiano(img, sigma, 'fir'), args.repeticoes)
+            t_iir, _ = cronometrar(lambda: desfoque_gaussiano(img, sigma, 'iir'), args.repeticoes)
+            escolha = 'iir' if sigma >= LIMIAR_SIGMA_IIR else 'fir'
+            print(f"{sigma:>6g} {tipo:<8} {t_fir * 1000:>9.1f} {t_iir * 1000:>9.1f} "
+                  f"{t_iir / t_fir:>8.2f} {escolha:>5}")
+
+
+if __name__ == "__main__":
+    main()
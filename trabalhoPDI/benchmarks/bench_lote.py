@@ -0,0 +1,85 @@
+"""
+Benchmark: lote de miniaturas (aplicar_em_lote) x uma chamada aplicar_* por imagem
+
+Recorta miniaturas quadradas da imagem de teste, em vários tamanhos, e
+mede o tempo por imagem de cada filtro chamado imagem a imagem e pelo
+caminho em lote (processamento_lote.py), que empilha as miniaturas com
+halo nos filtros separáveis. Confere que os resultados são iguais aos das
+chamadas individuais.
+
+Uso (a partir de trabalhoPDI/):
+    python benchmarks/bench_lote.py [--imagem img/OBJETO.jpg]
+        [--lados 16 32 64 128] [--pixels 2000000] [--workers N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antiserrilhamento import AntiAliasingDemo  # noqa: E402
+
+
+def miniaturas(img, lado, quantidade, rng):
+    """Recortes lado x lado em posições aleatórias, como array NxHxWxC"""
+    ys = rng.integers(0, img.shape[0] - lado, quantidade)
+    xs = rng.integers(0, img.shape[1] - lado, quantidade)
+    return np.stack([img[y:y + lado, x:x + lado] for y, x in zip(ys, xs)])
+
+
+def cronometrar(funcao, repeticoes):
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--imagem", default="img/OBJETO.jpg")
+    parser.add_argument("--lados", type=int, nargs="+", default=[16, 32, 64, 128])
+    parser.add_argument("--pixels", type=int, default=2_000_000,
+                        help="Pixels somados do lote em cada tamanho")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    img = cv2.imread(args.imagem)
+    if img is None:
+        sys.exit(f"Não foi possível carregar a imagem: {args.imagem}")
+    demo = AntiAliasingDemo(output_dir=tempfile.gettempdir(), gerar_figuras=False,
+                            salvar_imagens=False)
+    filtros = {
+        'gaussian': demo.aplicar_gaussian_blur,
+        'bilateral': demo.aplicar_bilateral_filter,
+        'median': demo.aplicar_median_blur,
+        'ssaa': demo.aplicar_supersampling,
+    }
+    rng = np.random.default_rng(0)
+
+    print(f"{'lado':>4} {'N':>6} {'filtro':<10} {'por imagem (µs)':>16} {'lote (µs)':>10} "
+          f"{'Ganho':>7} {'Igual':>6}")
+    for lado in args.lados:
+        lote = miniaturas(img, lado, max(1, args.pixels // (lado * lado)), rng)
+        for nome, metodo in filtros.items():
+            t_individual, individual = cronometrar(
+                lambda: np.stack([metodo(miniatura) for miniatura in lote]), args.repeticoes)
+            t_lote, resultado = cronometrar(
+                lambda: demo.aplicar_em_lote(lote, nome, workers=args.workers), args.repeticoes)
+            igual = np.array_equal(individual, resultado)
+            print(f"{lado:>4} {len(lote):>6} {nome:<10} {t_individual / len(lote) * 1e6:>16.1f} "
+                  f"{t_lote / len(lote) * 1e6:>10.1f} {t_individual / t_lote:>6.1f}x "
+                  f"{'sim' if igual else 'NÃO':>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: filtro de mediana de tempo constante (mediana.py) por kernel
+
+Mede o tempo de filtro_mediana para kernels de 3 a 31 em uint8 (contra o
+cv2.medianBlur, que já é O(1) nesse tipo) e em dois conteúdos de 16 bits:
+dados de 12 bits e uma foto de faixa cheia com ruído. A exatidão é
+conferida contra a mediana direta do NumPy num recorte; termina com código
+1 se algum resultado divergir.
+
+Uso (a partir de trabalhoPDI/):
+    python benchmarks/bench_mediana.py [--imagem img/OBJETO.jpg]
+        [--kernels 3 5 9 15 21 31] [--workers N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mediana import filtro_mediana  # noqa: E402
+
+
+def cronometrar(funcao, repeticoes):
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def mediana_direta(img, kernel_size):
+    """Mediana por força bruta (bordas replicadas), para conferência"""
+    raio = kernel_size // 2
+    borda = ((raio, raio), (raio, raio)) + ((0, 0),) * (img.ndim - 2)
+    janelas = sliding_window_view(np.pad(img, borda, mode='edge'), (kernel_size, kernel_size),
+                                  axis=(0, 1))
+    janelas = janelas.reshape(janelas.shape[:img.ndim] + (-1,))
+    return np.median(janelas, axis=-1).astype(img.dtype)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--imagem", default="img/OBJETO.jpg")
+    parser.add_argument("--kernels", type=int, nargs="+", default=[3, 5, 9, 15, 21, 31])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--repeticoes", type=int, default=2)
+    args = parser.parse_args()
+
+    img = cv2.imread(args.imagem)
+    if img is None:
+        sys.exit(f"Não foi possível carregar a imagem: {args.imagem}")
+    rng = np.random.default_rng(0)
+    entradas = {
+        'uint8': img,
+        'uint16 (12 bits)': img.astype(np.uint16) * 16 + rng.integers(0, 16, img.shape, dtype=np.uint16),
+        'uint16 (ruído)': np.clip(img * 257.0 + rng.normal(0, 500, img.shape), 0, 65535).astype(np.uint16),
+    }
+
+    print(f"Imagem {args.imagem} ({img.shape[1]}x{img.shape[0]})\n")
+    print(f"{'tipo':<18} {'kernel':>6} {'mediana.py (ms)':>16} {'cv2 (ms)':>9} {'Exato':>6}")
+    falhas = 0
+    for tipo, dados in entradas.items():
+        recorte = dados[:120, :160]
+        for k in args.kernels:
+            t_motor, _ = cronometrar(lambda: filtro_mediana(dados, k, workers=args.workers),
+                                     args.repeticoes)
+            if dados.dtype == np.uint8 or k <= 5:
+                t_cv2, _ = cronometrar(lambda: cv2.medianBlur(dados, k), args.repeticoes)
+                coluna_cv2 = f"{t_cv2 * 1000:>9.1f}"
+            else:
+                coluna_cv2 = f"{'-':>9}"
+            exato = np.array_equal(filtro_mediana(recorte, k, tamanho_tile=48, workers=args.workers),
+                                   mediana_direta(recorte, k))
+            falhas += not exato
+            print(f"{tipo:<18} {k:>6} {t_motor * 1000:>16.1f} {coluna_cv2} "
+                  f"{'sim' if exato else 'NÃO':>6}")
+
+    if falhas:
+        print(f"\n✗ {falhas} caso(s) diferente(s) da mediana direta")
+        sys.exit(1)
+    print("\n✓ Resultados idênticos à mediana direta em todos os casos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: anti-aliasing por pós-processamento (FXAA/SMAA/MLAA) x SSAA e filtros
+
+Renderiza uma cena sintética (polígonos, círculos e linhas) em alta
+resolução; a referência é a média de área dessa renderização (o que um
+supersampling real produziria) e a entrada serrilhada é a amostragem de um
+ponto por pixel. Cada técnica de comparar_tecnicas_antialiasing é aplicada
+à entrada serrilhada e comparada com a referência: PSNR, ganho em dB sobre
+a entrada, tempo e ganho por milissegundo.
+
+Em seguida varia o número de formas da cena para mostrar como o tempo dos
+operadores de pós-processamento acompanha a fração de pixels de borda
+(o MLAA percorre só a lista esparsa de bordas).
+
+Uso (a partir de trabalhoPDI/):
+    python benchmarks/bench_pos_aa.py [--largura 1280 --altura 720]
+        [--fator-referencia 8] [--formas 0 2 8 32 128]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antiserrilhamento import AntiAliasingDemo  # noqa: E402
+from metricas import calcular_metricas  # noqa: E402
+
+
+def cena_sintetica(largura, altura, fator, rng, formas=12):
+    """
+    Args:
+        formas: Número de polígonos (metade disso em círculos e linhas)
+
+    Returns:
+        (serrilhada, referencia): amostragem pontual e média de área (RGB)
+    """
+    alta_l, alta_a = largura * fator, altura * fator
+    cena = np.full((alta_a, alta_l, 3), (220, 230, 235), dtype=np.uint8)
+
+    def cor():
+        return tuple(int(c) for c in rng.integers(0, 256, 3))
+
+    def ponto():
+        return int(rng.random() * alta_l), int(rng.random() * alta_a)
+
+    for _ in range(formas):
+        cv2.fillPoly(cena, [np.array([ponto() for _ in range(3)], dtype=np.int32)], cor())
+    for _ in range(formas // 2):
+        cv2.circle(cena, ponto(), int(rng.random() * alta_a / 6), cor(), -1)
+    for _ in range(formas // 2):
+        cv2.line(cena, ponto(), ponto(), (20, 20, 20), 2 * fator)
+
+    referencia = cv2.resize(cena, (largura, altura), interpolation=cv2.INTER_AREA)
+    serrilhada = np.ascontiguousarray(cena[fator // 2::fator, fator // 2::fator])
+    return serrilhada, referencia
+
+
+def cronometrar(funcao, repeticoes):
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--largura", type=int, default=1280)
+    parser.add_argument("--altura", type=int, default=720)
+    parser.add_argument("--fator-referencia", type=int, default=8)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--formas", type=int, nargs="+", default=[0, 2, 8, 32, 128])
+    args = parser.parse_args()
+
+    serrilhada, referencia = cena_sintetica(args.largura, args.altura, args.fator_referencia,
+                                            np.random.default_rng(0))
+    demo = AntiAliasingDemo(output_dir=tempfile.gettempdir(), gerar_figuras=False,
+                            salvar_imagens=False)
+    tecnicas = {
+        'gaussian': lambda img: demo.aplicar_gaussian_blur(img),
+        'bilateral': lambda img: demo.aplicar_bilateral_filter(img),
+        'median': lambda img: demo.aplicar_median_blur(img),
+        'ssaa (clássico)': lambda img: demo.aplicar_supersampling(img, 2, metodo='classico'),
+        'ssaa (fundido)': lambda img: demo.aplicar_supersampling(img, 2),
+        'morfologico': lambda img: demo.aplicar_morphological_antialiasing(img),
+        'fxaa': lambda img: demo.aplicar_fxaa(img),
+        'smaa': lambda img: demo.aplicar_smaa(img),
+    }
+
+    psnr_base = calcular_metricas(referencia, serrilhada, ssim=False)['PSNR']
+    print(f"Cena {args.largura}x{args.altura}, referência com {args.fator_referencia}x"
+          f"{args.fator_referencia} amostras por pixel")
+    print(f"PSNR da entrada serrilhada: {psnr_base:.2f} dB\n")
+    print(f"{'técnica':<16} {'Tempo (ms)':>11} {'PSNR (dB)':>10} {'Ganho (dB)':>11} "
+          f"{'SSIM':>7} {'dB/ms':>8}")
+    for nome, tecnica in tecnicas.items():
+        tempo, resultado = cronometrar(lambda: tecnica(serrilhada), args.repeticoes)
+        metricas = calcular_metricas(referencia, resultado)
+        ganho = metricas['PSNR'] - psnr_base
+        print(f"{nome:<16} {tempo * 1000:>11.1f} {metricas['PSNR']:>10.2f} {ganho:>+11.2f} "
+              f"{metricas['SSIM']:>7.4f} {ganho / (tempo * 1000):>+8.3f}")
+
+    print(f"\n{'formas':>6} {'Bordas (%)':>11} {'mlaa (ms)':>10} {'smaa (ms)':>10} "
+          f"{'fxaa (ms)':>10}")
+    for formas in args.formas:
+        cena, _ = cena_sintetica(args.largura, args.altura, args.fator_referencia,
+                                 np.random.default_rng(1), formas)
+        diferenca = (cv2.absdiff(cena[1:, 1:], cena[:-1, 1:]) |
+                     cv2.absdiff(cena[1:, 1:], cena[1:, :-1]))
+        bordas = 100 * float(np.mean(diferenca.max(axis=2) > 0))
+        tempos = [cronometrar(lambda: metodo(cena), args.repeticoes)[0] * 1000
+                  for metodo in (demo.aplicar_morphological_antialiasing, demo.aplicar_smaa,
+                                 demo.aplicar_fxaa)]
+        print(f"{formas:>6} {bordas:>11.2f} " + " ".join(f"{t:>10.1f}" for t in tempos))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: SSAA clássico (amplia e reduz) x SSAA fundido (supersampling.py)
+
+Para cada fator de escala mede o tempo e o pico de memória alocada
+(tracemalloc: arrays NumPy, incluindo as saídas do OpenCV) dos dois
+métodos de aplicar_supersampling, e a diferença entre os resultados
+(erro máximo, erro médio e PSNR).
+
+Uso (a partir de trabalhoPDI/):
+    python benchmarks/bench_ssaa.py [--imagem img/OBJETO.jpg]
+        [--fatores 2 3 4 5 6 7 8]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antiserrilhamento import AntiAliasingDemo  # noqa: E402
+from metricas import calcular_metricas  # noqa: E402
+
+
+def medir(funcao, repeticoes):
+    """Menor tempo entre as repetições e pico de memória da última"""
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return min(tempos), pico, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--imagem", default="img/OBJETO.jpg")
+    parser.add_argument("--fatores", type=int, nargs="+", default=[2, 3, 4, 5, 6, 7, 8])
+    parser.add_argument("--repeticoes", type=int, default=2)
+    args = parser.parse_args()
+
+    img = cv2.imread(args.imagem)
+    if img is None:
+        sys.exit(f"Não foi possível carregar a imagem: {args.imagem}")
+    demo = AntiAliasingDemo(output_dir=tempfile.gettempdir(), gerar_figuras=False,
+                            salvar_imagens=False)
+    print(f"Imagem {args.imagem} ({img.shape[1]}x{img.shape[0]}, "
+          f"{img.nbytes / 2**20:.1f} MB)\n")
+    print(f"{'fator':>5} {'clássico (ms)':>14} {'fundido (ms)':>13} {'Ganho':>7} "
+          f"{'Pico cl. (MB)':>14} {'Pico fu. (MB)':>14} {'Erro máx':>9} {'Erro médio':>11} "
+          f"{'PSNR (dB)':>10}")
+    for fator in args.fatores:
+        t_classico, pico_classico, classico = medir(
+            lambda: demo.aplicar_supersampling(img, fator, metodo='classico'), args.repeticoes)
+        t_fundido, pico_fundido, fundido = medir(
+            lambda: demo.aplicar_supersampling(img, fator, metodo='fundido'), args.repeticoes)
+        diferenca = cv2.absdiff(classico, fundido)
+        psnr = calcular_metricas(classico, fundido, ssim=False)['PSNR']
+        print(f"{fator:>5} {t_classico * 1000:>14.1f} {t_fundido * 1000:>13.1f} "
+              f"{t_classico / t_fundido:>6.1f}x {pico_classico / 2**20:>14.1f} "
+              f"{pico_fundido / 2**20:>14.1f} {int(diferenca.max()):>9} "
+              f"{float(diferenca.mean()):>11.4f} {psnr:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
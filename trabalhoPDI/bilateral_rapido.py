@@ -0,0 +1,252 @@
+"""
+Filtro bilateral aproximado por grade bilateral (Paris e Durand, 2006)
+
+A imagem é projetada numa grade 3D subamostrada (x, y, intensidade da
+guia), suavizada ali com um gaussiano pequeno e lida de volta por
+interpolação trilinear. O custo por pixel é praticamente constante: não
+cresce com o raio espacial (a grade só fica menor) e depende pouco do
+sigma de cor.
+
+- projeção: caixa no espaço (célula do pixel) e peso linear ("tenda") nos
+  dois níveis de intensidade vizinhos, acumulados com np.bincount
+- suavização: gaussiano espacial em cada nível e gaussiano entre níveis,
+  descontando a variância que a projeção e a leitura já introduzem
+- leitura: níveis empilhados como uma imagem 2D, interpolação bilinear dos
+  dois níveis vizinhos com cv2.remap (em janelas, quando a pilha passa do
+  limite de SHRT_MAX linhas do OpenCV) e interpolação linear entre eles
+
+O parâmetro `precisao` escala a resolução da grade (células de tamanho
+sigma / precisao): valores maiores aproximam melhor o filtro exato e
+custam mais (com sigma espacial pequeno a grade chega ao tamanho da
+imagem); valores menores são mais rápidos.
+"""
+
+import math
+
+import cv2
+import numpy as np
+
+
+def sigma_espacial_efetivo(d, sigma_space):
+    """
+    Desvio padrão (por eixo) do kernel espacial do cv2.bilateralFilter
+
+    O OpenCV limita o gaussiano de sigma_space a uma janela circular de
+    diâmetro d; com sigma_space grande a janela é quase uniforme e o
+    desvio efetivo é bem menor que sigma_space.
+
+    Args:
+        d: Diâmetro da vizinhança (<= 0: derivado de sigma_space)
+        sigma_space: Sigma espacial
+
+    Returns:
+        Desvio padrão equivalente em pixels
+    """
+    raio = int(round(sigma_space * 1.5)) if d <= 0 else d // 2
+    if raio <= 0:
+        return 0.0
+    y, x = np.mgrid[-raio:raio + 1, -raio:raio + 1]
+    pesos = np.exp(-(x * x + y * y) / (2.0 * sigma_space ** 2)) * (x * x + y * y <= raio * raio)
+    return float(np.sqrt((pesos * x * x).sum() / pesos.sum()))
+
+
+# O cv2.remap exige origem e destino com menos de SHRT_MAX linhas e colunas
+_LIMITE_REMAP = 32767
+
+
+def _remap_em_blocos(origem, mapa_x, mapa_y):
+    """
+    cv2.remap bilinear com o destino dividido em blocos abaixo de
+    _LIMITE_REMAP linhas e colunas
+    """
+    altura, largura = mapa_x.shape
+    passo = _LIMITE_REMAP - 1
+    if altura <= passo and largura <= passo:
+        return cv2.remap(origem, mapa_x, mapa_y, cv2.INTER_LINEAR).reshape(altura, largura, -1)
+    saida = np.empty((altura, largura, origem.shape[2]), origem.dtype)
+    for y in range(0, altura, passo):
+        for x in range(0, largura, passo):
+            bloco_x = np.ascontiguousarray(mapa_x[y:y + passo, x:x + passo])
+            bloco_y = np.ascontiguousarray(mapa_y[y:y + passo, x:x + passo])
+            saida[y:y + passo, x:x + passo] = cv2.remap(
+                origem, bloco_x, bloco_y, cv2.INTER_LINEAR).reshape(*bloco_x.shape, -1)
+    return saida
+
+
+def _remap_bilinear(origem, mapa_x, mapa_y):
+    """
+    cv2.remap bilinear sem o limite de tamanho do OpenCV
+
+    Origens maiores que o limite são lidas em janelas que se sobrepõem em
+    uma linha/coluna (a vizinha da interpolação): cada pixel de destino é
+    lido da janela que contém o canto superior esquerdo da sua vizinhança.
+    Janelas de linhas são fatias contíguas, sem cópia da grade
+    """
+    altura, largura = origem.shape[:2]
+    if altura < _LIMITE_REMAP and largura < _LIMITE_REMAP:
+        return _remap_em_blocos(origem, mapa_x, mapa_y)
+    passo = _LIMITE_REMAP - 2
+    janela_y = (mapa_y // passo).astype(np.intp)
+    janela_x = (mapa_x // passo).astype(np.intp)
+    saida = np.zeros((*mapa_x.shape, origem.shape[2]), origem.dtype)
+    for jy in np.unique(janela_y):
+        for jx in np.unique(janela_x):
+            selecao = (janela_y == jy) & (janela_x == jx)
+            if not selecao.any():
+                continue
+            y0, x0 = jy * passo, jx * passo
+            janela = origem[y0:y0 + passo + 1, x0:x0 + passo + 1]
+            if not janela.flags.c_contiguous:
+                janela = np.ascontiguousarray(janela)
+            parte = _remap_em_blocos(janela, mapa_x - np.float32(x0), mapa_y - np.float32(y0))
+            np.copyto(saida, parte, where=selecao[:, :, None])
+    return saida
+
+
+def _gaussiano_discreto(sigma):
+    """Kernel gaussiano normalizado (raio 2 sigma) para a suavização entre níveis"""
+    raio = max(1, int(math.ceil(2 * sigma)))
+    k = np.exp(-np.arange(-raio, raio + 1) ** 2 / (2.0 * sigma ** 2))
+    return k / k.sum()
+
+
+def filtro_bilateral_grade(img, sigma_espacial, sigma_cor, precisao=1.0, guia=None):
+    """
+    Filtro bilateral aproximado pela grade bilateral
+
+    Args:
+        img: Imagem HxW ou HxWxC (uint8, uint16 ou float32)
+        sigma_espacial: Desvio padrão espacial, em pixels
+        sigma_cor: Desvio padrão na intensidade da guia
+        precisao: Resolução relativa da grade (1.0: células de um sigma)
+        guia: Imagem HxW que define as bordas (padrão: média dos canais)
+
+    Returns:
+        Imagem filtrada, do mesmo tipo e forma da entrada
+    """
+    if precisao <= 0:
+        raise ValueError("precisao deve ser positiva")
+    img = np.asarray(img)
+    dados = img.astype(np.float32)
+    if dados.ndim == 2:
+        dados = dados[:, :, None]
+    if guia is None:
+        guia = dados.mean(axis=2, dtype=np.float32) if dados.shape[2] > 1 else dados[:, :, 0]
+
+    resultado = _grade(dados, np.asarray(guia, dtype=np.float32), sigma_espacial, sigma_cor,
+                       precisao)
+    if img.ndim == 2:
+        resultado = resultado[:, :, 0]
+    if np.issubdtype(img.dtype, np.integer):
+        info = np.iinfo(img.dtype)
+        np.rint(resultado, out=resultado)
+        np.clip(resultado, info.min, info.max, out=resultado)
+    return resultado.astype(img.dtype)
+
+
+def bilateral_grade_como_cv2(img, d=9, sigma_color=75, sigma_space=75, precisao=1.0):
+    """
+    Aproximação de cv2.bilateralFilter(img, d, sigma_color, sigma_space)
+
+    O espacial usa o desvio efetivo da janela do OpenCV. Na cor, o OpenCV
+    compara pixels pela soma das diferenças absolutas dos canais (L1); a
+    guia é a média dos canais, cuja diferença é essa soma dividida pelo
+    número de canais, e o sigma de cor é dividido na mesma proporção. Por
+    usar a média, a guia independe da ordem dos canais (BGR ou RGB).
+
+    Args:
+        img: Imagem HxW ou HxWxC
+        d, sigma_color, sigma_space: Parâmetros do cv2.bilateralFilter
+        precisao: Resolução relativa da grade
+
+    Returns:
+        Imagem filtrada, do mesmo tipo e forma da entrada
+    """
+    canais = img.shape[2] if np.ndim(img) == 3 else 1
+    return filtro_bilateral_grade(img, sigma_espacial_efetivo(d, sigma_space),
+                                  sigma_color / canais, precisao)
+
+
+def _grade(dados, guia, sigma_espacial, sigma_cor, precisao):
+    """
+    Projeção, suavização e leitura da grade para uma guia
+
+    Args:
+        dados: float32 HxWxC a filtrar
+        guia: float32 HxW (mesma escala de sigma_cor)
+    """
+    altura, largura, canais = dados.shape
+    if sigma_espacial <= 0 or sigma_cor <= 0:
+        return dados.copy()
+
+    # Tamanho das células e dimensões da grade
+    celula_espacial = max(1.0, sigma_espacial / precisao)
+    celula_cor = sigma_cor / precisao
+    grade_h = int(math.ceil(altura / celula_espacial))
+    grade_w = int(math.ceil(largura / celula_espacial))
+    z = (guia - guia.min()) * np.float32(1.0 / celula_cor)
+    niveis = int(z.max()) + 2
+
+    # Projeção: caixa no espaço (célula do pixel) e tenda na intensidade
+    # (dois níveis vizinhos), acumuladas com bincount
+    passo = grade_h * grade_w
+    tamanho = niveis * passo
+    cy = (np.arange(altura) / celula_espacial).astype(np.intp)
+    cx = (np.arange(largura) / celula_espacial).astype(np.intp)
+    z0 = z.astype(np.intp)
+    fz = z - z0
+    indice = ((z0 * grade_h + cy[:, None]) * grade_w + cx[None, :]).ravel()
+    indice = np.concatenate([indice, indice + passo])
+    pesos_z = np.concatenate([(1 - fz).ravel(), fz.ravel()])
+    grade = np.empty((niveis, grade_h, grade_w, canais + 1), dtype=np.float32)
+    plano = grade.reshape(tamanho, canais + 1)
+    for c in range(canais):
+        valores = np.tile(dados[:, :, c].ravel(), 2) * pesos_z
+        plano[:, c] = np.bincount(indice, valores, tamanho)
+    plano[:, canais] = np.bincount(indice, pesos_z, tamanho)
+    del indice, pesos_z
+
+    # Suavização: a projeção e a leitura já contribuem com variância (caixa +
+    # tenda no espaço, tenda + tenda na intensidade); o gaussiano completa
+    sigma_grade = math.sqrt(max(0.0, (sigma_espacial / celula_espacial) ** 2 - 0.25))
+    sigma_niveis = math.sqrt(max(0.0, (sigma_cor / celula_cor) ** 2 - 1.0 / 3.0))
+    if sigma_grade > 0:
+        for k in range(niveis):
+            grade[k] = cv2.GaussianBlur(grade[k], (0, 0), sigma_grade,
+                                        borderType=cv2.BORDER_CONSTANT).reshape(grade[k].shape)
+    if sigma_niveis > 0:
+        kernel = _gaussiano_discreto(sigma_niveis)
+        raio = len(kernel) // 2
+        original = grade.copy()
+        grade *= np.float32(kernel[raio])
+        for deslocamento in range(1, min(raio, niveis - 1) + 1):
+            peso = np.float32(kernel[raio + deslocamento])
+            grade[deslocamento:] += peso * original[:-deslocamento]
+            grade[:-deslocamento] += peso * original[deslocamento:]
+        del original
+
+    # Leitura: com os níveis empilhados verticalmente numa imagem 2D, a
+    # interpolação bilinear de cada um dos dois níveis vizinhos é um
+    # cv2.remap; a interpolação linear entre eles completa a trilinear
+    empilhada = grade.reshape(niveis * grade_h, grade_w, canais + 1)
+    gy = np.clip((np.arange(altura, dtype=np.float32) + 0.5) / celula_espacial - 0.5, 0, grade_h - 1)
+    gx = np.clip((np.arange(largura, dtype=np.float32) + 0.5) / celula_espacial - 0.5, 0, grade_w - 1)
+    z0 = np.minimum(z0, niveis - 2)
+    fz = (z - z0)[:, :, None]
+    mapa_x = np.broadcast_to(gx[None, :], (altura, largura)).astype(np.float32)
+    mapa_y = (z0 * grade_h).astype(np.float32) + gy[:, None]
+    inferior = _remap_bilinear(empilhada, mapa_x, mapa_y)
+    mapa_y += grade_h
+    superior = _remap_bilinear(empilhada, mapa_x, mapa_y)
+    superior -= inferior
+    superior *= fz
+    inferior += superior
+    del superior, mapa_x, mapa_y
+
+    pesos = inferior[:, :, canais:]
+    resultado = inferior[:, :, :canais] / np.maximum(pesos, np.float32(1e-12))
+    # Sem peso na vizinhança (não deveria ocorrer): mantém o pixel original
+    vazio = pesos[:, :, 0] <= 1e-12
+    if vazio.any():
+        resultado[vazio] = dados[vazio]
+    return resultado
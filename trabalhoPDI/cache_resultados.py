@@ -0,0 +1,215 @@
+"""
+Cache em disco endereçado por conteúdo para os resultados dos filtros
+
+A chave de cada entrada é o hash dos bytes da imagem de entrada (mais forma
+e tipo) combinado com o nome do filtro e seus parâmetros. Arrays são
+guardados em .npy e métricas em .json; o tamanho total é limitado com
+remoção LRU (data de último acesso registrada no mtime do arquivo). Assim,
+reprocessar uma imagem inalterada, ou mudar só um parâmetro, recalcula
+apenas o que mudou.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+
+import numpy as np
+
+
+class CacheResultados:
+    """
+    Cache LRU em disco de arrays e métricas, limitado por tamanho
+    """
+
+    def __init__(self, diretorio, tamanho_maximo_mb=1024):
+        """
+        Args:
+            diretorio: Diretório do cache (criado se não existir)
+            tamanho_maximo_mb: Tamanho máximo somado dos arquivos
+        """
+        self.diretorio = str(diretorio)
+        self.tamanho_maximo = int(tamanho_maximo_mb * 1024 * 1024)
+        self.acertos = 0
+        self.falhas = 0
+        os.makedirs(self.diretorio, exist_ok=True)
+        self._tamanho_atual = sum(tamanho for _, tamanho, _ in self._entradas())
+
+    @staticmethod
+    def hash_imagem(img):
+        """
+        Hash do conteúdo de um array (bytes + forma + tipo)
+
+        Returns:
+            String hexadecimal
+        """
+        img = np.ascontiguousarray(img)
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f"{img.shape}|{img.dtype.str}|".encode())
+        h.update(memoryview(img).cast('B'))
+        return h.hexdigest()
+
+    @staticmethod
+    def chave(hashes, filtro, params):
+        """
+        Chave de uma entrada: hash(es) da(s) entrada(s) + filtro + parâmetros
+
+        Args:
+            hashes: Hash ou lista de hashes das imagens de entrada
+            filtro: Nome do filtro/operação
+            params: Dicionário de parâmetros (serializável em JSON)
+        """
+        if isinstance(hashes, str):
+            hashes = [hashes]
+        descricao = json.dumps({'entradas': list(hashes), 'filtro': filtro, 'params': params},
+                               sort_keys=True, default=str)
+        return hashlib.blake2b(descricao.encode(), digest_size=20).hexdigest()
+
+    def _caminho(self, chave, extensao):
+        return os.path.join(self.diretorio, f"{chave}{extensao}")
+
+    def _entradas(self):
+        """Lista (caminho, tamanho, último acesso) dos arquivos do cache"""
+        entradas = []
+        with os.scandir(self.diretorio) as it:
+            for e in it:
+                if e.is_file() and e.name.endswith(('.npy', '.json')):
+                    info = e.stat()
+                    entradas.append((e.path, info.st_size, info.st_mtime))
+        return entradas
+
+    def _ler(self, caminho, leitor):
+        try:
+            valor = leitor(caminho)
+        except (FileNotFoundError, ValueError, OSError):
+            self.falhas += 1
+            return None
+        # Marca o acesso para a política LRU
+        try:
+            os.utime(caminho, None)
+        except OSError:
+            pass
+        self.acertos += 1
+        return valor
+
+    def _gravar(self, caminho, escritor):
+        # Escrita atômica: vários processos podem compartilhar o cache
+        fd, temporario = tempfile.mkstemp(dir=self.diretorio, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                escritor(f)
+            os.replace(temporario, caminho)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+        self._tamanho_atual += os.path.getsize(caminho)
+        if self._tamanho_atual > self.tamanho_maximo:
+            self.remover_excedente()
+
+    def obter_array(self, chave):
+        """
+        Returns:
+            Array guardado ou None se não estiver no cache
+        """
+        return self._ler(self._caminho(chave, '.npy'), np.load)
+
+    def guardar_array(self, chave, array):
+        self._gravar(self._caminho(chave, '.npy'), lambda f: np.save(f, array))
+
+    def obter_metricas(self, chave):
+        """
+        Returns:
+            Dicionário guardado ou None se não estiver no cache
+        """
+        def ler_json(caminho):
+            with open(caminho, encoding='utf-8') as f:
+                return json.load(f)
+        return self._ler(self._caminho(chave, '.json'), ler_json)
+
+    def guardar_metricas(self, chave, metricas):
+        dados = json.dumps({k: float(v) for k, v in metricas.items()}).encode('utf-8')
+        self._gravar(self._caminho(chave, '.json'), lambda f: f.write(dados))
+
+    def remover_excedente(self):
+        """
+        Remove as entradas acessadas há mais tempo até respeitar o limite
+        """
+        entradas = sorted(self._entradas(), key=lambda e: e[2])
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for caminho, tamanho, _ in entradas:
+            if total <= self.tamanho_maximo:
+                break
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass  # já removido por outro processo
+            total -= tamanho
+        self._tamanho_atual = total
+
+    def limpar(self):
+        """
+        Remove todas as entradas
+        """
+        for caminho, _, _ in self._entradas():
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+        self._tamanho_atual = 0
+
+
+def _parametros(metodo, args, kwargs):
+    """Parâmetros efetivos da chamada (incluindo padrões), sem self e img"""
+    assinatura = inspect.signature(metodo)
+    ligados = assinatura.bind(None, None, *args, **kwargs)
+    ligados.apply_defaults()
+    return dict(list(ligados.arguments.items())[2:])
+
+
+def com_cache(filtro):
+    """
+    Decorador para métodos aplicar_*(self, img, ...) de AntiAliasingDemo:
+    consulta self.cache (se houver) antes de calcular e guarda o resultado
+
+    Args:
+        filtro: Nome do filtro usado na chave
+    """
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltorio(self, img, *args, **kwargs):
+            cache = getattr(self, 'cache', None)
+            if cache is None:
+                return metodo(self, img, *args, **kwargs)
+            chave = cache.chave(cache.hash_imagem(img), filtro, _parametros(metodo, args, kwargs))
+            resultado = cache.obter_array(chave)
+            if resultado is None:
+                resultado = metodo(self, img, *args, **kwargs)
+                cache.guardar_array(chave, resultado)
+            return resultado
+        return envoltorio
+    return decorador
+
+
+def com_cache_metricas(operacao):
+    """
+    Decorador para métodos (self, img_a, img_b) que retornam um dicionário
+    de métricas numéricas
+    """
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltorio(self, img_a, img_b, *args, **kwargs):
+            cache = getattr(self, 'cache', None)
+            if cache is None:
+                return metodo(self, img_a, img_b, *args, **kwargs)
+            chave = cache.chave([cache.hash_imagem(img_a), cache.hash_imagem(img_b)], operacao,
+                                _parametros(metodo, (None,) + args, kwargs))
+            metricas = cache.obter_metricas(chave)
+            if metricas is None:
+                metricas = metodo(self, img_a, img_b, *args, **kwargs)
+                cache.guardar_metricas(chave, metricas)
+            return metricas
+        return envoltorio
+    return decorador
@@ -0,0 +1,145 @@
+"""
+Contêiner de imagem ciente do espaço de cor
+
+Registra a ordem dos canais (BGR do OpenCV ou RGB da visualização) e
+converte de forma preguiçosa, no máximo uma vez por ordem solicitada.
+Os filtros de suavização usados no projeto (gaussiano, bilateral, mediana,
+SSAA) tratam os canais de forma independente/simétrica, então podem ser
+aplicados direto na ordem nativa, sem ida e volta BGR <-> RGB.
+"""
+
+import cv2
+
+
+# Conversões suportadas: (origem, destino) -> código OpenCV
+_CONVERSOES = {
+    ('BGR', 'RGB'): cv2.COLOR_BGR2RGB,
+    ('RGB', 'BGR'): cv2.COLOR_RGB2BGR,
+    ('BGR', 'GRAY'): cv2.COLOR_BGR2GRAY,
+    ('RGB', 'GRAY'): cv2.COLOR_RGB2GRAY,
+}
+
+
+class ImagemCor:
+    """
+    Imagem com ordem de canais registrada e conversões sob demanda
+    """
+
+    def __init__(self, dados, ordem='BGR'):
+        """
+        Args:
+            dados: Array HxWx3 (ou HxW para 'GRAY')
+            ordem: Ordem dos canais de `dados` ('BGR', 'RGB' ou 'GRAY')
+        """
+        if ordem not in ('BGR', 'RGB', 'GRAY'):
+            raise ValueError(f"Ordem de canais desconhecida: {ordem}")
+        self.dados = dados
+        self.ordem = ordem
+        self._cache = {ordem: dados}
+        self.conversoes = 0
+
+    @classmethod
+    def ler(cls, caminho):
+        """
+        Lê uma imagem do disco (ordem BGR do OpenCV)
+
+        Args:
+            caminho: Caminho da imagem
+
+        Returns:
+            ImagemCor em BGR
+        """
+        dados = cv2.imread(caminho)
+        if dados is None:
+            raise ValueError(f"Não foi possível carregar a imagem: {caminho}")
+        return cls(dados, 'BGR')
+
+    @classmethod
+    def de(cls, img, ordem='RGB'):
+        """
+        Normaliza a entrada: devolve `img` se já for ImagemCor, senão embrulha
+        o array assumindo a ordem informada
+        """
+        if isinstance(img, cls):
+            return img
+        return cls(img, ordem)
+
+    def em(self, ordem):
+        """
+        Retorna os dados na ordem pedida, convertendo no máximo uma vez
+
+        Args:
+            ordem: 'BGR', 'RGB' ou 'GRAY'
+
+        Returns:
+            Array na ordem solicitada (não modificar: pode ser compartilhado)
+        """
+        if ordem not in self._cache:
+            codigo = _CONVERSOES.get((self.ordem, ordem))
+            if codigo is None:
+                raise ValueError(f"Conversão não suportada: {self.ordem} -> {ordem}")
+            self._cache[ordem] = cv2.cvtColor(self.dados, codigo)
+            self.conversoes += 1
+        return self._cache[ordem]
+
+    @property
+    def rgb(self):
+        return self.em('RGB')
+
+    @property
+    def bgr(self):
+        return self.em('BGR')
+
+    @property
+    def gray(self):
+        return self.em('GRAY')
+
+    @property
+    def shape(self):
+        return self.dados.shape
+
+    def converter_para(self, ordem):
+        """
+        Troca a ordem nativa reaproveitando o próprio buffer (sem cópia extra)
+        e descarta conversões em cache
+
+        Args:
+            ordem: 'BGR' ou 'RGB'
+
+        Returns:
+            A própria instância
+        """
+        if ordem != self.ordem:
+            codigo = _CONVERSOES[(self.ordem, ordem)]
+            self.dados = cv2.cvtColor(self.dados, codigo, dst=self.dados)
+            self.conversoes += 1
+            self.ordem = ordem
+        self._cache = {ordem: self.dados}
+        return self
+
+    def mapear(self, funcao, *args, **kwargs):
+        """
+        Aplica uma função que não depende da ordem dos canais aos dados
+        nativos, preservando a ordem registrada no resultado
+
+        Args:
+            funcao: Função array -> array (ex.: aplicar_gaussian_blur)
+
+        Returns:
+            Nova ImagemCor com o resultado
+        """
+        return ImagemCor(funcao(self.dados, *args, **kwargs), self.ordem)
+
+    def salvar(self, caminho):
+        """
+        Salva em disco (o OpenCV espera BGR)
+        """
+        return cv2.imwrite(caminho, self.bgr)
+
+    def liberar(self, ordem):
+        """
+        Descarta uma conversão em cache que não será mais usada
+        """
+        if ordem != self.ordem:
+            self._cache.pop(ordem, None)
+
@@ -0,0 +1,82 @@
+"""
+Histogramas por canal calculados uma única vez e reaproveitados
+
+Os histogramas são contagens inteiras exatas (np.bincount por canal; o
+cv2.calcHist acumula em float32 e perde unidades acima de 2^24 pixels por
+bin). O resultado é um array canais x bins que pode ser guardado, serializado e
+desenhado quantas vezes for preciso com `stairs`, sem reprocessar a imagem.
+"""
+
+import numpy as np
+
+
+def calcular_histogramas(img, bins=256, faixa=(0, 256)):
+    """
+    Calcula o histograma de cada canal
+
+    Args:
+        img: Imagem HxW ou HxWxC (uint8, uint16 ou float32)
+        bins: Número de intervalos
+        faixa: Intervalo de valores (inicio, fim) coberto pelos bins
+
+    Returns:
+        Array int64 de forma (canais, bins)
+    """
+    img = np.asarray(img)
+    if img.ndim == 2:
+        img = img[..., np.newaxis]
+    inicio, fim = faixa
+    direto = img.dtype == np.uint8 and bins == 256 and (inicio, fim) == (0, 256)
+    histogramas = np.empty((img.shape[2], bins), dtype=np.int64)
+    for c in range(img.shape[2]):
+        valores = img[..., c].ravel()
+        if not direto:
+            # Índice do bin de cada valor dentro da faixa (fim exclusivo)
+            valores = valores[(valores >= inicio) & (valores < fim)]
+            valores = ((valores.astype(np.float64) - inicio) * (bins / (fim - inicio))).astype(np.intp)
+            np.minimum(valores, bins - 1, out=valores)
+        histogramas[c] = np.bincount(valores, minlength=bins)
+    return histogramas
+
+
+def bordas_dos_bins(histogramas, faixa=(0, 256)):
+    """
+    Bordas dos intervalos correspondentes aos histogramas (para `stairs`)
+    """
+    return np.linspace(faixa[0], faixa[1], histogramas.shape[-1] + 1)
+
+
+def salvar_histogramas(caminho, histogramas, faixa=(0, 256)):
+    """
+    Serializa os histogramas (e a faixa de valores) em um arquivo .npz
+
+    Args:
+        caminho: Arquivo de destino
+        histogramas: Array (canais, bins)
+        faixa: Intervalo de valores coberto pelos bins
+    """
+    np.savez_compressed(caminho, contagens=histogramas, faixa=np.asarray(faixa))
+
+
+def carregar_histogramas(caminho):
+    """
+    Lê histogramas salvos por salvar_histogramas
+
+    Returns:
+        Tupla (histogramas, faixa)
+    """
+    with np.load(caminho) as dados:
+        return dados['contagens'], tuple(dados['faixa'].tolist())
+
+
+def desenhar_histograma(ax, contagens, bordas, **kwargs):
+    """
+    Desenha contagens já calculadas em um eixo do matplotlib
+
+    Args:
+        ax: Eixo do matplotlib
+        contagens: Contagens de um canal
+        bordas: Bordas dos intervalos (len(contagens) + 1)
+        **kwargs: Repassados para ax.stairs (color, alpha, label...)
+    """
+    return ax.stairs(contagens, bordas, fill=True, **kwargs)
@@ -0,0 +1,173 @@
+"""
+Filtro de mediana de tempo constante (Perreault e Hébert, 2007) para
+kernels grandes, em 8 e 16 bits
+
+O cv2.medianBlur já implementa o algoritmo de histogramas de Perreault e
+Hébert para uint8 (custo por pixel independente do kernel), mas para
+uint16 e float32 só aceita kernels 3 e 5. Aqui o histograma de 16 bits é
+tratado em dois níveis, como no histograma grosso/fino do artigo:
+
+- nível grosso: mediana do byte alto (img >> 8). Como a mediana comuta com
+  funções monótonas, ela é o byte alto `c` da mediana verdadeira.
+- nível fino: para cada valor `c` encontrado, mediana de
+  clip(img - 256*c, 0, 255), que pelo mesmo argumento é o byte baixo da
+  mediana nos pixels cujo nível grosso é `c`. Só a caixa envolvente desses
+  pixels (mais o raio do kernel) é filtrada.
+
+Antes disso os valores de cada tile são trocados pela sua posição entre os
+valores distintos do tile (outra função monótona). Com até 256 valores
+distintos (ex.: imagens de 8 bits convertidas para 16) basta uma passada;
+nos demais casos o número de níveis grossos cai para distintos / 256.
+
+Os dois níveis usam o cv2.medianBlur de 8 bits, então o custo continua
+independente do tamanho do kernel. A imagem é dividida em tiles com halo
+do raio do kernel, processados em threads (o OpenCV libera o GIL); como o
+halo cobre a janela e as bordas reais continuam replicadas, o resultado é
+idêntico ao da imagem inteira. O custo cresce com o número de níveis
+grossos presentes em cada tile: é baixo para dados de 10 a 12 bits e para
+regiões suaves, e maior em fotos de 16 bits com faixa cheia e muita textura.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+import cv2
+import numpy as np
+
+
+# Lado do tile de saída (pixels) usado no processamento em paralelo
+TAMANHO_TILE_PADRAO = 128
+
+# Maior kernel que o cv2.medianBlur aceita para tipos diferentes de uint8
+_KERNEL_MAXIMO_CV2 = 5
+
+
+def filtro_mediana(img, kernel_size=5, tamanho_tile=TAMANHO_TILE_PADRAO, workers=None):
+    """
+    Filtro de mediana com janela quadrada, de custo independente do kernel
+
+    Mesmo resultado do cv2.medianBlur (bordas replicadas) e mesma assinatura
+    de aplicar_median_blur, aceitando também kernels grandes em 16 bits.
+
+    Args:
+        img: Imagem HxW ou HxWxC (uint8, uint16 ou int16; float32 só com
+             kernel_size <= 5)
+        kernel_size: Lado ímpar da janela
+        tamanho_tile: Lado do tile de saída no processamento em paralelo
+        workers: Número de threads (padrão: núcleos disponíveis)
+
+    Returns:
+        Imagem filtrada, do mesmo tipo e forma da entrada
+    """
+    img = np.asarray(img)
+    if kernel_size < 1 or kernel_size % 2 == 0:
+        raise ValueError("kernel_size deve ser ímpar e positivo")
+    if kernel_size == 1:
+        return img.copy()
+    workers = workers or os.cpu_count() or 1
+
+    # Casos que o OpenCV resolve direto (uint8 sem paralelismo, kernels pequenos)
+    if kernel_size <= _KERNEL_MAXIMO_CV2 and img.dtype in (np.uint8, np.uint16, np.float32):
+        return cv2.medianBlur(img, kernel_size)
+    if img.dtype == np.uint8 and workers <= 1:
+        return cv2.medianBlur(img, kernel_size)
+    if img.dtype == np.int16:
+        # Deslocamento monótono para uint16 (inverte o bit de sinal)
+        deslocada = (img.view(np.uint16) ^ np.uint16(0x8000))
+        resultado = filtro_mediana(deslocada, kernel_size, tamanho_tile, workers)
+        return (resultado ^ np.uint16(0x8000)).view(np.int16)
+    if img.dtype not in (np.uint8, np.uint16):
+        raise ValueError(f"Tipo não suportado para kernel {kernel_size}: {img.dtype} "
+                         "(use uint8, uint16 ou int16)")
+
+    img = np.ascontiguousarray(img)
+    resultado = np.empty_like(img)
+    tiles = list(_tiles(img.shape[0], img.shape[1], tamanho_tile))
+
+    def processar(tile):
+        y0, y1, x0, x1 = tile
+        _mediana_tile(img, resultado, y0, y1, x0, x1, kernel_size)
+
+    if workers <= 1 or len(tiles) <= 1:
+        for tile in tiles:
+            processar(tile)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(processar, tiles))
+    return resultado
+
+
+def _tiles(altura, largura, tamanho):
+    for y0 in range(0, altura, tamanho):
+        for x0 in range(0, largura, tamanho):
+            yield y0, min(y0 + tamanho, altura), x0, min(x0 + tamanho, largura)
+
+
+def _mediana_tile(img, resultado, y0, y1, x0, x1, kernel_size):
+    """
+    Filtra o tile [y0:y1, x0:x1] de img em resultado, lendo um halo do raio
+    do kernel (recortado nas bordas da imagem, onde o cv2 replica)
+    """
+    raio = kernel_size // 2
+    ry0, ry1 = max(0, y0 - raio), min(img.shape[0], y1 + raio)
+    rx0, rx1 = max(0, x0 - raio), min(img.shape[1], x1 + raio)
+    regiao = img[ry0:ry1, rx0:rx1]
+    interior = (slice(y0 - ry0, y1 - ry0), slice(x0 - rx0, x1 - rx0))
+
+    if img.dtype == np.uint8:
+        resultado[y0:y1, x0:x1] = cv2.medianBlur(regiao, kernel_size)[interior]
+        return
+    if regiao.ndim == 2:
+        resultado[y0:y1, x0:x1] = _mediana_16bits(regiao, interior, kernel_size)
+    else:
+        for c in range(regiao.shape[2]):
+            resultado[y0:y1, x0:x1, c] = _mediana_16bits(
+                np.ascontiguousarray(regiao[:, :, c]), interior, kernel_size)
+
+
+def _mediana_16bits(regiao, interior, kernel_size):
+    """
+    Mediana de uma região uint16 de um canal: sobre os postos dos valores,
+    em um nível (até 256 distintos) ou em dois (byte alto, depois baixo)
+
+    Args:
+        regiao: uint16 HxW, tile acrescido do halo
+        interior: Fatias (linhas, colunas) do tile dentro da região
+        kernel_size: Lado ímpar da janela
+
+    Returns:
+        uint16 com a mediana do interior
+    """
+    # Posto de cada valor entre os distintos da região (preserva a ordem)
+    presentes = np.bincount(regiao.ravel(), minlength=1 << 16) > 0
+    valores = np.flatnonzero(presentes).astype(np.uint16)
+    postos = (np.cumsum(presentes) - 1).astype(np.uint16)[regiao]
+    if len(valores) <= 256:
+        return valores[cv2.medianBlur(postos.astype(np.uint8), kernel_size)[interior]]
+
+    raio = kernel_size // 2
+    grossa = cv2.medianBlur((postos >> 8).astype(np.uint8), kernel_size)[interior]
+    resultado = grossa.astype(np.uint16) << 8
+    oy, ox = interior[0].start, interior[1].start
+
+    for c in np.unique(grossa):
+        mascara = grossa == c
+        linhas = np.flatnonzero(mascara.any(axis=1))
+        colunas = np.flatnonzero(mascara.any(axis=0))
+        # Caixa dos pixels com nível grosso c (coordenadas do interior) e a
+        # janela que ela lê (coordenadas da região)
+        iy0, iy1 = linhas[0], linhas[-1] + 1
+        ix0, ix1 = colunas[0], colunas[-1] + 1
+        by0, by1 = max(0, oy + iy0 - raio), min(regiao.shape[0], oy + iy1 + raio)
+        bx0, bx1 = max(0, ox + ix0 - raio), min(regiao.shape[1], ox + ix1 + raio)
+
+        baixa = postos[by0:by1, bx0:bx1].astype(np.int32)
+        baixa -= int(c) << 8
+        np.clip(baixa, 0, 255, out=baixa)
+        fina = cv2.medianBlur(baixa.astype(np.uint8), kernel_size)
+        fina = fina[oy + iy0 - by0:oy + iy1 - by0, ox + ix0 - bx0:ox + ix1 - bx0]
+
+        mascara = mascara[iy0:iy1, ix0:ix1]
+        destino = resultado[iy0:iy1, ix0:ix1]
+        destino[mascara] |= fina[mascara]
+    return valores[resultado]
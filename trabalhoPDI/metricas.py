@@ -0,0 +1,141 @@
+"""
+Métricas de qualidade (MSE, PSNR, MAE e SSIM) em uma única passada
+
+A imagem é percorrida em blocos de linhas; em cada bloco a diferença
+absoluta é calculada uma vez e reaproveitada para MAE e MSE, com acúmulo
+inteiro exato para uint8/uint16 (float32 para os demais tipos). O SSIM
+(Wang et al., 2004: janela gaussiana 11x11, sigma 1.5) usa float32 e um
+halo de linhas para que o resultado em blocos seja idêntico ao da imagem
+inteira. A memória de pico depende só do tamanho do bloco.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+import cv2
+import numpy as np
+
+
+# Janela gaussiana do SSIM e seu raio (halo necessário entre blocos)
+_JANELA_SSIM = 11
+_SIGMA_SSIM = 1.5
+_RAIO_SSIM = _JANELA_SSIM // 2
+
+
+def valor_maximo_padrao(dtype):
+    """
+    Faixa dinâmica assumida para o tipo dos pixels (255, 65535 ou 1.0)
+    """
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.integer):
+        return float(np.iinfo(dtype).max)
+    return 1.0
+
+
+def _suavizar(x):
+    return cv2.GaussianBlur(x, (_JANELA_SSIM, _JANELA_SSIM), _SIGMA_SSIM)
+
+
+def _soma_ssim(a, b, inicio, fim, c1, c2):
+    """
+    Soma do mapa SSIM das linhas [inicio, fim) de um bloco lido com halo
+    """
+    a = a.astype(np.float32)
+    b = b.astype(np.float32)
+    mu_a, mu_b = _suavizar(a), _suavizar(b)
+    mu_aa, mu_bb, mu_ab = mu_a * mu_a, mu_b * mu_b, mu_a * mu_b
+    var_a = _suavizar(a * a) - mu_aa
+    var_b = _suavizar(b * b) - mu_bb
+    cov = _suavizar(a * b) - mu_ab
+    mapa = ((2 * mu_ab + c1) * (2 * cov + c2)) / ((mu_aa + mu_bb + c1) * (var_a + var_b + c2))
+    return float(mapa[inicio:fim].sum(dtype=np.float64))
+
+
+def calcular_metricas(img_a, img_b, ssim=True, linhas_por_bloco=256, valor_maximo=None):
+    """
+    Calcula MSE, PSNR, MAE e (opcionalmente) SSIM entre duas imagens
+
+    Args:
+        img_a: Imagem de referência HxW ou HxWxC
+        img_b: Imagem comparada, de mesma forma e tipo
+        ssim: Calcular também o SSIM médio (média dos canais)
+        linhas_por_bloco: Linhas processadas por vez (limita a memória)
+        valor_maximo: Faixa dinâmica (padrão: derivada do tipo)
+
+    Returns:
+        Dicionário com 'MSE', 'PSNR', 'MAE' e, se pedido, 'SSIM'
+    """
+    img_a = np.asarray(img_a)
+    img_b = np.asarray(img_b)
+    if img_a.shape != img_b.shape:
+        raise ValueError(f"Formas incompatíveis: {img_a.shape} e {img_b.shape}")
+    if img_a.dtype != img_b.dtype:
+        raise ValueError(f"Tipos incompatíveis: {img_a.dtype} e {img_b.dtype}")
+    if valor_maximo is None:
+        valor_maximo = valor_maximo_padrao(img_a.dtype)
+    if linhas_por_bloco <= 0:
+        raise ValueError("linhas_por_bloco deve ser positivo")
+
+    inteiro = img_a.dtype in (np.uint8, np.uint16)
+    c1 = np.float32((0.01 * valor_maximo) ** 2)
+    c2 = np.float32((0.03 * valor_maximo) ** 2)
+    altura = img_a.shape[0]
+    soma_abs = soma_quad = 0
+    soma_ssim = 0.0
+
+    for y0 in range(0, altura, linhas_por_bloco):
+        y1 = min(altura, y0 + linhas_por_bloco)
+        a, b = img_a[y0:y1], img_b[y0:y1]
+        if inteiro:
+            # |a - b| cabe no próprio tipo; o quadrado cabe em uint32/uint64
+            diferenca = cv2.absdiff(a, b)
+            soma_abs += int(diferenca.sum(dtype=np.uint64))
+            diferenca = diferenca.astype(np.uint32 if img_a.dtype == np.uint8 else np.uint64)
+            soma_quad += int(np.multiply(diferenca, diferenca, out=diferenca).sum(dtype=np.uint64))
+        else:
+            diferenca = np.abs(a.astype(np.float32) - b.astype(np.float32))
+            soma_abs += float(diferenca.sum(dtype=np.float64))
+            soma_quad += float(np.multiply(diferenca, diferenca, out=diferenca).sum(dtype=np.float64))
+        del diferenca
+
+        if ssim:
+            # Halo de linhas vizinhas; nas bordas reais vale a borda do OpenCV
+            h0, h1 = max(0, y0 - _RAIO_SSIM), min(altura, y1 + _RAIO_SSIM)
+            soma_ssim += _soma_ssim(img_a[h0:h1], img_b[h0:h1], y0 - h0, y1 - h0, c1, c2)
+
+    total = img_a.size
+    mse = soma_quad / total
+    metricas = {
+        'MSE': mse,
+        'PSNR': float('inf') if mse == 0 else float(20 * np.log10(valor_maximo / np.sqrt(mse))),
+        'MAE': soma_abs / total,
+    }
+    if ssim:
+        metricas['SSIM'] = soma_ssim / total
+    return metricas
+
+
+def calcular_metricas_lote(imagens_a, imagens_b, workers=None, **opcoes):
+    """
+    Calcula as métricas de vários pares de imagens
+
+    Os pares são processados em threads: as operações do OpenCV e as
+    reduções do NumPy liberam o GIL.
+
+    Args:
+        imagens_a: Sequência de imagens (ou array NxHxW[xC]) de referência
+        imagens_b: Sequência de imagens comparadas, pareadas com imagens_a
+        workers: Número de threads (padrão: núcleos disponíveis)
+        **opcoes: Repassadas para calcular_metricas
+
+    Returns:
+        Lista de dicionários de métricas, na ordem dos pares
+    """
+    if len(imagens_a) != len(imagens_b):
+        raise ValueError("As duas sequências devem ter o mesmo número de imagens")
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(imagens_a) <= 1:
+        return [calcular_metricas(a, b, **opcoes) for a, b in zip(imagens_a, imagens_b)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda par: calcular_metricas(*par, **opcoes),
+                                 zip(imagens_a, imagens_b)))
@@ -0,0 +1,332 @@
+"""
+Instrumentação por etapa: tempo de parede, tempo de CPU, pico de memória
+e bytes de saída
+
+Cada medição é aberta com o gerenciador de contexto Perfilador.etapa (ou
+com o decorador `perfilado` nos métodos de AntiAliasingDemo) e pode ser
+aninhada. O resultado é uma linha do tempo estruturada exportável em JSON,
+no formato Chrome Trace (chrome://tracing, Perfetto, speedscope) e em
+pilhas dobradas (flamegraph.pl, speedscope). Sem perfilador ativo, o custo
+é o de um getattr por chamada.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+
+def bytes_de(obj):
+    """
+    Soma os bytes dos arrays contidos em `obj` (arrays, ImagemCor,
+    dicionários, listas e tuplas, recursivamente)
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sum(bytes_de(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(bytes_de(v) for v in obj)
+    dados = getattr(obj, 'dados', None)
+    if isinstance(dados, np.ndarray):
+        return dados.nbytes
+    return 0
+
+
+class _Registro:
+    """Medição em andamento de uma etapa"""
+
+    __slots__ = ('nome', 'caminho', 'atributos', 'inicio', 'inicio_cpu', 'memoria_inicial',
+                 'pico', 'bytes_saida')
+
+    def __init__(self, nome, caminho, atributos):
+        self.nome = nome
+        self.caminho = caminho
+        self.atributos = atributos
+        self.bytes_saida = 0
+        self.pico = 0
+
+    def saida(self, obj):
+        """Registra o resultado da etapa (contabiliza seus bytes)"""
+        self.bytes_saida += bytes_de(obj)
+        return obj
+
+
+class Perfilador:
+    """
+    Coleta medições aninhadas de etapas do pipeline
+
+    O pico de memória vem do tracemalloc (arrays NumPy, incluindo as saídas
+    do OpenCV) e é relativo à memória em uso ao iniciar a etapa. Com ele
+    ligado, trechos com muitas alocações Python (figuras do matplotlib)
+    ficam bem mais lentos; as etapas numéricas praticamente não mudam. O
+    tempo de CPU é o do processo inteiro, então inclui as threads internas
+    do OpenCV.
+    """
+
+    def __init__(self, diretorio=None, memoria=True):
+        """
+        Args:
+            diretorio: Se informado, exportar() grava os arquivos aqui
+            memoria: Medir pico de memória (liga o tracemalloc)
+        """
+        self.diretorio = diretorio
+        self.memoria = memoria
+        self.eventos = []
+        self._origem = time.perf_counter_ns()
+        self._local = threading.local()
+        self._trava = threading.Lock()
+        self._iniciou_tracemalloc = False
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+    def __getstate__(self):
+        # Enviado a processos do pool só com a configuração (sem eventos,
+        # travas nem estado por thread)
+        return {'diretorio': self.diretorio, 'memoria': self.memoria}
+
+    def __setstate__(self, estado):
+        self.__init__(**estado)
+
+    def _pilha(self):
+        pilha = getattr(self._local, 'pilha', None)
+        if pilha is None:
+            pilha = self._local.pilha = []
+        return pilha
+
+    @contextlib.contextmanager
+    def etapa(self, nome, **atributos):
+        """
+        Mede o bloco como uma etapa (aninhável)
+
+        Args:
+            nome: Nome da etapa
+            **atributos: Informações extras gravadas com o evento
+
+        Yields:
+            Registro com o método saida(obj) para contabilizar o resultado
+        """
+        pilha = self._pilha()
+        caminho = tuple(r.nome for r in pilha) + (nome,)
+        registro = _Registro(nome, caminho, atributos)
+
+        if self.memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._iniciou_tracemalloc = True
+            atual, pico = tracemalloc.get_traced_memory()
+            # tracemalloc tem um único pico global: guarda o pico da etapa
+            # externa antes de zerá-lo para esta
+            if pilha:
+                pilha[-1].pico = max(pilha[-1].pico, pico)
+            tracemalloc.reset_peak()
+            registro.memoria_inicial = atual
+        pilha.append(registro)
+        registro.inicio_cpu = time.process_time_ns()
+        registro.inicio = time.perf_counter_ns()
+        try:
+            yield registro
+        finally:
+            fim = time.perf_counter_ns()
+            fim_cpu = time.process_time_ns()
+            pilha.pop()
+            pico_relativo = 0
+            if self.memoria and tracemalloc.is_tracing():
+                registro.pico = max(registro.pico, tracemalloc.get_traced_memory()[1])
+                pico_relativo = max(0, registro.pico - registro.memoria_inicial)
+                if pilha:
+                    pilha[-1].pico = max(pilha[-1].pico, registro.pico)
+            evento = {
+                'nome': nome,
+                'caminho': list(caminho),
+                'profundidade': len(caminho) - 1,
+                'thread': threading.get_ident(),
+                'inicio_ms': (registro.inicio - self._origem) / 1e6,
+                'duracao_ms': (fim - registro.inicio) / 1e6,
+                'cpu_ms': (fim_cpu - registro.inicio_cpu) / 1e6,
+                'pico_memoria_bytes': pico_relativo,
+                'bytes_saida': registro.bytes_saida,
+            }
+            if atributos:
+                evento['atributos'] = atributos
+            with self._trava:
+                self.eventos.append(evento)
+
+    def linha_do_tempo(self):
+        """
+        Returns:
+            Eventos ordenados pelo início
+        """
+        return sorted(self.eventos, key=lambda e: e['inicio_ms'])
+
+    def resumo(self, profundidade=None):
+        """
+        Agrega os eventos por caminho
+
+        Args:
+            profundidade: Considerar só eventos nesta profundidade (None: todos)
+
+        Returns:
+            Lista de dicionários com nome, chamadas, tempo total, CPU e pico
+        """
+        agregado = {}
+        for e in self.linha_do_tempo():
+            if profundidade is not None and e['profundidade'] != profundidade:
+                continue
+            chave = tuple(e['caminho'])
+            item = agregado.setdefault(chave, {'nome': ' > '.join(chave), 'chamadas': 0,
+                                               'duracao_ms': 0.0, 'cpu_ms': 0.0,
+                                               'pico_memoria_bytes': 0, 'bytes_saida': 0})
+            item['chamadas'] += 1
+            item['duracao_ms'] += e['duracao_ms']
+            item['cpu_ms'] += e['cpu_ms']
+            item['pico_memoria_bytes'] = max(item['pico_memoria_bytes'], e['pico_memoria_bytes'])
+            item['bytes_saida'] += e['bytes_saida']
+        return list(agregado.values())
+
+    def imprimir_resumo(self, profundidade=None):
+        """
+        Imprime a tabela do resumo
+        """
+        print(f"\n{'Etapa':<52} {'N':>3} {'Parede (ms)':>12} {'CPU (ms)':>10} "
+              f"{'Pico (MB)':>10} {'Saída (MB)':>11}")
+        for item in self.resumo(profundidade):
+            print(f"{item['nome'][:52]:<52} {item['chamadas']:>3} {item['duracao_ms']:>12.1f} "
+                  f"{item['cpu_ms']:>10.1f} {item['pico_memoria_bytes'] / 2**20:>10.1f} "
+                  f"{item['bytes_saida'] / 2**20:>11.1f}")
+
+    def salvar_json(self, caminho):
+        """
+        Grava a linha do tempo estruturada
+        """
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump({'eventos': self.linha_do_tempo()}, f, indent=2, ensure_ascii=False)
+
+    def salvar_chrome_trace(self, caminho):
+        """
+        Grava no formato Chrome Trace (eventos completos 'X', em microssegundos)
+        """
+        pid = os.getpid()
+        eventos = [{
+            'name': e['nome'],
+            'ph': 'X',
+            'ts': e['inicio_ms'] * 1000,
+            'dur': e['duracao_ms'] * 1000,
+            'pid': pid,
+            'tid': e['thread'],
+            'args': {
+                'cpu_ms': round(e['cpu_ms'], 3),
+                'pico_memoria_bytes': e['pico_memoria_bytes'],
+                'bytes_saida': e['bytes_saida'],
+                **e.get('atributos', {}),
+            },
+        } for e in self.linha_do_tempo()]
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, f, default=str)
+
+    def salvar_pilhas_dobradas(self, caminho):
+        """
+        Grava pilhas dobradas ("a;b;c valor"), com o tempo exclusivo de cada
+        etapa em microssegundos, para flamegraph.pl ou speedscope
+        """
+        total = {}
+        filhos = {}
+        for e in self.eventos:
+            chave = tuple(e['caminho'])
+            total[chave] = total.get(chave, 0.0) + e['duracao_ms']
+            if len(chave) > 1:
+                filhos[chave[:-1]] = filhos.get(chave[:-1], 0.0) + e['duracao_ms']
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for chave, duracao in total.items():
+                exclusivo = max(0.0, duracao - filhos.get(chave, 0.0))
+                f.write(f"{';'.join(chave)} {int(round(exclusivo * 1000))}\n")
+
+    def exportar(self, prefixo, diretorio=None):
+        """
+        Grava prefixo.json, prefixo.trace.json e prefixo.folded
+
+        Args:
+            prefixo: Nome base dos arquivos
+            diretorio: Diretório de destino (padrão: o do construtor)
+
+        Returns:
+            Caminho base usado
+        """
+        diretorio = diretorio or self.diretorio or '.'
+        base = os.path.join(diretorio, prefixo)
+        self.salvar_json(base + '.json')
+        self.salvar_chrome_trace(base + '.trace.json')
+        self.salvar_pilhas_dobradas(base + '.folded')
+        return base
+
+    def limpar(self):
+        """
+        Descarta os eventos coletados
+        """
+        with self._trava:
+            self.eventos = []
+        self._origem = time.perf_counter_ns()
+
+    def parar(self):
+        """
+        Desliga o tracemalloc se foi ligado por este perfilador
+        """
+        if self._iniciou_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._iniciou_tracemalloc = False
+
+
+def medir_etapa(perfilador, nome, **atributos):
+    """
+    Etapa do perfilador ou contexto nulo quando não há perfilador
+
+    Args:
+        perfilador: Perfilador ou None
+        nome: Nome da etapa
+    """
+    if perfilador is None:
+        return _CONTEXTO_NULO
+    return perfilador.etapa(nome, **atributos)
+
+
+class _ContextoNulo:
+    """Contexto sem efeito (reutilizável) cujo registro ignora saida()"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def saida(self, obj):
+        return obj
+
+
+_CONTEXTO_NULO = _ContextoNulo()
+
+
+def perfilado(nome=None):
+    """
+    Decorador para métodos de AntiAliasingDemo: mede a chamada quando
+    self.perfilador está definido e contabiliza os bytes do retorno
+
+    Args:
+        nome: Nome da etapa (padrão: nome do método)
+    """
+    def decorador(metodo):
+        etiqueta = nome or metodo.__name__
+
+        @functools.wraps(metodo)
+        def envoltorio(self, *args, **kwargs):
+            perfilador = getattr(self, 'perfilador', None)
+            if perfilador is None:
+                return metodo(self, *args, **kwargs)
+            with perfilador.etapa(etiqueta) as registro:
+                return registro.saida(metodo(self, *args, **kwargs))
+        return envoltorio
+    return decorador
@@ -0,0 +1,423 @@
+"""
+Anti-aliasing por pós-processamento (estilo FXAA e SMAA), em uma passada
+
+Os dois operadores trabalham sobre a imagem final, sem reamostrar: detectam
+as descontinuidades de luminância e misturam cada pixel de borda com o
+vizinho do outro lado, na proporção estimada da cobertura da borda real.
+Tudo é vetorizado em NumPy/OpenCV; o custo fica numa fração do SSAA.
+
+- FXAA (Lottes, 2009): teste de contraste local na cruz de vizinhos; nos
+  pixels aprovados, orientação da borda pelos vizinhos diagonais, busca
+  das extremidades da borda ao longo dela e deslocamento proporcional à
+  distância até a extremidade mais próxima (mais um termo de sub-pixel).
+- SMAA simplificado (Jimenez et al., 2012, na linha do MLAA de Reshetov):
+  bordas de luminância com adaptação ao contraste local, comprimento de
+  cada segmento de borda e arestas cruzadas nas extremidades (padrões L,
+  Z e U), área coberta pela linha que liga o meio da aresta cruzada ao
+  meio do segmento e mistura com os vizinhos pelos pesos dessa área.
+- MLAA (Reshetov, 2009) em cores: a mesma reconstrução, com bordas por
+  diferença entre canais e processamento só da lista esparsa de pixels de
+  borda, de modo que o custo acompanha a densidade de bordas.
+"""
+
+import cv2
+import numpy as np
+
+
+# Pesos da luminância (Rec. 601) por ordem de canais
+PESOS_LUMA = {
+    'RGB': (0.299, 0.587, 0.114),
+    'BGR': (0.114, 0.587, 0.299),
+}
+
+
+def luminancia(img, ordem='RGB'):
+    """
+    Luminância em float32, na escala [0, 1] para uint8/uint16
+
+    Args:
+        img: Imagem HxW ou HxWxC (C >= 3; canais extras são ignorados)
+        ordem: 'RGB' ou 'BGR'
+
+    Returns:
+        Array float32 HxW
+    """
+    escala = 1.0
+    if np.issubdtype(img.dtype, np.integer):
+        escala = 1.0 / np.iinfo(img.dtype).max
+    if img.ndim == 2:
+        return img.astype(np.float32) * np.float32(escala)
+    pesos = np.zeros((1, img.shape[2]), dtype=np.float32)
+    pesos[0, :3] = np.asarray(PESOS_LUMA[ordem]) * escala
+    return cv2.transform(img.astype(np.float32), pesos)
+
+
+def _para_tipo(resultado, dtype):
+    """Arredonda e satura (tipos inteiros) para o tipo original"""
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        np.rint(resultado, out=resultado)
+        np.clip(resultado, info.min, info.max, out=resultado)
+    return resultado.astype(dtype)
+
+
+def fxaa(img, ordem='RGB', limiar_contraste=0.125, limiar_minimo=0.0312, subpixel=0.75,
+         busca=12):
+    """
+    Anti-aliasing aproximado rápido (FXAA)
+
+    Args:
+        img: Imagem HxW ou HxWxC
+        ordem: Ordem dos canais, para a luminância
+        limiar_contraste: Contraste mínimo, relativo ao máximo local
+        limiar_minimo: Contraste mínimo absoluto (regiões escuras)
+        subpixel: Intensidade da suavização de sub-pixel (0 a 1)
+        busca: Passos máximos da busca de extremidades, para cada lado
+
+    Returns:
+        Imagem filtrada, do mesmo tipo e forma da entrada
+    """
+    img = np.asarray(img)
+    altura, largura = img.shape[:2]
+    # Borda replicada larga o bastante para a busca dispensar recortes
+    margem = busca + 1
+    luma = cv2.copyMakeBorder(luminancia(img, ordem), margem, margem, margem, margem,
+                              cv2.BORDER_REPLICATE)
+
+    def deslocada(dy, dx):
+        return luma[margem + dy:margem + dy + altura, margem + dx:margem + dx + largura]
+
+    centro = deslocada(0, 0)
+    vizinhos = (deslocada(-1, 0), deslocada(1, 0), deslocada(0, -1), deslocada(0, 1))
+
+    # Teste de contraste na cruz: só os pixels aprovados seguem adiante
+    maximo = np.maximum.reduce((centro,) + vizinhos)
+    minimo = np.minimum.reduce((centro,) + vizinhos)
+    faixa = maximo - minimo
+    ys, xs = np.nonzero(faixa >= np.maximum(limiar_minimo, maximo * limiar_contraste))
+    if len(ys) == 0:
+        return img.copy()
+
+    # Amostras da vizinhança 3x3 dos pixels de borda (índices lineares em luma)
+    passo_linha = largura + 2 * margem
+    base = (ys + margem) * passo_linha + xs + margem
+    plano = luma.ravel()
+    m = plano[base]
+    n, s = plano[base - passo_linha], plano[base + passo_linha]
+    w, e = plano[base - 1], plano[base + 1]
+    nw, ne = plano[base - passo_linha - 1], plano[base - passo_linha + 1]
+    sw, se = plano[base + passo_linha - 1], plano[base + passo_linha + 1]
+    faixa = faixa[ys, xs]
+
+    # Sub-pixel: diferença entre o centro e a média da vizinhança
+    media = (2 * (n + s + w + e) + nw + ne + sw + se) / 12
+    sub = np.clip(np.abs(media - m) / faixa, 0, 1)
+    sub = (-2 * sub + 3) * sub * sub
+    sub = sub * sub * subpixel
+
+    # Orientação: borda horizontal mistura na vertical e vice-versa
+    variacao_h = (np.abs(nw - 2 * w + sw) + 2 * np.abs(n - 2 * m + s) + np.abs(ne - 2 * e + se))
+    variacao_v = (np.abs(nw - 2 * n + ne) + 2 * np.abs(w - 2 * m + e) + np.abs(sw - 2 * s + se))
+    horizontal = variacao_h >= variacao_v
+    luma1 = np.where(horizontal, n, w)
+    luma2 = np.where(horizontal, s, e)
+    gradiente1 = np.abs(luma1 - m)
+    gradiente2 = np.abs(luma2 - m)
+    lado1 = gradiente1 >= gradiente2
+    passo = np.where(lado1, -1, 1)
+    media_local = 0.5 * (np.where(lado1, luma1, luma2) + m)
+    gradiente = 0.25 * np.maximum(gradiente1, gradiente2)
+
+    # Busca das extremidades ao longo da borda, na meia linha entre o pixel
+    # e o vizinho do lado mais íngreme
+    ao_longo = np.where(horizontal, 1, passo_linha)
+    transversal = passo * np.where(horizontal, passo_linha, 1)
+    distancias, extremos = [], []
+    for sentido in (-1, 1):
+        distancia = np.full(len(ys), busca, dtype=np.int32)
+        extremo = np.zeros(len(ys), dtype=np.float32)
+        ativo = np.arange(len(ys))
+        for k in range(1, busca + 1):
+            indice = base[ativo] + sentido * k * ao_longo[ativo]
+            amostra = 0.5 * (plano[indice] + plano[indice + transversal[ativo]]) - media_local[ativo]
+            extremo[ativo] = amostra
+            achou = np.abs(amostra) >= gradiente[ativo]
+            distancia[ativo[achou]] = k
+            ativo = ativo[~achou]
+            if len(ativo) == 0:
+                break
+        distancias.append(distancia)
+        extremos.append(extremo)
+
+    # Deslocamento pela extremidade mais próxima, se a variação lá tiver o
+    # sinal esperado (a borda de fato termina daquele lado)
+    mais_perto1 = distancias[0] < distancias[1]
+    distancia = np.minimum(distancias[0], distancias[1])
+    extremo = np.where(mais_perto1, extremos[0], extremos[1])
+    deslocamento = 0.5 - distancia / (distancias[0] + distancias[1]).astype(np.float32)
+    correto = (extremo < 0) != (m < media_local)
+    deslocamento = np.maximum(np.where(correto, deslocamento, 0), sub)
+
+    # Mistura com o vizinho do lado escolhido (amostragem bilinear deslocada)
+    lin_viz = np.clip(ys + np.where(horizontal, passo, 0), 0, altura - 1)
+    col_viz = np.clip(xs + np.where(horizontal, 0, passo), 0, largura - 1)
+    origem = img[ys, xs].astype(np.float32)
+    vizinho = img[lin_viz, col_viz].astype(np.float32)
+    if img.ndim == 2:
+        origem, vizinho = origem[:, None], vizinho[:, None]
+    misturado = origem + deslocamento[:, None] * (vizinho - origem)
+    resultado = img.copy()
+    resultado[ys, xs] = _para_tipo(misturado, img.dtype).reshape(resultado[ys, xs].shape)
+    return resultado
+
+
+def area_mlaa(x, inicio, fim, altura_inicio, altura_fim):
+    """
+    Área entre a linha reconstruída e um segmento de borda, por pixel
+
+    O segmento ocupa as colunas [inicio, fim]. Cada metade é um padrão L:
+    a linha vai do meio da aresta cruzada numa extremidade (altura ±0.5,
+    ou 0 sem aresta) até o meio do segmento (altura 0).
+
+    Args:
+        x: Coluna do pixel (arrays de mesma forma nos demais argumentos)
+        inicio, fim: Colunas extremas do segmento
+        altura_inicio, altura_fim: +0.5 (aresta cruzada acima), -0.5
+            (abaixo) ou 0 em cada extremidade
+
+    Returns:
+        (acima, abaixo): área da linha acima da borda (o pixel de cima
+        recebe a cor do de baixo) e abaixo dela (o inverso)
+    """
+    x = x.astype(np.float32)
+    inicio = inicio.astype(np.float32)
+    metade = (fim.astype(np.float32) + 1 - inicio) / 2
+    meio = inicio + metade
+    acima = np.zeros_like(x)
+    abaixo = np.zeros_like(x)
+    # Metade esquerda: altura_inicio -> 0; metade direita: 0 -> altura_fim
+    for a, b, altura, crescente in ((inicio, meio, altura_inicio, False),
+                                    (meio, inicio + 2 * metade, altura_fim, True)):
+        esquerda = np.maximum(x, a)
+        direita = np.minimum(x + 1, b)
+        largura = np.maximum(direita - esquerda, 0)
+        fracao = ((esquerda + direita) / 2 - a) / metade
+        area = altura * largura * (fracao if crescente else 1 - fracao)
+        acima += np.maximum(area, 0)
+        abaixo += np.maximum(-area, 0)
+    return acima, abaixo
+
+
+def _alturas_extremidades(ys, xs, inicio, fim, verticais, distancia_maxima):
+    """
+    Altura da linha reconstruída em cada extremidade de segmentos de borda
+    horizontal, pelas arestas cruzadas na linha de cima (y-1) ou na de
+    baixo (y)
+
+    Args:
+        ys, xs: Posições das bordas (entre (y-1, x) e (y, x))
+        inicio, fim: Colunas extremas do segmento de cada borda
+        verticais: bool HxW, borda entre (y, x-1) e (y, x)
+        distancia_maxima: Extremidades mais distantes que isto são ignoradas
+
+    Returns:
+        (altura_inicio, altura_fim) com valores +0.5, -0.5 ou 0
+    """
+    largura = verticais.shape[1]
+
+    def altura_na(coluna, valida):
+        coluna = np.clip(coluna, 0, largura - 1)
+        cima = valida & verticais[ys - 1, coluna]
+        baixo = valida & verticais[ys, coluna]
+        return np.where(cima & ~baixo, 0.5, np.where(baixo & ~cima, -0.5, 0.0))
+
+    return (altura_na(inicio, (inicio > 0) & (xs - inicio < distancia_maxima)),
+            altura_na(fim + 1, (fim + 1 < largura) & (fim - xs < distancia_maxima)))
+
+
+def _pesos_horizontais(horizontais, verticais, distancia_maxima):
+    """
+    Pesos de mistura vertical produzidos pelas bordas horizontais
+
+    Args:
+        horizontais: bool HxW, borda entre (y-1, x) e (y, x)
+        verticais: bool HxW, borda entre (y, x-1) e (y, x)
+        distancia_maxima: Extremidades mais distantes que isto são ignoradas
+
+    Returns:
+        (para_baixo, para_cima): quanto cada pixel recebe do vizinho de
+        baixo e do de cima
+    """
+    altura, largura = horizontais.shape
+    colunas = np.arange(largura)
+    # Início e fim do segmento de cada posição (acumulados por linha)
+    inicio = np.maximum.accumulate(np.where(horizontais, -1, colunas), axis=1) + 1
+    fim = np.minimum.accumulate(np.where(horizontais, largura, colunas)[:, ::-1],
+                                axis=1)[:, ::-1] - 1
+
+    ys, xs = np.nonzero(horizontais)
+    x0, x1 = inicio[ys, xs], fim[ys, xs]
+    acima, abaixo = area_mlaa(xs, x0, x1, *_alturas_extremidades(
+        ys, xs, x0, x1, verticais, distancia_maxima))
+
+    para_baixo = np.zeros((altura, largura), dtype=np.float32)
+    para_cima = np.zeros((altura, largura), dtype=np.float32)
+    para_baixo[ys - 1, xs] = acima
+    para_cima[ys, xs] = abaixo
+    return para_baixo, para_cima
+
+
+def smaa(img, ordem='RGB', limiar=0.1, adaptacao_contraste=2.0, distancia_maxima=16):
+    """
+    Anti-aliasing morfológico por subpixel (SMAA), versão simplificada
+
+    Args:
+        img: Imagem HxW ou HxWxC
+        ordem: Ordem dos canais, para a luminância
+        limiar: Diferença mínima de luminância (0 a 1) para haver borda
+        adaptacao_contraste: Descarta bordas menores que o maior contraste
+            da vizinhança 3x3 dividido por este fator
+        distancia_maxima: Alcance da busca das extremidades, em pixels
+
+    Returns:
+        Imagem filtrada, do mesmo tipo e forma da entrada
+    """
+    img = np.asarray(img)
+    luma = luminancia(img, ordem)
+    delta_esq = np.zeros_like(luma)
+    delta_cima = np.zeros_like(luma)
+    delta_esq[:, 1:] = np.abs(luma[:, 1:] - luma[:, :-1])
+    delta_cima[1:] = np.abs(luma[1:] - luma[:-1])
+
+    # Adaptação ao contraste local: uma borda fraca ao lado de uma forte é
+    # tratada como parte da forte
+    maximo_local = cv2.dilate(np.maximum(delta_esq, delta_cima), np.ones((3, 3), np.uint8))
+    verticais = (delta_esq >= limiar) & (adaptacao_contraste * delta_esq >= maximo_local)
+    horizontais = (delta_cima >= limiar) & (adaptacao_contraste * delta_cima >= maximo_local)
+    if not (verticais.any() or horizontais.any()):
+        return img.copy()
+
+    para_baixo, para_cima = _pesos_horizontais(horizontais, verticais, distancia_maxima)
+    para_direita, para_esquerda = (p.T for p in _pesos_horizontais(
+        np.ascontiguousarray(verticais.T), np.ascontiguousarray(horizontais.T),
+        distancia_maxima))
+
+    # Mistura com os quatro vizinhos, só nos pixels com algum peso; pesos
+    # somando mais de 1 são normalizados
+    altura, largura = luma.shape
+    total = para_baixo + para_cima + para_direita + para_esquerda
+    ys, xs = np.nonzero(total)
+    escala = 1 / np.maximum(total[ys, xs], 1)
+    origem = img[ys, xs].astype(np.float32)
+    if img.ndim == 2:
+        origem = origem[:, None]
+    misturado = origem * (1 - total[ys, xs] * escala)[:, None]
+    for peso, lin, col in ((para_cima, np.maximum(ys - 1, 0), xs),
+                           (para_baixo, np.minimum(ys + 1, altura - 1), xs),
+                           (para_esquerda, ys, np.maximum(xs - 1, 0)),
+                           (para_direita, ys, np.minimum(xs + 1, largura - 1))):
+        vizinho = img[lin, col].astype(np.float32)
+        if img.ndim == 2:
+            vizinho = vizinho[:, None]
+        misturado += (peso[ys, xs] * escala)[:, None] * vizinho
+    resultado = img.copy()
+    resultado[ys, xs] = _para_tipo(misturado, img.dtype).reshape(resultado[ys, xs].shape)
+    return resultado
+
+
+def _segmentos_esparsos(ys, xs):
+    """
+    Colunas extremas do segmento de cada borda, a partir da lista de bordas
+    em ordem de linhas (um segmento termina onde a coluna salta ou a linha
+    muda)
+
+    Returns:
+        (inicio, fim) para cada borda
+    """
+    novo = np.ones(len(xs), dtype=bool)
+    novo[1:] = (ys[1:] != ys[:-1]) | (xs[1:] != xs[:-1] + 1)
+    segmento = np.cumsum(novo) - 1
+    primeiros = np.flatnonzero(novo)
+    ultimos = np.append(primeiros[1:], len(xs)) - 1
+    return xs[primeiros][segmento], xs[ultimos][segmento]
+
+
+def mlaa(img, limiar=0.1, distancia_maxima=32):
+    """
+    Anti-aliasing morfológico (MLAA) em cores, sobre a lista esparsa de bordas
+
+    As descontinuidades são detectadas pela maior diferença entre os canais
+    de pixels vizinhos; daí em diante só os pixels de borda são visitados:
+    os segmentos saem dos saltos na lista ordenada de bordas, a forma (L, Z
+    ou U) das arestas cruzadas em cada extremidade e a mistura pela área
+    coberta, acumulada por pixel de destino. Cada pixel de borda é misturado
+    com a cor do vizinho do outro lado, o que preserva as cores. Além da
+    detecção (algumas operações vetorizadas sobre a imagem), o custo
+    acompanha o número de pixels de borda.
+
+    Args:
+        img: Imagem HxW ou HxWxC
+        limiar: Diferença mínima (0 a 1 da faixa do tipo) em algum canal
+        distancia_maxima: Alcance da busca das extremidades, em pixels
+
+    Returns:
+        Imagem filtrada, do mesmo tipo e forma da entrada
+    """
+    img = np.asarray(img)
+    altura, largura = img.shape[:2]
+    if np.issubdtype(img.dtype, np.integer):
+        limiar = limiar * np.iinfo(img.dtype).max
+
+    # Detecção: diferença máxima entre canais com o vizinho de cima/esquerda
+    def descontinuidade(a, b):
+        diferenca = cv2.absdiff(a, b)
+        if diferenca.ndim == 3:
+            # Máximo entre canais elemento a elemento (reduzir no eixo 2 é lento)
+            diferenca = np.maximum.reduce([diferenca[:, :, c] for c in range(diferenca.shape[2])])
+        return diferenca >= limiar
+
+    horizontais = np.zeros((altura, largura), dtype=bool)
+    verticais = np.zeros((altura, largura), dtype=bool)
+    horizontais[1:] = descontinuidade(img[1:], img[:-1])
+    verticais[:, 1:] = descontinuidade(img[:, 1:], img[:, :-1])
+
+    # Bordas horizontais (ordem de linhas) e verticais (ordem de colunas)
+    ys, xs = np.nonzero(horizontais)
+    vy, vx = np.nonzero(verticais)
+    ordem = np.lexsort((vy, vx))
+    vy, vx = vy[ordem], vx[ordem]
+    if len(ys) == 0 and len(vy) == 0:
+        return img.copy()
+
+    # Áreas por borda; a vertical é tratada como horizontal na transposta
+    x0, x1 = _segmentos_esparsos(ys, xs)
+    acima, abaixo = area_mlaa(xs, x0, x1, *_alturas_extremidades(
+        ys, xs, x0, x1, verticais, distancia_maxima))
+    y0, y1 = _segmentos_esparsos(vx, vy)
+    esquerda, direita = area_mlaa(vy, y0, y1, *_alturas_extremidades(
+        vx, vy, y0, y1, horizontais.T, distancia_maxima))
+
+    # Destino, origem e peso de cada mistura (índices lineares dos pixels)
+    indice_h = ys * largura + xs
+    indice_v = vy * largura + vx
+    destinos = np.concatenate([indice_h - largura, indice_h, indice_v - 1, indice_v])
+    origens = np.concatenate([indice_h, indice_h - largura, indice_v, indice_v - 1])
+    pesos = np.concatenate([acima, abaixo, esquerda, direita])
+    usados = pesos > 0
+    destinos, origens, pesos = destinos[usados], origens[usados], pesos[usados]
+    if len(pesos) == 0:
+        return img.copy()
+
+    # Acúmulo por pixel de destino; pesos somando mais de 1 são normalizados
+    pixels, posicao = np.unique(destinos, return_inverse=True)
+    total = np.bincount(posicao, pesos)
+    escala = 1 / np.maximum(total, 1)
+    plano = img.reshape(altura * largura, -1)
+    misturado = plano[pixels].astype(np.float64) * (1 - total * escala)[:, None]
+    pesos = pesos * escala[posicao]
+    for c in range(plano.shape[1]):
+        misturado[:, c] += np.bincount(posicao, pesos * plano[origens, c], len(pixels))
+
+    resultado = img.copy()
+    resultado.reshape(altura * largura, -1)[pixels] = _para_tipo(misturado, img.dtype)
+    return resultado
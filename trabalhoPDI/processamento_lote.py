@@ -0,0 +1,173 @@
+"""
+Aplicação dos filtros a lotes de imagens do mesmo tamanho
+
+Para lotes de miniaturas o custo dominante deixa de ser o filtro e passa a
+ser a chamada: cada aplicar_* atravessa perfil, cache e o despacho do
+OpenCV para uma imagem de poucos kilobytes. Aqui o lote NxHxW[xC] é
+processado com uma chamada por bloco de imagens.
+
+Nos filtros separáveis baratos (gaussiano e SSAA) cada imagem recebe,
+acima e abaixo, um halo com a largura do raio do filtro preenchido no
+mesmo modo de borda (reflexão ou replicação) e o bloco é empilhado numa
+única imagem alta. Cada linha interior só enxerga o próprio halo, e as
+colunas continuam com as bordas reais, então o resultado é idêntico bit a
+bit ao de filtrar as imagens uma a uma. Isso só compensa em miniaturas
+(várias por bloco de BYTES_BLOCO); nos demais casos, e quando o halo não
+reproduz a borda (suporte infinito, aproximações globais), as imagens são
+filtradas individualmente. Nos dois modos os blocos são distribuídos num
+pool de threads (o OpenCV libera o GIL) e gravados direto no array de
+saída, contíguo.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from processamento_tiles import halo_do_filtro
+
+
+# Tamanho do bloco empilhado: perto da cache L2, com várias imagens por
+# chamada (ver benchmarks/bench_lote.py)
+BYTES_BLOCO = 256 * 1024
+
+# Filtros separáveis de custo baixo por pixel, em que a chamada domina; no
+# bilateral e na mediana o custo por pixel domina e as linhas de halo só
+# acrescentam trabalho
+FILTROS_EMPILHAVEIS = ('gaussian', 'ssaa')
+
+
+def empilhar(imagens):
+    """
+    Converte uma lista de imagens do mesmo tamanho (ou um array NxHxW[xC])
+    num único array contíguo
+
+    Args:
+        imagens: Array NxHxW[xC] ou sequência de arrays HxW[xC]
+
+    Returns:
+        Array contíguo NxHxW[xC]
+    """
+    if isinstance(imagens, np.ndarray):
+        if imagens.ndim not in (3, 4):
+            raise ValueError(f"O lote deve ter forma NxHxW ou NxHxWxC, não {imagens.shape}")
+        return np.ascontiguousarray(imagens)
+    imagens = list(imagens)
+    if not imagens:
+        raise ValueError("Lote vazio")
+    forma, tipo = imagens[0].shape, imagens[0].dtype
+    for i, img in enumerate(imagens):
+        if img.shape != forma or img.dtype != tipo:
+            raise ValueError(f"Imagem {i} com forma {img.shape} ({img.dtype}); "
+                             f"o lote exige {forma} ({tipo})")
+    return np.stack(imagens)
+
+
+def borda_do_filtro(filtro, **params):
+    """
+    Modo de borda (nomenclatura do np.pad) usado pelo filtro, ou None se o
+    resultado com halo não for idêntico ao da imagem isolada
+
+    Args:
+        filtro: 'gaussian', 'bilateral', 'median' ou 'ssaa'
+        **params: Parâmetros do método aplicar_* correspondente
+
+    Returns:
+        'reflect' (BORDER_REFLECT_101), 'edge' (BORDER_REPLICATE) ou None
+    """
+    if filtro == 'gaussian':
+        # Com sigma o modo IIR tem suporte infinito
+        return 'reflect' if params.get('sigma') is None else None
+    if filtro == 'bilateral':
+        # Idêntico a menos de ±1 em pixels raros (arredondamento em ponto
+        # flutuante do OpenCV, que depende da posição na memória)
+        return 'reflect' if params.get('modo', 'exato') == 'exato' else None
+    if filtro == 'median':
+        return 'edge'
+    if filtro == 'ssaa':
+        return 'edge' if params.get('metodo', 'fundido') == 'fundido' else None
+    return None
+
+
+def _filtrar_empilhado(funcao, bloco, halo, borda, saida):
+    """Filtra o bloco NxHxW[xC] numa única chamada, empilhando com halo"""
+    n, altura = bloco.shape[:2]
+    preenchimento = ((0, 0), (halo, halo)) + ((0, 0),) * (bloco.ndim - 2)
+    alto = np.pad(bloco, preenchimento, mode=borda)
+    passo = altura + 2 * halo
+    filtrado = funcao(alto.reshape((n * passo,) + bloco.shape[2:]))
+    saida[:] = filtrado.reshape(alto.shape)[:, halo:halo + altura]
+
+
+def _filtrar_individual(funcao, bloco, saida):
+    for i in range(len(bloco)):
+        saida[i] = funcao(bloco[i])
+
+
+def processar_lote(lote, funcao, halo=0, borda=None, workers=None, tamanho_bloco=None):
+    """
+    Aplica `funcao` a cada imagem do lote
+
+    Args:
+        lote: Array contíguo NxHxW[xC]
+        funcao: Função array -> array que preserva o tamanho da imagem
+        halo: Raio do suporte do filtro, em pixels
+        borda: Modo de borda do filtro (ver borda_do_filtro); None filtra
+               as imagens uma a uma
+        workers: Threads (padrão: número de CPUs)
+        tamanho_bloco: Imagens por chamada no modo empilhado (padrão:
+                       as que cabem em BYTES_BLOCO)
+
+    Returns:
+        Array NxHxW[xC] com os resultados
+    """
+    saida = np.empty_like(lote)
+    n = len(lote)
+    if n == 0:
+        return saida
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if tamanho_bloco is None:
+        tamanho_bloco = max(1, BYTES_BLOCO // max(1, lote[0].nbytes))
+    if borda is None:
+        # Um bloco por thread; a chamada por imagem é inevitável
+        tamanho_bloco = max(1, -(-n // workers))
+    inicios = range(0, n, tamanho_bloco)
+
+    def tarefa(inicio):
+        fim = min(inicio + tamanho_bloco, n)
+        if borda is None:
+            _filtrar_individual(funcao, lote[inicio:fim], saida[inicio:fim])
+        else:
+            _filtrar_empilhado(funcao, lote[inicio:fim], halo, borda, saida[inicio:fim])
+
+    if workers <= 1 or len(inicios) == 1:
+        for inicio in inicios:
+            tarefa(inicio)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(tarefa, inicios))
+    return saida
+
+
+def processar_lote_filtro(demo, filtro, imagens, workers=None, **params):
+    """
+    Aplica um dos filtros de AntiAliasingDemo (sem cache nem perfil por
+    imagem) a um lote de imagens do mesmo tamanho
+
+    Args:
+        demo: Instância de AntiAliasingDemo
+        filtro: 'gaussian', 'bilateral', 'median' ou 'ssaa'
+        imagens: Array NxHxW[xC] ou sequência de arrays HxW[xC]
+        workers: Threads (padrão: número de CPUs)
+        **params: Parâmetros do filtro
+
+    Returns:
+        Array contíguo NxHxW[xC] com os resultados
+    """
+    funcao = demo.filtro_sem_cache(filtro, **params)
+    lote = empilhar(imagens)
+    borda = borda_do_filtro(filtro, **params)
+    if filtro not in FILTROS_EMPILHAVEIS or 4 * lote[0].nbytes > BYTES_BLOCO:
+        borda = None
+    return processar_lote(lote, funcao, halo_do_filtro(filtro, **params), borda, workers)
@@ -0,0 +1,234 @@
+"""
+Execução em tiles com halo para imagens maiores que a memória
+
+Lê blocos (tiles) de um arquivo mapeado em memória (.npy ou bruto), aplica
+o filtro em cada tile acrescido de uma borda (halo) com a largura do raio
+do filtro e grava apenas o interior no arquivo de saída, também mapeado em
+memória. Como o halo cobre todo o suporte do filtro e as bordas reais da
+imagem continuam sendo bordas do tile, o resultado é idêntico bit a bit ao
+processamento da imagem inteira, e a memória de pico depende apenas do
+tamanho do tile.
+"""
+
+import math
+
+import numpy as np
+
+from bilateral_rapido import sigma_espacial_efetivo
+
+
+# Nome curto do filtro -> método correspondente em AntiAliasingDemo
+FILTROS = {
+    'gaussian': 'aplicar_gaussian_blur',
+    'bilateral': 'aplicar_bilateral_filter',
+    'median': 'aplicar_median_blur',
+    'ssaa': 'aplicar_supersampling',
+}
+
+
+def halo_do_filtro(filtro, **params):
+    """
+    Calcula o raio (em pixels da imagem de entrada) que o filtro lê além
+    de cada pixel de saída
+
+    Args:
+        filtro: 'gaussian', 'bilateral', 'median' ou 'ssaa'
+        **params: Parâmetros do método aplicar_* correspondente
+
+    Returns:
+        Largura do halo em pixels
+    """
+    if filtro == 'gaussian':
+        sigma = params.get('sigma')
+        if sigma is not None:
+            # Cobre o kernel FIR derivado de sigma (3 a 4 sigmas); no modo
+            # IIR o suporte é infinito e o resultado em tiles é aproximado
+            return int(math.ceil(4 * sigma))
+        return params.get('kernel_size', 5) // 2
+    if filtro == 'median':
+        return params.get('kernel_size', 5) // 2
+    if filtro == 'bilateral':
+        d = params.get('d', 9)
+        if d <= 0:
+            # Mesma regra do OpenCV quando o diâmetro é derivado de sigma_space
+            raio = int(round(params.get('sigma_space', 75) * 1.5))
+        else:
+            raio = d // 2
+        if params.get('modo', 'exato') == 'grade':
+            # Suporte gaussiano da grade (~3 desvios) mais uma célula; em
+            # tiles o resultado é aproximado, não idêntico
+            sigma = sigma_espacial_efetivo(d, params.get('sigma_space', 75))
+            precisao = params.get('precisao', 1.0)
+            return max(raio, int(math.ceil(3 * sigma + max(1.0, sigma / precisao))))
+        return raio
+    if filtro == 'ssaa':
+        # Kernel cúbico (4 taps) na ampliação; a redução INTER_AREA com fator
+        # inteiro só combina amostras do próprio pixel de saída. O método
+        # fundido é o kernel equivalente de 5 taps, com o mesmo raio
+        return 2
+    raise ValueError(f"Filtro desconhecido: {filtro}")
+
+
+def abrir_entrada(caminho, shape=None, dtype=np.uint8):
+    """
+    Abre a imagem de entrada mapeada em memória, somente leitura
+
+    Args:
+        caminho: Arquivo .npy ou bruto (raw)
+        shape: Forma (H, W[, C]) - obrigatória para arquivos brutos
+        dtype: Tipo dos pixels para arquivos brutos
+
+    Returns:
+        np.memmap (ou array mapeado via np.load)
+    """
+    if str(caminho).endswith('.npy'):
+        return np.load(caminho, mmap_mode='r')
+    if shape is None:
+        raise ValueError("Arquivos brutos exigem o parâmetro shape")
+    return np.memmap(caminho, dtype=dtype, mode='r', shape=tuple(shape))
+
+
+def criar_saida(caminho, shape, dtype=np.uint8):
+    """
+    Cria o arquivo de saída mapeado em memória (.npy ou bruto)
+    """
+    if str(caminho).endswith('.npy'):
+        return np.lib.format.open_memmap(caminho, mode='w+', dtype=dtype, shape=tuple(shape))
+    return np.memmap(caminho, dtype=dtype, mode='w+', shape=tuple(shape))
+
+
+def iterar_tiles(altura, largura, tamanho_tile):
+    """
+    Gera as regiões de saída (y0, y1, x0, x1) em ordem de linhas, que
+    acompanha o layout do arquivo e favorece leitura sequencial
+    """
+    for y0 in range(0, altura, tamanho_tile):
+        for x0 in range(0, largura, tamanho_tile):
+            yield y0, min(y0 + tamanho_tile, altura), x0, min(x0 + tamanho_tile, largura)
+
+
+def processar_em_tiles(entrada, saida, funcao, halo, tamanho_tile=1024):
+    """
+    Aplica `funcao` em tiles com halo, de um array (mapeado) para outro
+
+    Args:
+        entrada: Array HxW[xC] de entrada (tipicamente np.memmap)
+        saida: Array de mesma forma para o resultado (tipicamente np.memmap)
+        funcao: Função array -> array que preserva o tamanho da imagem
+        halo: Raio do suporte do filtro, em pixels
+        tamanho_tile: Lado do tile de saída, em pixels
+
+    Returns:
+        O array de saída
+    """
+    if tamanho_tile <= 0:
+        raise ValueError("tamanho_tile deve ser positivo")
+    if saida.shape != entrada.shape:
+        raise ValueError(f"Formas incompatíveis: {entrada.shape} e {saida.shape}")
+
+    altura, largura = entrada.shape[:2]
+    for y0, y1, x0, x1 in iterar_tiles(altura, largura, tamanho_tile):
+        # Região lida = tile + halo, limitada às bordas reais da imagem
+        ly0, ly1 = max(0, y0 - halo), min(altura, y1 + halo)
+        lx0, lx1 = max(0, x0 - halo), min(largura, x1 + halo)
+        bloco = np.ascontiguousarray(entrada[ly0:ly1, lx0:lx1])
+
+        resultado = funcao(bloco)
+        saida[y0:y1, x0:x1] = resultado[y0 - ly0:y1 - ly0, x0 - lx0:x1 - lx0]
+        del bloco, resultado
+
+    if isinstance(saida, np.memmap):
+        saida.flush()
+    return saida
+
+
+def regioes_ativas(mascara, tamanho_tile=64):
+    """
+    Agrupa os tiles que contêm algum pixel ativo em faixas horizontais
+    contíguas (uma região por sequência de tiles ativos na mesma linha)
+
+    Args:
+        mascara: bool HxW com os pixels ativos
+        tamanho_tile: Lado do tile, em pixels
+
+    Returns:
+        Lista de regiões (y0, y1, x0, x1)
+    """
+    altura, largura = mascara.shape
+    linhas_grade = math.ceil(altura / tamanho_tile)
+    colunas_grade = math.ceil(largura / tamanho_tile)
+    completa = np.zeros((linhas_grade * tamanho_tile, colunas_grade * tamanho_tile), dtype=bool)
+    completa[:altura, :largura] = mascara
+    ativos = completa.reshape(linhas_grade, tamanho_tile, colunas_grade,
+                              tamanho_tile).any(axis=(1, 3))
+
+    regioes = []
+    for i, linha in enumerate(ativos):
+        colunas = np.flatnonzero(linha)
+        if len(colunas) == 0:
+            continue
+        quebras = np.flatnonzero(np.diff(colunas) > 1)
+        inicios = np.concatenate([colunas[:1], colunas[quebras + 1]])
+        fins = np.concatenate([colunas[quebras], colunas[-1:]])
+        y0, y1 = i * tamanho_tile, min((i + 1) * tamanho_tile, altura)
+        for a, b in zip(inicios, fins):
+            regioes.append((y0, y1, a * tamanho_tile, min((b + 1) * tamanho_tile, largura)))
+    return regioes
+
+
+def processar_regioes_ativas(img, funcao, mascara, halo, tamanho_tile=64):
+    """
+    Aplica `funcao` só nas regiões com pixels ativos (com halo, como em
+    processar_em_tiles) e compõe o resultado: os pixels ativos recebem o
+    valor filtrado, idêntico ao do filtro na imagem inteira, e os demais
+    mantêm o original
+
+    Args:
+        img: Array HxW[xC]
+        funcao: Função array -> array que preserva o tamanho da imagem
+        mascara: bool HxW com os pixels a filtrar
+        halo: Raio do suporte do filtro, em pixels
+        tamanho_tile: Lado do tile usado para agrupar a máscara
+
+    Returns:
+        Novo array com o resultado composto
+    """
+    altura, largura = img.shape[:2]
+    resultado = img.copy()
+    for y0, y1, x0, x1 in regioes_ativas(mascara, tamanho_tile):
+        ly0, ly1 = max(0, y0 - halo), min(altura, y1 + halo)
+        lx0, lx1 = max(0, x0 - halo), min(largura, x1 + halo)
+        filtrado = funcao(np.ascontiguousarray(img[ly0:ly1, lx0:lx1]))
+        interior = filtrado[y0 - ly0:y1 - ly0, x0 - lx0:x1 - lx0]
+        ativos = mascara[y0:y1, x0:x1]
+        if img.ndim == 3:
+            ativos = ativos[:, :, None]
+        np.copyto(resultado[y0:y1, x0:x1], interior, where=ativos)
+    return resultado
+
+
+def processar_arquivo_em_tiles(demo, filtro, caminho_entrada, caminho_saida,
+                               tamanho_tile=1024, shape=None, dtype=np.uint8, **params):
+    """
+    Aplica um dos filtros aplicar_* de AntiAliasingDemo em um arquivo
+    mapeado em memória, gravando o resultado em outro arquivo mapeado
+
+    Args:
+        demo: Instância de AntiAliasingDemo
+        filtro: 'gaussian', 'bilateral', 'median' ou 'ssaa'
+        caminho_entrada: Arquivo .npy ou bruto de entrada
+        caminho_saida: Arquivo .npy ou bruto de saída
+        tamanho_tile: Lado do tile de saída, em pixels
+        shape: Forma da imagem (obrigatória para arquivos brutos)
+        dtype: Tipo dos pixels para arquivos brutos
+        **params: Parâmetros repassados ao método aplicar_*
+
+    Returns:
+        np.memmap com o resultado
+    """
+    # Método original, sem cache nem perfil: cada tile não deve virar uma
+    # entrada do cache nem um evento do perfilador
+    funcao = demo.filtro_sem_cache(filtro, **params)
+    entrada = abrir_entrada(caminho_entrada, shape, dtype)
+    saida = criar_saida(caminho_saida, entrada.shape, entrada.dtype)
+    return processar_em_tiles(entrada, saida, funcao, halo_do_filtro(filtro, **params), tamanho_tile)
@@ -0,0 +1,351 @@
+"""
+Renderização de figuras sem o estado global do pyplot
+
+Cada figura é montada com a API orientada a objetos do matplotlib
+(Figure + FigureCanvasAgg), sem pyplot, de modo que várias figuras possam
+ser geradas ao mesmo tempo em processos diferentes. As funções figura_*
+recebem apenas os arrays já calculados (dicionários retornados pelas etapas
+do AntiAliasingDemo), são serializáveis e aceitam DPI e formato por saída.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from histogramas import bordas_dos_bins, desenhar_histograma
+
+
+def criar_figura(figsize):
+    """
+    Cria uma figura ligada a um canvas Agg, sem registrá-la no pyplot
+
+    O matplotlib só é importado aqui, para que o modo sem figuras não pague
+    o custo de importação.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def salvar_figura(fig, caminho_base, dpi=300, formato='png'):
+    """
+    Salva a figura em `caminho_base.formato`
+
+    Returns:
+        Caminho do arquivo gerado
+    """
+    caminho = f"{caminho_base}.{formato}"
+    fig.savefig(caminho, dpi=dpi, format=formato, bbox_inches='tight')
+    return caminho
+
+
+def figura_decomposicao(dados, nome_imagem, caminho_base, dpi=300, formato='png'):
+    """
+    Figura da decomposição RGB a partir dos dados já calculados
+    
+    Args:
+        dados: Dicionário com 'original', 'r', 'g' e 'b'
+        nome_imagem: Nome da imagem (título)
+        caminho_base: Caminho de saída sem extensão
+        dpi: Resolução da figura
+        formato: Formato do arquivo (png, jpg, svg, pdf...)
+    """
+    img_rgb, r, g, b = dados['original'], dados['r'], dados['g'], dados['b']
+    
+    # Criar visualização dos canais
+    fig = criar_figura(figsize=(16, 8))
+    axes = fig.subplots(2, 4)
+    fig.suptitle(f'Decomposição RGB - {nome_imagem}', fontsize=16, fontweight='bold')
+    
+    # Imagem original
+    axes[0, 0].imshow(img_rgb)
+    axes[0, 0].set_title('Imagem Original')
+    axes[0, 0].axis('off')
+    
+    # Canal Vermelho
+    img_r = np.zeros_like(img_rgb)
+    img_r[:,:,0] = r
+    axes[0, 1].imshow(img_r)
+    axes[0, 1].set_title('Canal Vermelho (R)')
+    axes[0, 1].axis('off')
+    
+    # Canal Verde
+    img_g = np.zeros_like(img_rgb)
+    img_g[:,:,1] = g
+    axes[0, 2].imshow(img_g)
+    axes[0, 2].set_title('Canal Verde (G)')
+    axes[0, 2].axis('off')
+    
+    # Canal Azul
+    img_b = np.zeros_like(img_rgb)
+    img_b[:,:,2] = b
+    axes[0, 3].imshow(img_b)
+    axes[0, 3].set_title('Canal Azul (B)')
+    axes[0, 3].axis('off')
+    
+    # Canais em escala de cinza
+    axes[1, 1].imshow(r, cmap='Reds')
+    axes[1, 1].set_title('Canal R (Intensidade)')
+    axes[1, 1].axis('off')
+    
+    axes[1, 2].imshow(g, cmap='Greens')
+    axes[1, 2].set_title('Canal G (Intensidade)')
+    axes[1, 2].axis('off')
+    
+    axes[1, 3].imshow(b, cmap='Blues')
+    axes[1, 3].set_title('Canal B (Intensidade)')
+    axes[1, 3].axis('off')
+    
+    # Remover subplot não utilizado
+    fig.delaxes(axes[1, 0])
+    
+    fig.tight_layout()
+    salvar_figura(fig, caminho_base, dpi, formato)
+
+
+def figura_histogramas(dados, nome_imagem, caminho_base, dpi=300, formato='png'):
+    """
+    Figura dos histogramas RGB
+    
+    Args:
+        dados: Dicionário com 'contagens' (array 3x256 de gerar_histogramas)
+        nome_imagem: Nome da imagem (título)
+        caminho_base: Caminho de saída sem extensão
+        dpi: Resolução da figura
+        formato: Formato do arquivo (png, jpg, svg, pdf...)
+    """
+    r, g, b = dados['contagens']
+    bordas = bordas_dos_bins(dados['contagens'])
+    
+    fig = criar_figura(figsize=(14, 10))
+    axes = fig.subplots(2, 2)
+    fig.suptitle(f'Histogramas RGB - {nome_imagem}', fontsize=16, fontweight='bold')
+    
+    # Histograma combinado
+    desenhar_histograma(axes[0, 0], r, bordas, color='red', alpha=0.5, label='Red')
+    desenhar_histograma(axes[0, 0], g, bordas, color='green', alpha=0.5, label='Green')
+    desenhar_histograma(axes[0, 0], b, bordas, color='blue', alpha=0.5, label='Blue')
+    axes[0, 0].set_title('Histograma Combinado')
+    axes[0, 0].set_xlabel('Intensidade de Pixel')
+    axes[0, 0].set_ylabel('Frequência')
+    axes[0, 0].legend()
+    axes[0, 0].grid(True, alpha=0.3)
+    
+    # Histograma Canal Vermelho
+    desenhar_histograma(axes[0, 1], r, bordas, color='red', alpha=0.7)
+    axes[0, 1].set_title('Histograma Canal Vermelho')
+    axes[0, 1].set_xlabel('Intensidade')
+    axes[0, 1].set_ylabel('Frequência')
+    axes[0, 1].grid(True, alpha=0.3)
+    
+    # Histograma Canal Verde
+    desenhar_histograma(axes[1, 0], g, bordas, color='green', alpha=0.7)
+    axes[1, 0].set_title('Histograma Canal Verde')
+    axes[1, 0].set_xlabel('Intensidade')
+    axes[1, 0].set_ylabel('Frequência')
+    axes[1, 0].grid(True, alpha=0.3)
+    
+    # Histograma Canal Azul
+    desenhar_histograma(axes[1, 1], b, bordas, color='blue', alpha=0.7)
+    axes[1, 1].set_title('Histograma Canal Azul')
+    axes[1, 1].set_xlabel('Intensidade')
+    axes[1, 1].set_ylabel('Frequência')
+    axes[1, 1].grid(True, alpha=0.3)
+    
+    fig.tight_layout()
+    salvar_figura(fig, caminho_base, dpi, formato)
+
+
+def figura_comparacao(dados, nome_imagem, caminho_base, dpi=300, formato='png'):
+    """
+    Figura comparativa das técnicas de anti-aliasing
+    
+    Args:
+        dados: Dicionário com 'original', 'gaussian', 'bilateral',
+               'median', 'ssaa', 'fxaa', 'smaa' e 'diferenca_ssaa' (RGB)
+        nome_imagem: Nome da imagem (título)
+        caminho_base: Caminho de saída sem extensão
+        dpi: Resolução da figura
+        formato: Formato do arquivo (png, jpg, svg, pdf...)
+    """
+    # Criar visualização comparativa
+    fig = criar_figura(figsize=(24, 12))
+    axes = fig.subplots(2, 4)
+    fig.suptitle(f'Comparação de Técnicas de Antiserrilhamento - {nome_imagem}', 
+                 fontsize=16, fontweight='bold')
+    
+    # Imagem original
+    axes[0, 0].imshow(dados['original'])
+    axes[0, 0].set_title('Original')
+    axes[0, 0].axis('off')
+    
+    # Gaussian Blur
+    axes[0, 1].imshow(dados['gaussian'])
+    axes[0, 1].set_title('Filtro Gaussiano\n(Suavização básica)')
+    axes[0, 1].axis('off')
+    
+    # Bilateral Filter
+    axes[0, 2].imshow(dados['bilateral'])
+    axes[0, 2].set_title('Filtro Bilateral\n(Preserva bordas)')
+    axes[0, 2].axis('off')
+    
+    # Median Blur
+    axes[0, 3].imshow(dados['median'])
+    axes[0, 3].set_title('Filtro de Mediana\n(Reduz ruído)')
+    axes[0, 3].axis('off')
+    
+    # Supersampling
+    axes[1, 0].imshow(dados['ssaa'])
+    axes[1, 0].set_title('Supersampling (SSAA)\n(Anti-aliasing clássico)')
+    axes[1, 0].axis('off')
+    
+    # FXAA
+    axes[1, 1].imshow(dados['fxaa'])
+    axes[1, 1].set_title('FXAA\n(Pós-processamento nas bordas)')
+    axes[1, 1].axis('off')
+    
+    # SMAA
+    axes[1, 2].imshow(dados['smaa'])
+    axes[1, 2].set_title('SMAA\n(Morfológico por subpixel)')
+    axes[1, 2].axis('off')
+    
+    # Diferença entre original e SSAA
+    axes[1, 3].imshow(dados['diferenca_ssaa'])
+    axes[1, 3].set_title('Diferença (Original vs SSAA)\n(Ampliada para visualização)')
+    axes[1, 3].axis('off')
+    
+    fig.tight_layout()
+    salvar_figura(fig, caminho_base, dpi, formato)
+
+
+def figura_bordas(dados, nome_imagem, caminho_base, dpi=300, formato='png'):
+    """
+    Figura da análise de bordas
+    
+    Args:
+        dados: Resultado de analisar_bordas
+        nome_imagem: Nome da imagem (título)
+        caminho_base: Caminho de saída sem extensão
+        dpi: Resolução da figura
+        formato: Formato do arquivo (png, jpg, svg, pdf...)
+    """
+    # Visualização
+    fig = criar_figura(figsize=(14, 10))
+    axes = fig.subplots(2, 2)
+    fig.suptitle(f'Análise de Bordas - {nome_imagem}', fontsize=16, fontweight='bold')
+    
+    axes[0, 0].imshow(dados['original'])
+    axes[0, 0].set_title('Imagem Original')
+    axes[0, 0].axis('off')
+    
+    axes[0, 1].imshow(dados['bordas_original'], cmap='gray')
+    axes[0, 1].set_title('Bordas (Original)')
+    axes[0, 1].axis('off')
+    
+    axes[1, 0].imshow(dados['suavizada'])
+    axes[1, 0].set_title('Imagem com Anti-aliasing')
+    axes[1, 0].axis('off')
+    
+    axes[1, 1].imshow(dados['bordas_suavizadas'], cmap='gray')
+    axes[1, 1].set_title('Bordas (Anti-aliasing)\n(Bordas mais suaves)')
+    axes[1, 1].axis('off')
+    
+    fig.tight_layout()
+    salvar_figura(fig, caminho_base, dpi, formato)
+
+
+def figura_escala(dados, nome_imagem, caminho_base, dpi=300, formato='png'):
+    """
+    Figura do efeito de anti-aliasing em redimensionamento
+    
+    Args:
+        dados: Resultado de demonstrar_efeito_escala
+        nome_imagem: Nome da imagem (título)
+        caminho_base: Caminho de saída sem extensão
+        dpi: Resolução da figura
+        formato: Formato do arquivo (png, jpg, svg, pdf...)
+    """
+    # Visualização
+    fig = criar_figura(figsize=(18, 6))
+    axes = fig.subplots(1, 3)
+    fig.suptitle(f'Efeito de Anti-aliasing em Redimensionamento - {nome_imagem}', 
+                 fontsize=16, fontweight='bold')
+    
+    axes[0].imshow(dados['original'])
+    axes[0].set_title('Original')
+    axes[0].axis('off')
+    
+    axes[1].imshow(dados['sem_aa'])
+    axes[1].set_title('Sem Anti-aliasing\n(Serrilhamento visível)')
+    axes[1].axis('off')
+    
+    axes[2].imshow(dados['com_aa'])
+    axes[2].set_title('Com Anti-aliasing\n(Bordas suavizadas)')
+    axes[2].axis('off')
+    
+    fig.tight_layout()
+    salvar_figura(fig, caminho_base, dpi, formato)
+
+
+# Etapa do pipeline -> (prefixo do arquivo, função que monta a figura)
+FIGURAS = {
+    'decomposicao': ('decomposicao_rgb', figura_decomposicao),
+    'histogramas': ('histogramas', figura_histogramas),
+    'comparacao': ('comparacao_antialiasing', figura_comparacao),
+    'bordas': ('analise_bordas', figura_bordas),
+    'escala': ('efeito_escala', figura_escala),
+}
+
+
+def renderizar(etapa, dados, nome_imagem, output_dir, dpi=300, formato='png'):
+    """
+    Gera a figura de uma etapa do pipeline
+
+    Args:
+        etapa: Chave de FIGURAS (ex.: 'comparacao')
+        dados: Dados da etapa
+        nome_imagem: Nome da imagem
+        output_dir: Diretório de saída
+        dpi: Resolução da figura
+        formato: Formato do arquivo
+
+    Returns:
+        Caminho do arquivo gerado
+    """
+    prefixo, funcao = FIGURAS[etapa]
+    caminho_base = os.path.join(output_dir, f"{prefixo}_{nome_imagem}")
+    funcao(dados, nome_imagem, caminho_base, dpi, formato)
+    return f"{caminho_base}.{formato}"
+
+
+def _renderizar_tarefa(tarefa):
+    return renderizar(*tarefa)
+
+
+def renderizar_em_paralelo(tarefas, workers=None, executor=None):
+    """
+    Renderiza várias figuras simultaneamente em um pool de processos
+
+    Args:
+        tarefas: Lista de tuplas (etapa, dados, nome_imagem, output_dir,
+                 dpi, formato)
+        workers: Número de processos (padrão: número de núcleos)
+        executor: Pool já criado a reaproveitar (ex.: um por lote de
+                  imagens, evitando iniciar processos e importar o
+                  matplotlib a cada chamada); ignora workers
+
+    Returns:
+        Lista com os caminhos gerados, na ordem das tarefas
+    """
+    tarefas = list(tarefas)
+    if executor is not None:
+        return list(executor.map(_renderizar_tarefa, tarefas))
+    workers = min(workers or os.cpu_count() or 1, len(tarefas) or 1)
+    if workers <= 1:
+        return [_renderizar_tarefa(t) for t in tarefas]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_renderizar_tarefa, tarefas))
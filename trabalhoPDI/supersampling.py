@@ -0,0 +1,79 @@
+"""
+Supersampling (SSAA) fundido, sem a imagem ampliada intermediária
+
+O SSAA clássico amplia a imagem por um fator inteiro s com interpolação
+cúbica (cv2.INTER_CUBIC) e reduz de volta com média de área (INTER_AREA),
+materializando uma imagem s² vezes maior. As duas etapas são lineares e
+separáveis, então cada pixel de saída é uma combinação fixa dos pixels de
+entrada próximos: o kernel cúbico convoluído com a caixa de s amostras.
+
+Com fator inteiro, as s sub-amostras do pixel de saída X caem sempre nas
+mesmas posições relativas, X + (j + 0.5)/s - 0.5 para j = 0..s-1, e a
+tabela de pesos separável tem uma única linha: a média dos pesos cúbicos
+dessas s posições, um kernel de 5 taps (X-2 a X+2) que não depende de X.
+O operador fundido é então uma convolução separável (cv2.sepFilter2D)
+com as bordas replicadas como no cv2.resize, e a memória fica O(saída).
+
+A diferença para o caminho clássico vem só dos arredondamentos: o
+intermediário do OpenCV é quantizado no tipo da imagem (e saturado nos
+picos do kernel cúbico); aqui a soma é feita em ponto flutuante.
+"""
+
+import cv2
+import numpy as np
+
+
+# Parâmetro do kernel cúbico usado pelo cv2.resize (INTER_CUBIC)
+_A_CUBICO = -0.75
+
+
+def pesos_cubicos(fracao):
+    """
+    Pesos dos 4 taps (base-1, base, base+1, base+2) do INTER_CUBIC para a
+    fração `fracao` entre base e base+1
+    """
+    a = _A_CUBICO
+    x = fracao
+    w0 = ((a * (x + 1) - 5 * a) * (x + 1) + 8 * a) * (x + 1) - 4 * a
+    w1 = ((a + 2) * x - (a + 3)) * x * x + 1
+    w2 = ((a + 2) * (1 - x) - (a + 3)) * (1 - x) * (1 - x) + 1
+    return np.array([w0, w1, w2, 1 - w0 - w1 - w2])
+
+
+def kernel_ssaa(fator):
+    """
+    Kernel 1D equivalente a ampliar por `fator` (cúbico) e reduzir pela
+    média de área
+
+    Args:
+        fator: Fator de escala inteiro (>= 1)
+
+    Returns:
+        Array float64 de 5 pesos (deslocamentos -2 a +2), soma 1
+    """
+    if int(fator) != fator or fator < 1:
+        raise ValueError("O SSAA fundido exige fator de escala inteiro >= 1")
+    fator = int(fator)
+    kernel = np.zeros(5)
+    for j in range(fator):
+        posicao = (j + 0.5) / fator - 0.5  # em (-0.5, 0.5), relativa a X
+        base = int(np.floor(posicao))       # -1 ou 0
+        # Taps base-1..base+2 relativos a X, deslocados para o índice 0..4
+        inicio = base - 1 + 2
+        kernel[inicio:inicio + 4] += pesos_cubicos(posicao - base)
+    return kernel / fator
+
+
+def supersampling_fundido(img, fator=2):
+    """
+    SSAA (cúbico para cima, área para baixo) sem o intermediário ampliado
+
+    Args:
+        img: Imagem HxW ou HxWxC (uint8, uint16 ou float32)
+        fator: Fator de escala inteiro
+
+    Returns:
+        Imagem do mesmo tamanho e tipo da entrada
+    """
+    kernel = kernel_ssaa(fator)
+    return cv2.sepFilter2D(img, -1, kernel, kernel, borderType=cv2.BORDER_REPLICATE)
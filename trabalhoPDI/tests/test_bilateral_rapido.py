@@ -0,0 +1,44 @@
+"""
+Testes da grade bilateral (bilateral_rapido)
+
+Uso (a partir de trabalhoPDI/):
+    python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bilateral_rapido  # noqa: E402
+from bilateral_rapido import bilateral_grade_como_cv2  # noqa: E402
+
+
+def imagem_sintetica(altura, largura, semente=0):
+    """Gradiente horizontal 0-255 (todos os níveis da grade) com ruído suavizado"""
+    rng = np.random.default_rng(semente)
+    ruido = cv2.GaussianBlur(rng.normal(0, 20, (altura, largura, 3)).astype(np.float32), (0, 0), 3)
+    gradiente = np.linspace(0, 255, largura, dtype=np.float32)[None, :, None]
+    return np.clip(gradiente + ruido, 0, 255).astype(np.uint8)
+
+
+def test_imagem_alta_passa_do_limite_do_remap():
+    # 8000 linhas com precisao=1: a pilha de níveis da grade passa de
+    # SHRT_MAX linhas, o que fazia o cv2.remap falhar
+    img = imagem_sintetica(8000, 600)
+    resultado = bilateral_grade_como_cv2(img, precisao=1.0)
+    assert resultado.shape == img.shape
+    assert resultado.dtype == img.dtype
+    erro = np.abs(resultado.astype(np.int16) - cv2.bilateralFilter(img, 9, 75, 75)).mean()
+    assert erro < 2
+
+
+def test_leitura_em_janelas_igual_a_leitura_direta(monkeypatch):
+    img = imagem_sintetica(300, 400)
+    direta = bilateral_grade_como_cv2(img, precisao=2.0)
+    # Limite pequeno força as janelas na origem e os blocos no destino
+    monkeypatch.setattr(bilateral_rapido, '_LIMITE_REMAP', 257)
+    np.testing.assert_array_equal(bilateral_grade_como_cv2(img, precisao=2.0), direta)
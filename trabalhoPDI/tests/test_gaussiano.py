@@ -0,0 +1,85 @@
+"""
+Testes da suavização gaussiana por sigma (gaussiano)
+
+Uso (a partir de trabalhoPDI/):
+    python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import gaussiano  # noqa: E402
+from gaussiano import LIMIAR_SIGMA_IIR, desfoque_gaussiano  # noqa: E402
+
+
+def imagem_sintetica(dtype, canais=3, altura=480, largura=640, semente=0):
+    """Gradiente horizontal com ruído suavizado; float32 em [0, 1]"""
+    rng = np.random.default_rng(semente)
+    forma = (altura, largura, canais) if canais > 1 else (altura, largura)
+    ruido = cv2.GaussianBlur(rng.normal(0, 20, forma).astype(np.float32), (0, 0), 3)
+    gradiente = np.linspace(0, 255, largura, dtype=np.float32)[None, :]
+    if canais > 1:
+        gradiente = gradiente[:, :, None]
+    img = np.clip(gradiente + ruido, 0, 255)
+    if dtype == np.float32:
+        return img / np.float32(255)
+    return img.astype(dtype)
+
+
+# (dtype, erro máximo, erro médio) em relação ao cv2.GaussianBlur
+TOLERANCIAS = [
+    (np.uint8, 2, 0.25),
+    (np.float32, 2e-3, 1e-3),
+]
+
+
+@pytest.mark.parametrize('sigma', [5, 20, 40])
+@pytest.mark.parametrize('dtype, erro_maximo, erro_medio', TOLERANCIAS)
+def test_iir_proximo_do_cv2(dtype, erro_maximo, erro_medio, sigma):
+    img = imagem_sintetica(dtype)
+    resultado = desfoque_gaussiano(img, sigma, metodo='iir')
+    assert resultado.dtype == img.dtype
+    assert resultado.shape == img.shape
+    erro = np.abs(resultado.astype(np.float64) - cv2.GaussianBlur(img, (0, 0), sigma))
+    assert erro.max() <= erro_maximo
+    assert erro.mean() <= erro_medio
+
+
+@pytest.mark.parametrize('metodo', ['iir', 'fir', 'auto'])
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16, np.float32])
+@pytest.mark.parametrize('canais', [1, 3])
+def test_mantem_tipo_e_forma(dtype, canais, metodo):
+    img = imagem_sintetica(dtype, canais, 120, 160)
+    resultado = desfoque_gaussiano(img, 25, metodo)
+    assert resultado.dtype == img.dtype
+    assert resultado.shape == img.shape
+
+
+@pytest.mark.parametrize('sigma, esperado', [
+    (LIMIAR_SIGMA_IIR / 2, 'fir'),
+    (LIMIAR_SIGMA_IIR, 'iir'),
+    (LIMIAR_SIGMA_IIR * 2, 'iir'),
+])
+def test_auto_escolhe_pelo_limiar(monkeypatch, sigma, esperado):
+    chamados = []
+    monkeypatch.setattr(gaussiano, 'gaussiano_fir', lambda img, s: chamados.append('fir'))
+    monkeypatch.setattr(gaussiano, 'gaussiano_iir', lambda img, s: chamados.append('iir'))
+    desfoque_gaussiano(np.zeros((8, 8), np.uint8), sigma)
+    assert chamados == [esperado]
+
+
+@pytest.mark.parametrize('sigma', [0, -1.5])
+def test_sigma_invalido(sigma):
+    with pytest.raises(ValueError):
+        desfoque_gaussiano(np.zeros((8, 8), np.uint8), sigma)
+
+
+def test_metodo_desconhecido():
+    with pytest.raises(ValueError):
+        desfoque_gaussiano(np.zeros((8, 8), np.uint8), 5, metodo='fft')